@@ -5,22 +5,65 @@ This package provides a high-performance JSON serializer built on orjson
 with support for Pydantic models, dataclasses, and custom types.
 """
 
-from .registry import ModelRegistry, register_model
-from .serializer import JsonSerializer
+from importlib.util import find_spec
+from typing import Any
 
-# Условный экспорт AiocacheJsonSerializer (только если aiocache установлен)
-try:
-    from .aiocache import AiocacheJsonSerializer
-except ImportError:
-    AiocacheJsonSerializer = None  # type: ignore
+from .backends import Backend, JsonBackend, MsgpackBackend, configure_backend
+from .registry import (
+    ModelRegistry,
+    declare_model,
+    export_manifest,
+    load_entry_points,
+    load_manifest,
+    register_migration,
+    register_model,
+)
+from .serializer import (
+    MISS,
+    CacheMeta,
+    DepthLimitError,
+    JsonSerializer,
+    LengthLimitError,
+    LimitExceededError,
+    NodeLimitError,
+    SizeLimitError,
+)
 
 __version__ = "0.1.0"
 __all__ = [
     "JsonSerializer",
     "register_model",
+    "register_migration",
+    "declare_model",
+    "load_manifest",
+    "load_entry_points",
+    "export_manifest",
     "ModelRegistry",
+    "Backend",
+    "JsonBackend",
+    "MsgpackBackend",
+    "configure_backend",
+    "DepthLimitError",
+    "LimitExceededError",
+    "SizeLimitError",
+    "NodeLimitError",
+    "LengthLimitError",
+    "MISS",
+    "CacheMeta",
 ]
 
-# Добавляем AiocacheJsonSerializer в __all__ только если он доступен
-if AiocacheJsonSerializer is not None:
+# Добавляем AiocacheJsonSerializer в __all__ только если aiocache установлен
+# (find_spec не импортирует модуль)
+if find_spec("aiocache") is not None:
     __all__.append("AiocacheJsonSerializer")
+
+
+def __getattr__(name: str) -> Any:
+    """Import AiocacheJsonSerializer lazily (aiocache is not imported with the package)."""
+    if name == "AiocacheJsonSerializer":
+        try:
+            from .aiocache import AiocacheJsonSerializer
+        except ImportError:
+            return None
+        return AiocacheJsonSerializer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,41 @@
+"""
+Command line entry point: python -m redis_json_serializer <command> [options].
+
+Commands:
+    analyze   Byte breakdown of exported serialized values (see analyze.py)
+    manifest  Alias -> module:qualname manifest of registered models (see manifest.py)
+"""
+
+import sys
+from collections.abc import Callable
+
+from .analyze import main as analyze_main
+from .manifest import main as manifest_main
+
+COMMANDS: dict[str, Callable[[list[str] | None], int]] = {
+    "analyze": analyze_main,
+    "manifest": manifest_main,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Dispatch to a command.
+
+    Args:
+        argv: Arguments without the program name (None - sys.argv)
+
+    Returns:
+        Exit code
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] not in COMMANDS:
+        sys.stderr.write(
+            f"usage: python -m redis_json_serializer {{{','.join(COMMANDS)}}} [options]\n"
+        )
+        return 2
+    return COMMANDS[args[0]](args[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
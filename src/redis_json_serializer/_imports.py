@@ -0,0 +1,51 @@
+"""
+Lazy access to optional dependencies.
+
+Optional integrations (pydantic, bson, numpy, starlette/fastapi, msgpack)
+are never imported at package import time. Type checks probe sys.modules:
+an object of a class cannot exist before its module has been imported.
+"""
+
+import importlib
+import sys
+from typing import Any
+
+
+def loaded_class(module_name: str, class_name: str) -> Any:
+    """
+    Get class from a module only if the module is already imported.
+
+    Args:
+        module_name: Module name (e.g. "pydantic")
+        class_name: Class name (e.g. "BaseModel")
+
+    Returns:
+        Class or None if the module is not imported
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        return None
+    return getattr(module, class_name, None)
+
+
+def import_optional(module_name: str, error_message: str) -> Any:
+    """
+    Import optional dependency on first use.
+
+    Args:
+        module_name: Module name to import
+        error_message: ImportError message if the module is not installed
+
+    Returns:
+        Imported module
+
+    Raises:
+        ImportError: If the module is not installed
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        raise ImportError(error_message) from exc
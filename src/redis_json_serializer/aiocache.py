@@ -4,24 +4,31 @@ Integration with aiocache library.
 TODO: Реализовать команде разработки
 """
 
+import asyncio
+import logging
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from aiocache import cached as aiocache_cached  # type: ignore[import-untyped]
     from aiocache.serializers import BaseSerializer  # type: ignore[import-untyped]
 
-    from .serializer import JsonSerializer
+    from .serializer import MISS, JsonSerializer
 else:
     try:
-        from aiocache.serializers import BaseSerializer  # type: ignore[import-untyped]
+        from aiocache import cached as aiocache_cached
+        from aiocache.serializers import BaseSerializer
     except ImportError:
         BaseSerializer = None  # type: ignore[assignment, misc]
+        aiocache_cached = None
 
     # Импортируем JsonSerializer на уровне модуля для правильной работы с глобальными словарями
     try:
-        from .serializer import JsonSerializer
+        from .serializer import MISS, JsonSerializer
     except ImportError:
         JsonSerializer = None  # type: ignore[assignment, misc]
 
+logger = logging.getLogger(__name__)
+
 
 if BaseSerializer is not None:
     class AiocacheJsonSerializer(BaseSerializer):  # type: ignore[misc]
@@ -34,17 +41,18 @@ if BaseSerializer is not None:
 
         DEFAULT_ENCODING = None
 
-        def __init__(self, namespace: str = ""):
+        def __init__(self, namespace: str = "", trusted: bool = False):
             """
             Initialize serializer.
 
             Args:
                 namespace: Optional namespace prefix for cache keys
+                trusted: Build models without validation on loads
             """
             super().__init__()
             if JsonSerializer is None:
                 raise ImportError("JsonSerializer is not available")
-            self._serializer = JsonSerializer(namespace=namespace)
+            self._serializer = JsonSerializer(namespace=namespace, trusted=trusted)
 
         def dumps(self, value: Any) -> bytes:
             """
@@ -69,3 +77,87 @@ if BaseSerializer is not None:
                 Deserialized Python object (or None)
             """
             return self._serializer.loads(value)
+
+        def loads_or_miss(self, value: bytes | None) -> Any:
+            """
+            Deserialize bytes, returning MISS for a missing key.
+
+            Args:
+                value: Serialized bytes (None - key is missing)
+
+            Returns:
+                MISS, or deserialized Python object (None for a cached None)
+            """
+            return self._serializer.loads_or_miss(value)
+
+    class cached(aiocache_cached):  # type: ignore[misc]  # noqa: N801
+        """
+        aiocache @cached that also serves cached None results.
+
+        Stock @cached treats a None read as a miss, so functions that
+        legitimately return None are recomputed on every call. This
+        decorator reads through AiocacheJsonSerializer.loads_or_miss() and
+        recomputes only on MISS. The cache must use AiocacheJsonSerializer.
+
+        decorator() and get_from_cache() are aiocache internals, not public
+        API: the supported aiocache range is pinned in pyproject.toml
+        (>=0.12.0,<0.13) and checked by tests/test_aiocache.py.
+
+        Example:
+            @cached(ttl=60, serializer=AiocacheJsonSerializer())
+            async def find_user(user_id: str) -> User | None:
+                ...
+        """
+
+        def __call__(self, f: Any) -> Any:
+            """
+            Decorate function.
+
+            Raises:
+                TypeError: If the cache serializer is not AiocacheJsonSerializer
+            """
+            wrapper = super().__call__(f)
+            if not isinstance(self.cache.serializer, AiocacheJsonSerializer):
+                raise TypeError(
+                    "redis_json_serializer.aiocache.cached requires AiocacheJsonSerializer, "
+                    f"got {type(self.cache.serializer).__name__}"
+                )
+            return wrapper
+
+        async def decorator(
+            self,
+            f: Any,
+            *args: Any,
+            cache_read: bool = True,
+            cache_write: bool = True,
+            aiocache_wait_for_write: bool = True,
+            **kwargs: Any,
+        ) -> Any:
+            """Same as aiocache cached.decorator(), with MISS instead of None as a miss."""
+            key = self.get_cache_key(f, args, kwargs)
+
+            if cache_read:
+                value = await self.get_from_cache(key)
+                if value is not MISS:
+                    return value
+
+            result = await f(*args, **kwargs)
+
+            if self.skip_cache_func(result):
+                return result
+
+            if cache_write:
+                if aiocache_wait_for_write:
+                    await self.set_in_cache(key, result)
+                else:
+                    asyncio.create_task(self.set_in_cache(key, result))
+
+            return result
+
+        async def get_from_cache(self, key: str) -> Any:
+            """Read value through loads_or_miss() (MISS on a missing key or read error)."""
+            try:
+                return await self.cache.get(key, loads_fn=self.cache.serializer.loads_or_miss)
+            except Exception:
+                logger.exception("Couldn't retrieve %s, unexpected error", key)
+            return MISS
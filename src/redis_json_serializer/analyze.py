@@ -0,0 +1,414 @@
+"""
+Offline payload size analysis: where do the bytes of cached values go.
+
+Reads serialized values (dumps() output) exported from Redis and
+attributes their bytes to type markers, model aliases, field names and
+the namespace wrapper. Also estimates savings of compression, compact
+(short) markers and columnar encoding of lists of records.
+
+Sizes are exact for JSON payloads: each node is measured as its compact
+JSON encoding (the form orjson writes). Binary payloads are analyzed
+after decoding, i.e. as if they were written by the JSON backend.
+
+Usage:
+    python -m redis_json_serializer analyze values.ndjson
+    redis-cli --raw GET user:1 | python -m redis_json_serializer analyze
+    python -m redis_json_serializer analyze --format rdb-json dump.json --json
+"""
+
+import argparse
+import sys
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+import orjson
+
+from .backends import detect_backend
+from .types import DATA_KEY, NS_KEY, Marks
+
+# Имена маркеров по их строковому значению
+_MARK_NAMES = {str(mark): mark.name for mark in Marks}
+
+# Размер короткого маркера для оценки compact markers: двухсимвольный ключ в кавычках
+_COMPACT_MARKER_SIZE = 4
+
+# Уровень zlib для оценки сжатия (по умолчанию zlib)
+_COMPRESSION_LEVEL = 6
+
+FORMATS = ("ndjson", "rdb-json")
+
+
+def _scalar_size(value: Any) -> int:
+    """Size of a scalar in compact JSON."""
+    if value is None:
+        return 4
+    if value is True:
+        return 4
+    if value is False:
+        return 5
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # Бинарные бэкенды передают байты как есть - в JSON это строка base64
+        return 4 * ((len(value) + 2) // 3) + 2
+    return len(orjson.dumps(value))
+
+
+class PayloadAnalyzer:
+    """
+    Accumulates byte breakdown over a sample of serialized values.
+
+    Example:
+        analyzer = PayloadAnalyzer()
+        for payload in payloads:
+            analyzer.add(payload)
+        report = analyzer.report()
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.payloads = 0
+        self.total_bytes = 0
+        self.skipped = 0
+        self.flag_bytes = 0
+        self.namespace_bytes = 0
+        self.compressed_bytes = 0
+        self.compact_marker_saving = 0
+        self.columnar_saving = 0
+        # {имя: [количество, байты, накладные байты маркера]}
+        self.markers: dict[str, list[int]] = {}
+        # {алиас: [количество, байты]}
+        self.models: dict[str, list[int]] = {}
+        # {ключ: [количество, байты ключа, байты значений]}
+        self.fields: dict[str, list[int]] = {}
+
+    def add(self, payload: bytes | bytearray | memoryview) -> bool:
+        """
+        Add one serialized value to the statistics.
+
+        Args:
+            payload: dumps() output of any backend
+
+        Returns:
+            False if the payload could not be decoded (counted as skipped)
+        """
+        try:
+            data = detect_backend(payload).decode(payload)
+        except ValueError:
+            # orjson.JSONDecodeError - подкласс ValueError
+            self.skipped += 1
+            return False
+
+        self.payloads += 1
+        self.total_bytes += len(payload)
+        # Флаг маркеров JSON-payload: пробел (маркеров нет) или табуляция (есть)
+        if payload[:1] in (b" ", b"\t"):
+            self.flag_bytes += 1
+        self.compressed_bytes += len(zlib.compress(bytes(payload), _COMPRESSION_LEVEL))
+
+        sizes = self._walk(data)
+        if isinstance(data, dict) and NS_KEY in data and DATA_KEY in data:
+            inner = data[DATA_KEY]
+            inner_size = sizes.get(id(inner)) if isinstance(inner, (dict, list)) else _scalar_size(inner)
+            self.namespace_bytes += sizes[id(data)] - (inner_size or 0)
+        return True
+
+    def _walk(self, root: Any) -> dict[int, int]:
+        """
+        Measure every container of a decoded payload (iterative post-order).
+
+        Returns:
+            {id(container): compact JSON size}
+        """
+        sizes: dict[int, int] = {}
+        if not isinstance(root, (dict, list)):
+            return sizes
+
+        stack: list[tuple[Any, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            children = node.values() if type(node) is dict else node
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children if isinstance(child, (dict, list)))
+                continue
+
+            item_sizes = [
+                sizes[id(child)] if isinstance(child, (dict, list)) else _scalar_size(child)
+                for child in children
+            ]
+            if type(node) is dict:
+                sizes[id(node)] = self._measure_dict(node, item_sizes)
+            else:
+                sizes[id(node)] = self._measure_list(node, item_sizes)
+        return sizes
+
+    def _measure_dict(self, node: dict[str, Any], value_sizes: list[int]) -> int:
+        """Size a dict and attribute its bytes to marker, model and field statistics."""
+        key_sizes = [len(orjson.dumps(str(key))) + 1 for key in node]  # "key":
+        size = 1 + sum(key_sizes) + sum(value_sizes) + max(len(node), 1)  # {} и запятые
+
+        marker_name = None
+        for key in node:
+            marker_name = _MARK_NAMES.get(key)
+            if marker_name is not None:
+                break
+
+        if marker_name is None:
+            if NS_KEY in node and DATA_KEY in node:
+                # Namespace-обёртка учитывается отдельно (namespace_bytes)
+                return size
+            for key, key_size, value_size in zip(node, key_sizes, value_sizes):
+                stats = self.fields.setdefault(str(key), [0, 0, 0])
+                stats[0] += 1
+                stats[1] += key_size
+                stats[2] += value_size
+            return size
+
+        marker_key = str(Marks[marker_name])
+        # Накладные байты маркера: фигурные скобки и ключ маркера
+        overhead = 2 + len(marker_key) + 3
+        stats = self.markers.setdefault(marker_name, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += size
+        self.compact_marker_saving += len(marker_key) + 2 - _COMPACT_MARKER_SIZE
+
+        if marker_name == Marks.MODEL.name:
+            alias = node[marker_key]
+            # Алиас модели - тоже накладные байты
+            overhead += _scalar_size(alias) + 1
+            model_stats = self.models.setdefault(str(alias), [0, 0])
+            model_stats[0] += 1
+            model_stats[1] += size
+            # Поля модели - обычные ключи
+            for key, key_size, value_size in zip(node, key_sizes, value_sizes):
+                if key == marker_key:
+                    continue
+                field_stats = self.fields.setdefault(str(key), [0, 0, 0])
+                field_stats[0] += 1
+                field_stats[1] += key_size
+                field_stats[2] += value_size
+        stats[2] += overhead
+        return size
+
+    def _measure_list(self, node: list[Any], item_sizes: list[int]) -> int:
+        """Size a list and estimate columnar saving for a list of same-shaped records."""
+        size = 1 + sum(item_sizes) + max(len(node), 1)  # [] и запятые
+        if len(node) < 2 or type(node[0]) is not dict:
+            return size
+
+        keys = list(node[0])
+        if not all(type(item) is dict and list(item) == keys for item in node):
+            return size
+
+        # Колонки: ключи пишутся один раз заголовком, строки - массивами значений
+        key_bytes = sum(len(orjson.dumps(key)) + 1 for key in keys)
+        model_key = str(Marks.MODEL)
+        if model_key in keys:
+            # Записи одной модели: алиас тоже пишется один раз
+            alias = node[0][model_key]
+            if any(item[model_key] != alias for item in node):
+                return size
+            key_bytes += _scalar_size(alias) + 1
+        elif any(key in _MARK_NAMES for key in keys):
+            # Список маркеров (datetime, Decimal, ...) - не записи
+            return size
+
+        header = key_bytes + 2
+        self.columnar_saving += max(0, len(node) * key_bytes - header)
+        return size
+
+    def report(self) -> dict[str, Any]:
+        """
+        Build report of accumulated statistics.
+
+        Returns:
+            JSON-serializable dict with totals, breakdowns and estimates
+        """
+        return {
+            "payloads": self.payloads,
+            "skipped": self.skipped,
+            "bytes": self.total_bytes,
+            "flag_bytes": self.flag_bytes,
+            "namespace_bytes": self.namespace_bytes,
+            "markers": {
+                name: {"count": count, "bytes": size, "overhead": overhead}
+                for name, (count, size, overhead) in self.markers.items()
+            },
+            "models": {
+                alias: {"count": count, "bytes": size}
+                for alias, (count, size) in self.models.items()
+            },
+            "fields": {
+                key: {"count": count, "key_bytes": key_bytes, "value_bytes": value_bytes}
+                for key, (count, key_bytes, value_bytes) in self.fields.items()
+            },
+            "estimates": {
+                "compression": {
+                    "bytes": self.compressed_bytes,
+                    "saving": self.total_bytes - self.compressed_bytes,
+                },
+                "compact_markers": {"saving": self.compact_marker_saving},
+                "columnar": {"saving": self.columnar_saving},
+            },
+        }
+
+
+# ========== Input ==========
+
+
+def read_payloads(stream: IO[bytes], fmt: str = "ndjson") -> Iterator[bytes]:
+    """
+    Read serialized values from an export.
+
+    Args:
+        stream: Binary input stream
+        fmt: "ndjson" - one payload per line; "rdb-json" - JSON export of
+            an RDB dump (redis-rdb-tools: list of {key: value} per database,
+            non-string values are ignored)
+
+    Yields:
+        Payload bytes
+
+    Raises:
+        ValueError: If format is unknown
+    """
+    if fmt == "ndjson":
+        for line in stream:
+            line = line.rstrip(b"\r\n")
+            if line.strip():
+                yield line
+    elif fmt == "rdb-json":
+        databases = orjson.loads(stream.read())
+        if isinstance(databases, dict):
+            databases = [databases]
+        for database in databases:
+            for value in database.values():
+                if isinstance(value, str):
+                    yield value.encode("utf-8")
+    else:
+        raise ValueError(f"Unknown input format '{fmt}'. Available: {list(FORMATS)}")
+
+
+def analyze(payloads: Iterable[bytes], limit: int | None = None) -> dict[str, Any]:
+    """
+    Analyze a sample of serialized values.
+
+    Args:
+        payloads: Payload bytes
+        limit: Analyze at most this many payloads
+
+    Returns:
+        Report (see PayloadAnalyzer.report())
+    """
+    analyzer = PayloadAnalyzer()
+    for index, payload in enumerate(payloads):
+        if limit is not None and index >= limit:
+            break
+        analyzer.add(payload)
+    return analyzer.report()
+
+
+# ========== Output ==========
+
+
+def _share(part: int, total: int) -> str:
+    return f"{part / total:6.1%}" if total else "     -"
+
+
+def format_report(report: dict[str, Any], top: int = 10) -> str:
+    """
+    Format report as a text table.
+
+    Args:
+        report: analyze() result
+        top: Rows per breakdown
+
+    Returns:
+        Multi-line text
+    """
+    total = report["bytes"]
+    lines = [
+        f"Payloads: {report['payloads']} ({report['skipped']} skipped), {total} bytes",
+        f"Namespace wrapper: {report['namespace_bytes']} bytes {_share(report['namespace_bytes'], total)}",
+        f"Marker flags: {report['flag_bytes']} bytes",
+        "",
+        "Markers (count, subtree bytes, marker overhead):",
+    ]
+    markers = sorted(report["markers"].items(), key=lambda item: -item[1]["bytes"])
+    for name, stats in markers[:top]:
+        lines.append(
+            f"  {name:<16} {stats['count']:>8} {stats['bytes']:>12} {_share(stats['bytes'], total)}"
+            f" {stats['overhead']:>10} {_share(stats['overhead'], total)}"
+        )
+
+    lines += ["", "Models (count, bytes):"]
+    models = sorted(report["models"].items(), key=lambda item: -item[1]["bytes"])
+    for alias, stats in models[:top]:
+        lines.append(f"  {alias:<32} {stats['count']:>8} {stats['bytes']:>12} {_share(stats['bytes'], total)}")
+
+    lines += ["", "Fields (count, value bytes):"]
+    fields = sorted(report["fields"].items(), key=lambda item: -item[1]["value_bytes"])
+    for key, stats in fields[:top]:
+        lines.append(
+            f"  {key:<32} {stats['count']:>8} {stats['value_bytes']:>12} {_share(stats['value_bytes'], total)}"
+        )
+
+    lines += ["", "Repeated keys (count, key bytes):"]
+    repeated = sorted(
+        ((key, stats) for key, stats in report["fields"].items() if stats["count"] > 1),
+        key=lambda item: -item[1]["key_bytes"],
+    )
+    for key, stats in repeated[:top]:
+        lines.append(
+            f"  {key:<32} {stats['count']:>8} {stats['key_bytes']:>12} {_share(stats['key_bytes'], total)}"
+        )
+
+    estimates = report["estimates"]
+    lines += [
+        "",
+        "Estimated savings:",
+        f"  compression (zlib)  {estimates['compression']['saving']:>12} "
+        f"{_share(estimates['compression']['saving'], total)}",
+        f"  compact markers     {estimates['compact_markers']['saving']:>12} "
+        f"{_share(estimates['compact_markers']['saving'], total)}",
+        f"  columnar records    {estimates['columnar']['saving']:>12} "
+        f"{_share(estimates['columnar']['saving'], total)}",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the analyzer CLI.
+
+    Args:
+        argv: Arguments without the program name (None - sys.argv)
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m redis_json_serializer analyze",
+        description="Attribute bytes of serialized cache values to markers, models and fields.",
+    )
+    parser.add_argument("paths", nargs="*", help="Input files ('-' or none - stdin)")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson", help="Input format")
+    parser.add_argument("--limit", type=int, default=None, help="Analyze at most N values")
+    parser.add_argument("--top", type=int, default=10, help="Rows per breakdown")
+    parser.add_argument("--json", action="store_true", help="Print report as JSON")
+    args = parser.parse_args(argv)
+
+    def payloads() -> Iterator[bytes]:
+        for path in args.paths or ["-"]:
+            if path == "-":
+                yield from read_payloads(sys.stdin.buffer, args.format)
+                continue
+            with open(path, "rb") as stream:
+                yield from read_payloads(stream, args.format)
+
+    report = analyze(payloads(), args.limit)
+    if args.json:
+        sys.stdout.write(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode() + "\n")
+    else:
+        sys.stdout.write(format_report(report, args.top) + "\n")
+    return 0
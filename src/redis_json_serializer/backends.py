@@ -0,0 +1,309 @@
+"""
+Codec backends: byte-level encoding of pack() output.
+
+JsonSerializer.pack()/unpack() define the marker semantics; a backend only
+turns the packed structure into bytes and back. JSON payloads are written
+as-is, binary payloads start with a two-byte header (BINARY_MAGIC + backend
+id) so loads() can detect the codec on read.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+import orjson
+
+from ._imports import import_optional
+from .types import Marks
+from .utils import canonical_sorted
+
+# 0xC1 никогда не используется в MessagePack и не может начинать JSON/UTF-8
+BINARY_MAGIC = 0xC1
+
+# Стабильные коды extension-типов для маркеров (значения нельзя менять - это формат хранения)
+EXT_CODES: dict[str, int] = {
+    str(Marks.MODEL): 1,
+    str(Marks.SET): 2,
+    str(Marks.DATE): 3,
+    str(Marks.DATETIME): 4,
+    str(Marks.DECIMAL): 5,
+    str(Marks.OBJECT_ID): 6,
+    str(Marks.TUPLE): 7,
+    str(Marks.DATETIME_TS): 8,
+    str(Marks.DATETIME_ARRAY): 9,
+    str(Marks.DATE_ORDINAL): 10,
+    str(Marks.NDARRAY): 11,
+    str(Marks.BYTES): 12,
+    str(Marks.UUID): 13,
+    str(Marks.ENUM): 14,
+    str(Marks.TIMEDELTA): 15,
+    str(Marks.TIME): 16,
+    str(Marks.IP_ADDRESS): 17,
+    str(Marks.IP_NETWORK): 18,
+    str(Marks.IP_INTERFACE): 19,
+    str(Marks.PATH): 20,
+    str(Marks.FROZENSET): 21,
+    str(Marks.DEQUE): 22,
+    str(Marks.ORDERED_DICT): 23,
+    str(Marks.DEFAULT_DICT): 24,
+    str(Marks.NAMEDTUPLE): 25,
+    str(Marks.KEYED_DICT): 26,
+}
+EXT_MARKS: dict[int, str] = {code: mark for mark, code in EXT_CODES.items()}
+
+
+class MarkedDict(dict[str, Any]):
+    """
+    Dict with a type marker produced by pack() for binary backends.
+
+    A distinct type lets binary codecs encode marker dicts as extension
+    types instead of maps with 36-character marker keys.
+    """
+
+
+class Backend(ABC):
+    """
+    Base class for codec backends.
+
+    Subclasses must implement encode() and decode(); an incomplete backend
+    raises TypeError when it is instantiated.
+
+    Attributes:
+        name: Backend name used in configure_backend() and JsonSerializer(backend=...)
+        header: Payload prefix identifying the backend (empty for JSON)
+        binary: True if the codec carries raw bytes (no base64 for BYTES/NDARRAY)
+    """
+
+    name = ""
+    header = b""
+    binary = False
+
+    @abstractmethod
+    def encode(self, packed: Any, canonical: bool = False) -> bytes:
+        """
+        Encode packed structure to bytes.
+
+        Args:
+            packed: Output of JsonSerializer.pack()
+            canonical: Write map keys in sorted order, so equal structures
+                produce identical bytes
+
+        Returns:
+            Serialized bytes
+        """
+
+    @abstractmethod
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        """
+        Decode bytes to packed structure.
+
+        Args:
+            data: Serialized bytes (including header for binary backends)
+
+        Returns:
+            Structure for JsonSerializer.unpack()
+        """
+
+
+class JsonBackend(Backend):
+    """JSON backend using orjson (default)."""
+
+    name = "json"
+
+    def encode(self, packed: Any, canonical: bool = False) -> bytes:
+        """Encode packed structure to JSON bytes (canonical: orjson OPT_SORT_KEYS)."""
+        # OPT_SERIALIZE_NUMPY нужен только для маленьких ndarray, оставленных pack() как есть
+        if canonical:
+            return orjson.dumps(packed, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS)
+        return orjson.dumps(packed, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        """Decode JSON bytes."""
+        return orjson.loads(data)
+
+
+class MsgpackBackend(Backend):
+    """
+    Compact binary backend using MessagePack.
+
+    Marker dicts are encoded as extension types (one byte code instead of
+    a 36-character marker), bytes and ndarray buffers as raw bin values.
+    """
+
+    name = "msgpack"
+    header = bytes((BINARY_MAGIC, 0x01))
+    binary = True
+
+    def __init__(self) -> None:
+        """
+        Initialize backend.
+
+        Raises:
+            ImportError: If msgpack is not installed
+        """
+        # msgpack импортируется только при создании бэкенда
+        self._msgpack = import_optional("msgpack", "msgpack is required for MsgpackBackend")
+
+    def _default(self, obj: Any) -> Any:
+        """Encode marker dicts as extension types (msgpack default hook)."""
+        if isinstance(obj, MarkedDict):
+            model_key = obj.get(str(Marks.MODEL))
+            if model_key is not None:
+                fields = {k: v for k, v in obj.items() if k != str(Marks.MODEL)}
+                payload = self._packb([model_key, fields])
+                return self._msgpack.ExtType(EXT_CODES[str(Marks.MODEL)], payload)
+
+            (mark, value), = obj.items()
+            code = EXT_CODES.get(mark)
+            if code is None:
+                # Маркер без кода extension-типа - пишем обычным map
+                return dict(obj)
+            return self._msgpack.ExtType(code, self._packb(value))
+
+        # strict_types=True отправляет сюда подклассы встроенных типов (str-Enum, numpy float64, ...)
+        if isinstance(obj, str):
+            return str.__str__(obj)
+        if isinstance(obj, int):
+            return int(obj)
+        if isinstance(obj, float):
+            return float(obj)
+        if isinstance(obj, dict):
+            return dict(obj)
+        raise TypeError(f"Unsupported type for msgpack encoding: {type(obj)}")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        """Decode extension types back to marker dicts (msgpack ext_hook)."""
+        mark = EXT_MARKS.get(code)
+        if mark is None:
+            return self._msgpack.ExtType(code, data)
+
+        value = self._unpackb(data)
+        if mark == str(Marks.MODEL):
+            model_key, fields = value
+            return {mark: model_key, **fields}
+        return {mark: value}
+
+    def _packb(self, value: Any) -> bytes:
+        result: bytes = self._msgpack.packb(
+            value, default=self._default, strict_types=True, use_bin_type=True
+        )
+        return result
+
+    def _unpackb(self, data: bytes | bytearray | memoryview) -> Any:
+        return self._msgpack.unpackb(
+            data, ext_hook=self._ext_hook, raw=False, strict_map_key=False
+        )
+
+    def encode(self, packed: Any, canonical: bool = False) -> bytes:
+        """Encode packed structure to MessagePack bytes with header."""
+        if canonical:
+            # У msgpack нет сортировки ключей - сортируем map до кодирования
+            packed = _sort_maps(packed)
+        return self.header + self._packb(packed)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        """Decode MessagePack bytes (header is skipped)."""
+        return self._unpackb(memoryview(data)[len(self.header):])
+
+
+def _sort_maps(packed: Any) -> Any:
+    """
+    Copy packed structure with every map's keys in sorted order.
+
+    Walks iteratively (like pack()); MarkedDict stays MarkedDict.
+    """
+    root = [packed]
+    stack: list[Any] = [root]
+    while stack:
+        container = stack.pop()
+        for key, value in enumerate(container) if type(container) is list else container.items():
+            if isinstance(value, dict):
+                value = type(value)((k, value[k]) for k in canonical_sorted(value))
+            elif type(value) is list:
+                value = list(value)
+            else:
+                continue
+            container[key] = value
+            stack.append(value)
+    return root[0]
+
+
+# Реестр бэкендов: по имени (конфигурация) и по заголовку (автоопределение при чтении)
+BACKENDS: dict[str, type[Backend]] = {
+    JsonBackend.name: JsonBackend,
+    MsgpackBackend.name: MsgpackBackend,
+}
+_BACKENDS_BY_HEADER: dict[bytes, type[Backend]] = {
+    MsgpackBackend.header: MsgpackBackend,
+}
+_INSTANCES: dict[type[Backend], Backend] = {}
+
+# Выбор бэкенда по namespace: {namespace: backend name}
+NAMESPACE_BACKENDS: dict[str, str] = {}
+
+
+def get_backend(backend: str | Backend) -> Backend:
+    """
+    Get backend instance by name (instances are shared).
+
+    Args:
+        backend: Backend name or instance
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If backend name is unknown
+    """
+    if isinstance(backend, Backend):
+        return backend
+
+    backend_cls = BACKENDS.get(backend)
+    if backend_cls is None:
+        raise ValueError(f"Unknown backend '{backend}'. Available: {sorted(BACKENDS)}")
+
+    instance = _INSTANCES.get(backend_cls)
+    if instance is None:
+        instance = _INSTANCES[backend_cls] = backend_cls()
+    return instance
+
+
+def detect_backend(data: bytes | bytearray | memoryview) -> Backend:
+    """
+    Detect backend of serialized payload by its header.
+
+    Args:
+        data: Serialized bytes
+
+    Returns:
+        Backend instance (JSON if payload has no binary header)
+
+    Raises:
+        ValueError: If payload has an unknown binary header
+    """
+    if not data or data[0] != BINARY_MAGIC:
+        return get_backend(JsonBackend.name)
+
+    header = bytes(data[:2])
+    backend_cls = _BACKENDS_BY_HEADER.get(header)
+    if backend_cls is None:
+        raise ValueError(f"Unknown binary payload header: {header!r}")
+    return get_backend(backend_cls.name)
+
+
+def configure_backend(namespace: str, backend: str) -> None:
+    """
+    Select backend for serializers created with the given namespace.
+
+    Serializers read payloads of any backend (detected by header), so a
+    namespace can be switched without invalidating existing values.
+
+    Args:
+        namespace: Serializer namespace (e.g. "cache:v2:")
+        backend: Backend name ("json", "msgpack")
+
+    Raises:
+        ValueError: If backend name is unknown
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Available: {sorted(BACKENDS)}")
+    NAMESPACE_BACKENDS[namespace] = backend
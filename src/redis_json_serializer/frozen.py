@@ -0,0 +1,219 @@
+"""
+Immutable copies of decoded values for sharing between callers.
+
+freeze() turns lists, dicts and sets into read-only subclasses
+(ReadOnlyList, ReadOnlyDict, ReadOnlySet), deques into tuples and models
+into frozen copies, so one decoded result (e.g. from JsonSerializer's
+decode memo) can be handed out many times without defensive copies.
+Read-only containers stay list/dict/set instances: they compare equal to
+the originals, pass model validators and serialize like the originals.
+"""
+
+import collections
+import dataclasses
+from typing import Any
+
+from ._imports import loaded_class
+
+# Уже неизменяемые значения без дочерних элементов
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None), bytes, frozenset})
+
+# Атрибут frozen-подкласса модели: исходный (зарегистрированный) класс
+FROZEN_BASE_ATTRIBUTE = "__frozen_base__"
+
+
+def _reject_change(self: Any, *args: Any, **kwargs: Any) -> Any:
+    raise TypeError(f"cannot modify shared {type(self).__name__}")
+
+
+class ReadOnlyList(list):  # type: ignore[type-arg]
+    """List whose mutating methods raise TypeError."""
+
+    __slots__ = ()
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _reject_change
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _reject_change
+
+    def __reduce__(self) -> Any:
+        # copy/pickle: конструктор вместо поэлементного append
+        return type(self), (list(self),)
+
+
+class ReadOnlyDict(dict):  # type: ignore[type-arg]
+    """Dict whose mutating methods raise TypeError."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _reject_change
+    clear = pop = popitem = setdefault = update = _reject_change
+
+    def __reduce__(self) -> Any:
+        return type(self), (dict(self),)
+
+
+class ReadOnlySet(set):  # type: ignore[type-arg]
+    """Set whose mutating methods raise TypeError."""
+
+    __slots__ = ()
+
+    add = discard = remove = pop = clear = update = _reject_change
+    intersection_update = difference_update = symmetric_difference_update = _reject_change
+    __ior__ = __iand__ = __isub__ = __ixor__ = _reject_change
+
+    def __reduce__(self) -> Any:
+        return type(self), (set(self),)
+
+# Frozen-подклассы моделей: {класс модели: подкласс, запрещающий изменение атрибутов}
+_FROZEN_CLASSES: dict[type[Any], type[Any]] = {}
+
+
+def _is_model(obj: Any) -> bool:
+    """Check if value is a dataclass or Pydantic model instance."""
+    if dataclasses.is_dataclass(obj):
+        return True
+    base_model = loaded_class("pydantic", "BaseModel")
+    return base_model is not None and isinstance(obj, base_model)
+
+
+def _field_values(obj: Any) -> Any:
+    """Field values of a model instance, for equality between original and frozen copies."""
+    if dataclasses.is_dataclass(obj):
+        return tuple(getattr(obj, field.name) for field in dataclasses.fields(obj))
+    return obj.__dict__
+
+
+def _reject_mutation(self: Any, *args: Any) -> None:
+    raise dataclasses.FrozenInstanceError(f"cannot modify shared {type(self).__name__} instance")
+
+
+def frozen_class(cls: type[Any]) -> type[Any]:
+    """
+    Get (cached) subclass of a model class whose instances reject attribute changes.
+
+    Instances are isinstance() of cls and compare equal to cls instances
+    with equal fields; the subclass keeps cls in __frozen_base__, so
+    serializers write it under the alias of cls.
+
+    Args:
+        cls: Dataclass or Pydantic model class
+
+    Returns:
+        Frozen subclass
+    """
+    frozen = _FROZEN_CLASSES.get(cls)
+    if frozen is not None:
+        return frozen
+
+    def equals(self: Any, other: Any) -> Any:
+        if isinstance(other, cls):
+            return _field_values(self) == _field_values(other)
+        return NotImplemented
+
+    namespace = {
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__setattr__": _reject_mutation,
+        "__delattr__": _reject_mutation,
+        "__eq__": equals,
+        "__hash__": None,
+        FROZEN_BASE_ATTRIBUTE: cls,
+    }
+    # Метакласс модели (ModelMetaclass у Pydantic) создаёт подкласс как обычное наследование
+    metaclass: Any = type(cls)
+    frozen = metaclass(cls.__name__, (cls,), namespace)
+    _FROZEN_CLASSES[cls] = frozen
+    return frozen  # type: ignore[no-any-return]
+
+
+def _frozen_model(obj: Any, freeze_child: Any) -> Any:
+    """Build frozen copy of a model with frozen field values."""
+    cls = frozen_class(type(obj))
+    if dataclasses.is_dataclass(obj):
+        instance = object.__new__(cls)
+        for field in dataclasses.fields(obj):
+            object.__setattr__(instance, field.name, freeze_child(getattr(obj, field.name)))
+        return instance
+
+    # Pydantic: model_construct (v2) / construct (v1) присваивают поля в обход __setattr__
+    construct = getattr(cls, "model_construct", None) or cls.construct
+    return construct(**{name: freeze_child(value) for name, value in obj.__dict__.items()})
+
+
+def _children(obj: Any) -> Any:
+    """Values to freeze before obj (None for values that stay as they are)."""
+    obj_type = type(obj)
+    if obj_type in _ATOMIC_TYPES:
+        return None
+    if isinstance(obj, dict):
+        return obj.values()
+    if isinstance(obj, (list, tuple, set, collections.deque)):
+        return obj
+    if _is_model(obj):
+        if dataclasses.is_dataclass(obj):
+            return [getattr(obj, field.name) for field in dataclasses.fields(obj)]
+        return obj.__dict__.values()
+    return None
+
+
+def freeze(obj: Any) -> Any:
+    """
+    Return immutable copy of a decoded value.
+
+    Containers are converted after their elements (iteratively, no
+    recursion): list -> ReadOnlyList, dict (and OrderedDict/defaultdict) ->
+    ReadOnlyDict, set -> ReadOnlySet, tuple/deque -> tuple (namedtuples keep
+    their class), dataclass/Pydantic models -> frozen copies (see
+    frozen_class()). NumPy arrays are made read-only in place. Scalars (str,
+    datetime, Decimal, UUID, ...) are immutable already and are returned as is.
+
+    Args:
+        obj: Decoded value (result of loads()/unpack())
+
+    Returns:
+        Immutable value
+    """
+    if type(obj) in _ATOMIC_TYPES:
+        return obj
+
+    frozen: dict[int, Any] = {}
+
+    def freeze_child(child: Any) -> Any:
+        return frozen.get(id(child), child)
+
+    # Обход в обратном порядке: (значение, True) снимается со стека после всех его детей
+    seen: set[int] = set()
+    stack: list[tuple[Any, bool]] = [(obj, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            frozen[id(node)] = _freeze_node(node, freeze_child)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        children = _children(node)
+        if children is not None:
+            stack.extend((child, False) for child in children if type(child) not in _ATOMIC_TYPES)
+    return frozen[id(obj)]
+
+
+def _freeze_node(node: Any, freeze_child: Any) -> Any:
+    """Frozen copy of one value whose children are already frozen."""
+    if isinstance(node, dict):
+        return ReadOnlyDict({key: freeze_child(value) for key, value in node.items()})
+    if isinstance(node, list):
+        return ReadOnlyList(map(freeze_child, node))
+    if isinstance(node, tuple) and hasattr(node, "_fields"):
+        return node._make(map(freeze_child, node))  # type: ignore[attr-defined]
+    if isinstance(node, (tuple, collections.deque)):
+        return tuple(map(freeze_child, node))
+    if isinstance(node, set):
+        return ReadOnlySet(map(freeze_child, node))
+    if _is_model(node):
+        return _frozen_model(node, freeze_child)
+
+    ndarray = loaded_class("numpy", "ndarray")
+    if ndarray is not None and isinstance(node, ndarray):
+        node.setflags(write=False)
+    return node
@@ -0,0 +1,138 @@
+"""
+Attribute paths on registered models translated to RedisJSON JSONPath.
+
+Packed documents keep model fields as plain keys of the model marker dict,
+so "settings.theme" on a registered model addresses "$.settings.theme" in
+the stored JSON document. Every marker subtree (datetime, Decimal, set,
+nested model, ...) is self-contained and can be decoded on its own with
+JsonSerializer.unpack() and the field's type.
+"""
+
+import dataclasses
+import re
+import types
+from functools import lru_cache
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+import orjson
+
+from ._imports import loaded_class
+from .registry import MODEL_ALIASES, RegistrationError
+from .types import Marks
+
+# Шаг пути: .attr / attr, [index], ["key"] / ['key']
+_STEP = re.compile(
+    r"""\.?(?P<attr>[A-Za-z_][A-Za-z0-9_]*)|\[(?P<index>-?\d+)\]|\[(?P<quote>['"])(?P<key>.*?)(?P=quote)\]"""
+)
+
+
+def _is_model(tp: Any) -> bool:
+    """Check if type is a dataclass or Pydantic model class."""
+    if not isinstance(tp, type):
+        return False
+    if dataclasses.is_dataclass(tp):
+        return True
+    base_model = loaded_class("pydantic", "BaseModel")
+    return base_model is not None and issubclass(tp, base_model)
+
+
+def _unwrap_optional(tp: Any) -> Any:
+    """Return X for Optional[X] / X | None, other types unchanged."""
+    if get_origin(tp) in (Union, types.UnionType):
+        args = [arg for arg in get_args(tp) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return tp
+
+
+def resolve_path(model: type[Any], path: str) -> tuple[str, Any]:
+    """
+    Translate attribute path on a registered model into JSONPath.
+
+    Supported steps: attributes of (nested) models ("settings.theme"),
+    list/tuple indexes ("items[0]") and dict keys ('labels["env"]').
+
+    Args:
+        model: Registered model class (root of the stored document)
+        path: Attribute path, e.g. "settings.theme" or "orders[0].total"
+
+    Returns:
+        (JSONPath, expected type of the addressed value for unpack())
+
+    Raises:
+        RegistrationError: If model is not registered
+        ValueError: If path is malformed or does not match the field types
+
+    Example:
+        resolve_path(User, "settings.theme")  # ("$.settings.theme", str)
+    """
+    if model not in MODEL_ALIASES:
+        raise RegistrationError(f"Model {model} is not registered. Use @register_model()")
+    return _resolve_path(model, path)  # type: ignore[arg-type]
+
+
+@lru_cache(maxsize=1024)
+def _resolve_path(model: Any, path: str) -> tuple[str, Any]:
+    """Walk path over field types (cached: paths are usually code constants)."""
+    json_path = ["$"]
+    current: Any = model
+    position = 0
+    while position < len(path):
+        match = _STEP.match(path, position)
+        if match is None or (position == 0 and path.startswith(".")):
+            raise ValueError(f"Invalid attribute path '{path}' at position {position}")
+        position = match.end()
+        current = _unwrap_optional(current)
+
+        if match["attr"] is not None:
+            name = match["attr"]
+            if not _is_model(current):
+                raise ValueError(f"Cannot get attribute '{name}' of {current} in path '{path}'")
+            hints = get_type_hints(current)
+            if name not in hints:
+                raise ValueError(f"{current.__name__} has no field '{name}' (path '{path}')")
+            json_path.append(f".{name}")
+            current = hints[name]
+
+        elif match["index"] is not None:
+            index = int(match["index"])
+            origin = get_origin(current)
+            args = get_args(current)
+            if origin is list:
+                json_path.append(f"[{index}]")
+                current = args[0] if args else Any
+            elif origin is tuple:
+                # Элементы tuple лежат под маркером TUPLE
+                json_path.append(f'["{Marks.TUPLE}"][{index}]')
+                if len(args) == 2 and args[1] is Ellipsis:
+                    current = args[0]
+                else:
+                    current = args[index] if -len(args) <= index < len(args) else Any
+            else:
+                raise ValueError(f"Cannot index {current} in path '{path}'")
+
+        else:
+            key = match["key"]
+            if get_origin(current) is not dict:
+                raise ValueError(f"Cannot get key '{key}' of {current} in path '{path}'")
+            json_path.append(f"[{orjson.dumps(key).decode()}]")
+            args = get_args(current)
+            current = args[1] if len(args) > 1 else Any
+
+    if current is Any:
+        current = None
+    return "".join(json_path), current
+
+
+def json_path(model: type[Any], path: str) -> str:
+    """
+    Translate attribute path on a registered model into JSONPath.
+
+    Args:
+        model: Registered model class
+        path: Attribute path, e.g. "settings.theme"
+
+    Returns:
+        JSONPath, e.g. "$.settings.theme"
+    """
+    return resolve_path(model, path)[0]
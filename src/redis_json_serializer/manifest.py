@@ -0,0 +1,50 @@
+"""
+Registry manifest generator: python -m redis_json_serializer manifest <modules>.
+
+Imports modules that define models and writes {alias: "module:qualname"}
+for load_manifest(), so workers can declare models without importing
+the application (see declare_model()).
+"""
+
+import argparse
+import importlib
+import sys
+
+import orjson
+
+from .registry import export_manifest, load_entry_points
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the manifest generator CLI.
+
+    Args:
+        argv: Arguments without the program name (None - sys.argv)
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m redis_json_serializer manifest",
+        description="Write alias -> module:qualname manifest of registered models.",
+    )
+    parser.add_argument("modules", nargs="*", help="Modules registering models (imported in order)")
+    parser.add_argument(
+        "--entry-points", action="store_true", help="Include models declared via entry points"
+    )
+    parser.add_argument("-o", "--output", default=None, help="Output file (default - stdout)")
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        importlib.import_module(module)
+    if args.entry_points:
+        load_entry_points()
+
+    data = orjson.dumps(export_manifest(), option=orjson.OPT_INDENT_2) + b"\n"
+    if args.output is None:
+        sys.stdout.write(data.decode())
+    else:
+        with open(args.output, "wb") as stream:
+            stream.write(data)
+    return 0
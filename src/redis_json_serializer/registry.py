@@ -5,17 +5,15 @@ TODO: Реализовать команде разработки
 """
 
 import dataclasses
-from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, TypeVar
-
-if TYPE_CHECKING:
-    from pydantic import BaseModel
-else:
-    try:
-        from pydantic import BaseModel
-    except ImportError:
-        BaseModel = None  # type: ignore[assignment, misc]
+import enum
+import importlib
+import json
+import os
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any, TypeVar
 
+from ._imports import loaded_class
 
 T = TypeVar("T")
 
@@ -33,6 +31,18 @@ class RegistrationError(SerializationSecurityError):
 REGISTERED_MODELS: dict[str, type[Any]] = {}
 MODEL_ALIASES: dict[type[Any], str] = {}  # O(1) lookup: {Type: alias}
 
+# Миграции моделей: {старый алиас: (следующий алиас, функция обновления полей)}
+MIGRATIONS: dict[str, tuple[str, Callable[[dict[str, Any]], dict[str, Any]]]] = {}
+# Предвычисленные цепочки: {старый алиас: (последний алиас, функции обновления по порядку)}
+MIGRATION_PLANS: dict[str, tuple[str, tuple[Callable[[dict[str, Any]], dict[str, Any]], ...]]] = {}
+
+# Объявленные, но ещё не импортированные модели: {алиас: "module:qualname"}
+LAZY_MODELS: dict[str, str] = {}
+# Группа entry points, из которой load_entry_points() читает объявления моделей
+ENTRY_POINT_GROUP = "redis_json_serializer.models"
+# RLock: модуль модели может сам читать из кэша при импорте
+_LAZY_LOCK = threading.RLock()
+
 
 def get_key_model(cls: type[Any], alias: str | None = None) -> str:
     """
@@ -61,13 +71,95 @@ def get_key_model(cls: type[Any], alias: str | None = None) -> str:
     return f"{module}.{qualname}"
 
 
-def register_model(alias: str | None = None) -> Callable[[type[T]], type[T]]:
+def _build_migration_plans() -> dict[str, tuple[str, tuple[Callable[[dict[str, Any]], dict[str, Any]], ...]]]:
     """
-    Decorator for registering Pydantic models and dataclasses.
+    Resolve every migration chain to its latest alias.
+
+    Raises:
+        RegistrationError: If migrations form a cycle
+    """
+    plans = {}
+    for source in MIGRATIONS:
+        alias = source
+        upgrades = []
+        seen = {source}
+        while alias in MIGRATIONS:
+            alias, upgrade = MIGRATIONS[alias]
+            if alias in seen:
+                raise RegistrationError(f"Migration cycle through '{alias}' (from '{source}')")
+            seen.add(alias)
+            upgrades.append(upgrade)
+        plans[source] = (alias, tuple(upgrades))
+    return plans
+
+
+def register_migration(
+    from_alias: str,
+    to_alias: str,
+    upgrade: Callable[[dict[str, Any]], dict[str, Any]],
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """
+    Register an upgrade of stored models from an old alias to a newer one.
+
+    Payloads written under from_alias are upcast on read: upgrade receives
+    the decoded fields of the old model (nested values already restored)
+    and returns fields for to_alias. Chains (v1 -> v2 -> v3) are resolved
+    once here, so unpack() upcasts with a single lookup.
+
+    Args:
+        from_alias: Alias of the old model version (must not be registered)
+        to_alias: Alias of the next version (registered model or another
+            migration source)
+        upgrade: Function converting fields of from_alias to fields of to_alias
+
+    Returns:
+        upgrade (unchanged)
+
+    Raises:
+        RegistrationError: If from_alias is a registered model, already has
+            a migration, or the migration would form a cycle
+
+    Example:
+        register_migration("user.v1", "user.v2", lambda data: {**data, "email": None})
+    """
+    if from_alias in REGISTERED_MODELS:
+        raise RegistrationError(
+            f"Cannot migrate from '{from_alias}': it is registered for {REGISTERED_MODELS[from_alias]}"
+        )
+    if from_alias in MIGRATIONS:
+        raise RegistrationError(
+            f"Migration from '{from_alias}' already registered (to '{MIGRATIONS[from_alias][0]}')"
+        )
+
+    MIGRATIONS[from_alias] = (to_alias, upgrade)
+    try:
+        plans = _build_migration_plans()
+    except RegistrationError:
+        del MIGRATIONS[from_alias]
+        raise
+    MIGRATION_PLANS.clear()
+    MIGRATION_PLANS.update(plans)
+    # Объявление алиаса в манифесте разрешено: модуль зарегистрировал миграцию с него
+    LAZY_MODELS.pop(from_alias, None)
+    return upgrade
+
+
+def register_model(
+    alias: str | None = None,
+    migrations: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] | None = None,
+) -> Callable[[type[T]], type[T]]:
+    """
+    Decorator for registering Pydantic models, dataclasses, Enum and namedtuple classes.
+
+    Enum members are serialized by alias and value (str/int Enum subclasses
+    stay plain JSON values). Unregistered namedtuples are serialized as
+    plain tuples.
 
     Args:
         alias: Optional stable alias for the model (recommended for production).
                If not provided, uses class name and module path.
+        migrations: Upgrade functions from older aliases to this model,
+               {old alias: upgrade} (see register_migration())
 
     Example:
         @register_model("user.v1")
@@ -75,31 +167,46 @@ def register_model(alias: str | None = None) -> Callable[[type[T]], type[T]]:
             id: str
             name: str
 
+        @register_model("user.v2", migrations={"user.v1": lambda data: {**data, "email": None}})
+        class User(BaseModel):
+            id: str
+            name: str
+            email: str | None
+
     Raises:
-        TypeError: If model is not Pydantic BaseModel or dataclass
+        TypeError: If model is not Pydantic BaseModel, dataclass, Enum or namedtuple
         RegistrationError: If alias is already registered for a different class or model is already registered
     """
     def decorator(cls: type[T]) -> type[T]:
-        # Проверка типа
+        # Проверка типа (pydantic не импортируется: модель не может существовать без него)
         is_pydantic = False
-        if BaseModel is not None:
+        base_model = loaded_class("pydantic", "BaseModel")
+        if base_model is not None:
             try:
-                is_pydantic = issubclass(cls, BaseModel)
+                is_pydantic = issubclass(cls, base_model)
             except (TypeError, AttributeError):
                 # cls не является классом или BaseModel не определен
                 pass
 
         is_dataclass = dataclasses.is_dataclass(cls)
+        is_enum = isinstance(cls, type) and issubclass(cls, enum.Enum)
+        is_namedtuple = isinstance(cls, type) and issubclass(cls, tuple) and hasattr(cls, "_fields")
 
-        if not (is_pydantic or is_dataclass):
+        if not (is_pydantic or is_dataclass or is_enum or is_namedtuple):
             cls_name = getattr(cls, '__name__', getattr(cls, '__qualname__', str(cls)))
             raise TypeError(
-                f"Model must be Pydantic BaseModel or dataclass, got {cls_name}"
+                f"Model must be Pydantic BaseModel or dataclass (or Enum, namedtuple), got {cls_name}"
             )
 
         # Генерация ключа
         model_key = get_key_model(cls, alias)
 
+        # Алиас, с которого зарегистрирована миграция, больше не может быть моделью
+        if model_key in MIGRATIONS:
+            raise RegistrationError(
+                f"Alias '{model_key}' is migrated to '{MIGRATIONS[model_key][0]}' and cannot be registered"
+            )
+
         # Проверка дубликатов
         if model_key in REGISTERED_MODELS:
             existing_cls = REGISTERED_MODELS[model_key]
@@ -119,12 +226,200 @@ def register_model(alias: str | None = None) -> Callable[[type[T]], type[T]]:
         # Регистрация
         REGISTERED_MODELS[model_key] = cls
         MODEL_ALIASES[cls] = model_key  # O(1) lookup
+        # Явная регистрация заменяет ленивое объявление алиаса
+        LAZY_MODELS.pop(model_key, None)
+
+        for old_alias, upgrade in (migrations or {}).items():
+            register_migration(old_alias, model_key, upgrade)
 
         return cls
 
     return decorator
 
 
+def declare_model(alias: str, path: str) -> None:
+    """
+    Declare a model by import path without importing its module.
+
+    The module is imported on the first read of alias (see lookup_model());
+    registering models through declarations lets workers decode values
+    without importing the whole application first. Only declared aliases
+    trigger imports, so payloads cannot import arbitrary modules.
+
+    An old alias with a migration is declared with the path of the model
+    it migrates to: importing that model registers the migration.
+
+    Args:
+        alias: Model alias, as passed to @register_model() (or migration
+            source alias, see register_migration())
+        path: "module:qualname" of the model class, e.g. "myapp.models:User"
+
+    Raises:
+        ValueError: If path is not "module:qualname"
+        RegistrationError: If alias is already declared/registered for a
+            different class
+    """
+    module_name, _, qualname = path.partition(":")
+    if not module_name or not qualname:
+        raise ValueError(f"Model path must be 'module:qualname', got '{path}'")
+    if alias in MIGRATIONS:
+        # Миграция уже зарегистрирована - алиас разрешается без импорта
+        return
+
+    cls = REGISTERED_MODELS.get(alias)
+    if cls is not None:
+        if _model_path(cls) != path:
+            raise RegistrationError(
+                f"Cannot declare '{alias}' as '{path}': already registered for {cls}"
+            )
+        return
+    declared = LAZY_MODELS.get(alias)
+    if declared is not None and declared != path:
+        raise RegistrationError(f"Duplicate alias '{alias}': already declared as '{declared}'")
+    LAZY_MODELS[alias] = path
+
+
+def load_manifest(manifest: Mapping[str, str] | str | os.PathLike[str]) -> None:
+    """
+    Declare models from a manifest {alias: "module:qualname"}.
+
+    Suitable as a process pool initializer:
+        ProcessPoolExecutor(initializer=load_manifest, initargs=(export_manifest(),))
+
+    Args:
+        manifest: Mapping or path to a JSON file with the mapping
+            (see export_manifest() and "python -m redis_json_serializer manifest")
+
+    Raises:
+        ValueError: If a model path is malformed
+        RegistrationError: If an alias conflicts with existing registrations
+    """
+    models: Mapping[str, str]
+    if isinstance(manifest, Mapping):
+        models = manifest
+    else:
+        with open(manifest, encoding="utf-8") as stream:
+            models = json.load(stream)
+    for alias, path in models.items():
+        declare_model(alias, path)
+
+
+def load_entry_points(group: str = ENTRY_POINT_GROUP) -> int:
+    """
+    Declare models published by installed distributions as entry points.
+
+    Each entry point of the group declares one model: the name is the alias,
+    the value is "module:qualname", e.g. in pyproject.toml:
+
+        [project.entry-points."redis_json_serializer.models"]
+        "user.v1" = "myapp.models:User"
+
+    Args:
+        group: Entry point group
+
+    Returns:
+        Number of declared models
+
+    Raises:
+        RegistrationError: If an alias conflicts with existing registrations
+    """
+    # importlib.metadata - только при вызове: сканирование дистрибутивов не нужно при импорте пакета
+    from importlib.metadata import entry_points
+
+    declared = 0
+    for entry_point in entry_points(group=group):
+        declare_model(entry_point.name, entry_point.value)
+        declared += 1
+    return declared
+
+
+def export_manifest() -> dict[str, str]:
+    """
+    Export current registrations as a manifest for load_manifest().
+
+    Contains registered models importable by path (classes defined inside
+    functions are skipped), declared models not imported yet and migration
+    sources mapped to the path of their latest model, so old payloads are
+    upcast in workers bootstrapped from the manifest.
+
+    Returns:
+        {alias: "module:qualname"}, sorted by alias
+    """
+    manifest = dict(LAZY_MODELS)
+    for alias, cls in REGISTERED_MODELS.items():
+        manifest[alias] = _model_path(cls)
+    for alias, (target, _) in MIGRATION_PLANS.items():
+        target_cls = REGISTERED_MODELS.get(target)
+        path = _model_path(target_cls) if target_cls is not None else LAZY_MODELS.get(target)
+        if path is not None:
+            manifest[alias] = path
+    return {alias: path for alias, path in sorted(manifest.items()) if "<locals>" not in path}
+
+
+def _model_path(cls: type[Any]) -> str:
+    """Import path "module:qualname" of a class."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_model(alias: str, path: str) -> Any:
+    """Import object by "module:qualname" path."""
+    module_name, _, qualname = path.partition(":")
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as e:
+        raise RegistrationError(f"Cannot import model '{alias}' from '{path}': {e}") from e
+    return obj
+
+
+def lookup_model(alias: str) -> type[Any] | None:
+    """
+    Get registered model class by alias, importing declared models on first use.
+
+    Args:
+        alias: Model alias
+
+    Returns:
+        Model class or None if alias is neither registered nor declared
+        (or turned out to be a migration source when its module was imported)
+
+    Raises:
+        RegistrationError: If a declared model cannot be imported or its
+            class is registered under a different alias
+    """
+    cls = REGISTERED_MODELS.get(alias)
+    if cls is not None or alias not in LAZY_MODELS:
+        return cls
+
+    with _LAZY_LOCK:
+        path = LAZY_MODELS.get(alias)
+        if path is None:
+            # Импортирован другим потоком, пока ждали блокировку
+            return REGISTERED_MODELS.get(alias)
+
+        # Импорт модуля обычно регистрирует модель декоратором @register_model
+        imported: type[Any] = _import_model(alias, path)
+        cls = REGISTERED_MODELS.get(alias)
+        if cls is None and alias in MIGRATIONS:
+            # Старый алиас: модуль зарегистрировал миграцию на новую модель
+            return None
+        if cls is None:
+            registered_alias = MODEL_ALIASES.get(imported)
+            if registered_alias is not None:
+                raise RegistrationError(
+                    f"Model '{path}' is registered as '{registered_alias}', not '{alias}'"
+                )
+            register_model(alias)(imported)
+            cls = imported
+        elif cls is not imported:
+            raise RegistrationError(
+                f"Alias '{alias}' is declared as '{path}' but registered for {cls}"
+            )
+        LAZY_MODELS.pop(alias, None)
+    return cls
+
+
 class ModelRegistry:
     """
     Registry for managing model registration.
@@ -158,15 +453,44 @@ class ModelRegistry:
             The registered class
 
         Raises:
-            TypeError: If model is not Pydantic BaseModel or dataclass
+            TypeError: If model is not Pydantic BaseModel, dataclass, Enum or namedtuple
             RegistrationError: If alias is already registered for a different class or model is already registered
         """
         # Использовать тот же декоратор для консистентности
         return register_model(alias)(cls)
 
+    def register_migration(
+        self,
+        from_alias: str,
+        to_alias: str,
+        upgrade: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> Callable[[dict[str, Any]], dict[str, Any]]:
+        """
+        Register an upgrade from an old model alias (see register_migration()).
+
+        Args:
+            from_alias: Alias of the old model version
+            to_alias: Alias of the next version
+            upgrade: Function converting fields of from_alias to fields of to_alias
+
+        Returns:
+            upgrade (unchanged)
+        """
+        return register_migration(from_alias, to_alias, upgrade)
+
+    def declare(self, alias: str, path: str) -> None:
+        """
+        Declare a model by import path, imported on first use (see declare_model()).
+
+        Args:
+            alias: Model alias
+            path: "module:qualname" of the model class
+        """
+        declare_model(alias, path)
+
     def get(self, key: str) -> type[Any] | None:
         """
-        Get model by key.
+        Get model by key (declared models are imported on first use).
 
         Args:
             key: Model key (alias or module.qualname)
@@ -174,7 +498,7 @@ class ModelRegistry:
         Returns:
             Model class or None if not found
         """
-        return REGISTERED_MODELS.get(key)
+        return lookup_model(key)
 
     def get_alias(self, cls: type[Any]) -> str | None:
         """
@@ -6,36 +6,340 @@ TODO: Реализовать команде разработки
 
 from __future__ import annotations
 
+import base64
+import binascii
+import collections
 import dataclasses
 import datetime
+import enum
+import hashlib
+import io
+import ipaddress
+import math
+import pathlib
+import random
+import re
+import sys
+import threading
+import time
+import types
+import uuid
 from collections.abc import Callable
+from contextvars import ContextVar
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, get_args, get_origin
+from functools import partial
+from itertools import chain, repeat
+from typing import Any, get_args, get_origin, get_type_hints
+
+from redis_json_serializer.types import (
+    COMPUTE_TIME_KEY,
+    DATA_KEY,
+    NS_KEY,
+    SOFT_TTL_KEY,
+    WRITTEN_AT_KEY,
+    Marks,
+)
+
+from ._imports import import_optional, loaded_class
+from .backends import NAMESPACE_BACKENDS, Backend, MarkedDict, detect_backend, get_backend
+from .frozen import FROZEN_BASE_ATTRIBUTE, freeze
+from .registry import (
+    MIGRATION_PLANS,
+    MODEL_ALIASES,
+    REGISTERED_MODELS,
+    RegistrationError,
+    lookup_model,
+)
+from .utils import canonical_sorted, content_digest
+
+# Опциональные зависимости (pydantic, bson, numpy, fastapi/starlette) не импортируются
+# при импорте пакета: проверки типов идут через sys.modules (см. _imports.py)
+
+# Значение по умолчанию для поиска в dispatch-таблице: тип ещё не разрешён
+_UNRESOLVED: Any = object()
+
+# Переопределение trusted-режима на время одного вызова loads() (None - настройка сериализатора)
+_TRUSTED_OVERRIDE: ContextVar[bool | None] = ContextVar("_TRUSTED_OVERRIDE", default=None)
+
+# Алиасы моделей, обновлённых миграциями во время loads_migrated() (None - не отслеживается)
+_MIGRATED: ContextVar[list[str] | None] = ContextVar("_MIGRATED", default=None)
+
+# Точка отсчёта для компактного (числового) представления datetime
+_EPOCH = datetime.datetime(1970, 1, 1)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_ONE_SECOND = datetime.timedelta(seconds=1)
+
+# Минимальная длина массива, начиная с которой пакетное декодирование через NumPy выгоднее
+_NUMPY_MIN_BATCH = 64
+
+# Виды dtype, которые orjson умеет сериализовать нативно (OPT_SERIALIZE_NUMPY)
+_NUMPY_JSON_KINDS = frozenset("biuf")
+
+# Маркеры - ключи dict, созданных pack() (маркер всегда первый ключ)
+_MARKER_KEYS = frozenset(str(mark) for mark in Marks)
+# Байтовые представления маркеров - для поиска маркеров в сериализованном JSON
+_MARKER_BYTES = tuple(str(mark).encode("ascii") for mark in Marks)
+
+# Флаги JSON-payload - ведущий пробельный символ (payload остаётся валидным JSON):
+# пробел - маркеров нет, табуляция - есть маркеры. Payload без флага (записанный старой
+# версией или не этой библиотекой) проверяется поиском маркеров по байтам
+_PLAIN_JSON_FLAG = b" "
+_MARKED_JSON_FLAG = b"\t"
+
+# Проверка глубины JSON без разбора: остаются только скобки, кавычки и обратные слэши
+_JSON_DEPTH_DROP = bytes(range(256)).translate(None, b'[]{}"\\')
+_JSON_SQUARE_BRACKETS = bytes.maketrans(b"{}", b"[]")
+_JSON_STRING = re.compile(rb'"[^"]*"')
+
+# Максимальная глубина вложенности по умолчанию: бинарные бэкенды (лимит orjson.loads - 1024
+# уровня) и JSON-бэкенд (orjson.dumps кодирует не более 254 уровней)
+DEFAULT_MAX_DEPTH = 1024
+JSON_MAX_DEPTH = 254
+# Сообщение orjson.dumps при превышении его лимита вложенности
+_CODEC_RECURSION_MESSAGE = "Recursion limit reached"
+
+# Интернирование при unpack(): строки до этой длины, размер таблицы на сериализатор
+DEFAULT_INTERN_MAX_LENGTH = 64
+DEFAULT_INTERN_TABLE_SIZE = 65_536
+
+# Кэш декодирования loads_shared(): число результатов и размер ключа (BLAKE2b, байт)
+DEFAULT_DECODE_CACHE_SIZE = 1024
+_DECODE_KEY_SIZE = 16
+
+# Маркеры неизменяемых значений, которые можно разделять между местами результата
+_INTERNED_MARKS = (
+    Marks.DECIMAL,
+    Marks.DATE,
+    Marks.DATETIME,
+    Marks.DATE_ORDINAL,
+    Marks.DATETIME_TS,
+    Marks.TIME,
+    Marks.TIMEDELTA,
+    Marks.UUID,
+)
+# Типы закодированного значения маркера, пригодные как ключ таблицы
+_INTERN_KEY_TYPES = frozenset({str, int, bytes})
+
+# IP-адреса (бинарные бэкенды пишут их 4/16 байтами)
+_IP_ADDRESS_TYPES = (ipaddress.IPv4Address, ipaddress.IPv6Address)
+
+# Типы, восстанавливаемые из строки вызовом класса (Enum - поиск члена по значению)
+_STRING_CONSTRUCTED_TYPES = (
+    enum.Enum,
+    pathlib.PurePath,
+    *_IP_ADDRESS_TYPES,
+    ipaddress.IPv4Network,
+    ipaddress.IPv6Network,
+)
+
+# Pure-пути пишутся с видом пути, чтобы не стать Path при чтении без expected_type
+_PURE_PATH_KINDS: dict[str, type[pathlib.PurePath]] = {
+    "posix": pathlib.PurePosixPath,
+    "windows": pathlib.PureWindowsPath,
+}
+
+# Типы ключей dict, которые пишутся обычным JSON-объектом (остальные - KEYED_DICT)
+_STR_KEY_TYPES = frozenset({str})
+
+# Допустимые default_factory для DEFAULT_DICT (по имени, без импорта произвольных объектов)
+_DEFAULT_FACTORIES: dict[str, Callable[[], Any]] = {
+    factory.__name__: factory for factory in (list, dict, set, frozenset, tuple, int, float, str, bool)
+}
+
+# Типы, которые pack() возвращает как есть - проверяются по type() без вызова обработчика
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+# То же для unpack(): строки могут требовать преобразования по expected_type
+_UNPACK_SCALAR_TYPES = frozenset({int, float, bool, type(None)})
+
+
+def _b64decode_strict(data: str) -> bytes:
+    """Decode base64 rejecting characters outside the alphabet and misplaced padding."""
+    if sys.version_info >= (3, 11):
+        return binascii.a2b_base64(data, strict_mode=True)
+    return base64.b64decode(data, validate=True)
+
+
+def _json_depth_exceeds(data: bytes | bytearray, limit: int) -> bool:
+    """
+    Check if nesting depth of valid JSON exceeds limit, with bytes operations only.
+
+    Everything but brackets, quotes and backslashes is dropped, then escapes
+    and string contents; each pass of removing empty "[]" pairs removes one
+    nesting level.
+    """
+    brackets = data.translate(None, _JSON_DEPTH_DROP)
+    if b"\\" in brackets:
+        brackets = brackets.replace(b"\\\\", b"").replace(b'\\"', b"").translate(None, b"\\")
+    # Удаление двух соседних кавычек не меняет чётность кавычек перед скобками,
+    # так что скобки внутри строк остаются внутри строк
+    brackets = brackets.replace(b'""', b"")
+    if b'"' in brackets:
+        brackets = _JSON_STRING.sub(b"", brackets)
+    brackets = brackets.translate(_JSON_SQUARE_BRACKETS)
+    for _ in range(limit):
+        if not brackets:
+            return False
+        brackets = brackets.replace(b"[]", b"")
+    return bool(brackets)
+
+
+def _has_markers(data: bytes | bytearray) -> bool:
+    """Check if unflagged serialized JSON contains any type marker (one byte search per marker)."""
+    return any(marker in data for marker in _MARKER_BYTES)
+
+
+def _build_deque(items: list[Any]) -> collections.deque[Any]:
+    """Build deque from unpacked [maxlen, *items]."""
+    return collections.deque(items[1:], maxlen=items[0])
+
+
+def _build_dict(items: list[Any]) -> dict[Any, Any]:
+    """Build dict from unpacked flat key/value list."""
+    return dict(zip(items[::2], items[1::2]))
+
+
+def _build_ordered_dict(items: list[Any]) -> collections.OrderedDict[Any, Any]:
+    """Build OrderedDict from unpacked flat key/value list."""
+    return collections.OrderedDict(zip(items[::2], items[1::2]))
+
+
+def _build_defaultdict(items: list[Any]) -> collections.defaultdict[Any, Any]:
+    """Build defaultdict from unpacked [factory name, *flat key/value list]."""
+    factory = None if items[0] is None else _DEFAULT_FACTORIES[items[0]]
+    return collections.defaultdict(factory, zip(items[1::2], items[2::2]))
+
+
+def _build_namedtuple(cls: type[Any], items: list[Any]) -> Any:
+    """Build namedtuple from unpacked [alias, *items]."""
+    return cls(*items[1:])
+
+
+class _Miss:
+    """Type of the MISS sentinel (singleton, falsy)."""
+
+    __slots__ = ()
+    _instance: _Miss | None = None
+
+    def __new__(cls) -> _Miss:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "MISS"
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        return "MISS"
 
-from redis_json_serializer.types import DATA_KEY, NS_KEY, Marks
 
-from .registry import MODEL_ALIASES, RegistrationError
+# Значение "в кеше ничего нет" (в отличие от закешированного None)
+MISS: Any = _Miss()
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheMeta:
+    """
+    Envelope metadata of a value written with a soft TTL (stale-while-revalidate).
+
+    Attributes:
+        written_at: Write time (epoch seconds)
+        soft_ttl: Seconds after written_at the value is considered stale
+        compute_time: Seconds it took to compute the value (None - unknown)
+    """
+
+    written_at: float
+    soft_ttl: float
+    compute_time: float | None = None
+
+    @classmethod
+    def from_envelope(cls, envelope: dict[str, Any]) -> CacheMeta | None:
+        """Read metadata from a namespace wrapper (None if it carries none)."""
+        written_at = envelope.get(WRITTEN_AT_KEY)
+        soft_ttl = envelope.get(SOFT_TTL_KEY)
+        if not isinstance(written_at, int) or not isinstance(soft_ttl, int):
+            return None
+        compute_time = envelope.get(COMPUTE_TIME_KEY)
+        return cls(
+            written_at / 1000,
+            soft_ttl / 1000,
+            compute_time / 1000 if isinstance(compute_time, int) else None,
+        )
+
+    @property
+    def stale_at(self) -> float:
+        """Time (epoch seconds) the value becomes stale."""
+        return self.written_at + self.soft_ttl
+
+    def age(self, now: float | None = None) -> float:
+        """Seconds since the value was written."""
+        return (time.time() if now is None else now) - self.written_at
+
+    def is_stale(self, now: float | None = None) -> bool:
+        """Check if the soft TTL has passed."""
+        return (time.time() if now is None else now) >= self.stale_at
+
+    def should_refresh(self, beta: float = 1.0, now: float | None = None) -> bool:
+        """
+        Decide whether to recompute now (probabilistic early expiration, XFetch).
+
+        Each reader refreshes early with a probability that grows as stale_at
+        approaches and with the recorded compute_time, so a hot key is
+        usually recomputed by one reader before it goes stale. Without
+        compute_time this is is_stale().
+
+        Args:
+            beta: Eagerness (> 1 refreshes earlier, 0 - only when stale)
+            now: Current time (epoch seconds, default time.time())
+
+        Returns:
+            True if the caller should recompute the value
+        """
+        now = time.time() if now is None else now
+        if not self.compute_time or beta <= 0:
+            return now >= self.stale_at
+        # -log(U) при U из (0, 1] - экспоненциальный сдвиг момента обновления
+        return now - self.compute_time * beta * math.log(1.0 - random.random()) >= self.stale_at
+
+
+class LimitExceededError(ValueError):
+    """
+    Base error for values exceeding a serializer limit.
+
+    Cache layers can treat it as "do not cache": nothing was written or
+    returned, and the violation is counted in JsonSerializer.limit_violations.
+
+    Attributes:
+        limit: Name of the exceeded limit (serializer option)
+    """
+
+    limit = ""
 
-# Условные импорты для опциональных зависимостей
-if TYPE_CHECKING:
-    from bson import ObjectId  # type: ignore[import-not-found]
-    from fastapi import Response  # type: ignore[import-not-found]
-    from pydantic import BaseModel
-else:
-    try:
-        from bson import ObjectId  # type: ignore[import-not-found]
-    except ImportError:
-        ObjectId = None  # type: ignore[assignment, misc]
 
-    try:
-        from fastapi import Response  # type: ignore[import-not-found]
-    except ImportError:
-        Response = None  # type: ignore[assignment, misc]
+class DepthLimitError(LimitExceededError):
+    """Raised when a value is nested deeper than the serializer's max_depth."""
 
-    try:
-        from pydantic import BaseModel
-    except ImportError:
-        BaseModel = None  # type: ignore[assignment, misc]
+    limit = "max_depth"
+
+
+class SizeLimitError(LimitExceededError):
+    """Raised when serialized data is larger than the serializer's max_bytes."""
+
+    limit = "max_bytes"
+
+
+class NodeLimitError(LimitExceededError):
+    """Raised when a value has more elements in total than the serializer's max_nodes."""
+
+    limit = "max_nodes"
+
+
+class LengthLimitError(LimitExceededError):
+    """Raised when a single collection is longer than the serializer's max_length."""
+
+    limit = "max_length"
 
 
 class JsonSerializer:
@@ -47,39 +351,374 @@ class JsonSerializer:
     - DEVELOPMENT.md (архитектурные решения)
     """
 
-    def __init__(self, namespace: str = ""):
+    def __init__(
+        self,
+        namespace: str = "",
+        trusted: bool = False,
+        compact_datetimes: bool = False,
+        ndarray_json_max_size: int = 16,
+        bytes_as_memoryview: bool = False,
+        backend: str | Backend | None = None,
+        max_depth: int | None = None,
+        canonical: bool = False,
+        soft_ttl: float | None = None,
+        intern_values: bool = False,
+        intern_max_length: int = DEFAULT_INTERN_MAX_LENGTH,
+        intern_table_size: int = DEFAULT_INTERN_TABLE_SIZE,
+        max_bytes: int | None = None,
+        max_nodes: int | None = None,
+        max_length: int | None = None,
+        decode_cache_size: int = DEFAULT_DECODE_CACHE_SIZE,
+    ):
         """
         Initialize serializer.
 
         Args:
             namespace: Optional namespace prefix for cache keys (e.g., "cache:v2:")
+            trusted: Build models without validation on unpack (only for data
+                written by this serializer, e.g. your own Redis)
+            compact_datetimes: Encode datetime as epoch microseconds, date as
+                ordinal and homogeneous list[datetime] as one integer array
+            ndarray_json_max_size: NumPy arrays up to this many elements are
+                written as plain JSON numbers (orjson OPT_SERIALIZE_NUMPY),
+                larger ones as a raw base64 buffer
+            bytes_as_memoryview: Return decoded binary values as read-only
+                memoryview slices of one buffer shared by all binary values
+                of a loads() call instead of separate bytes objects
+            backend: Codec backend for dumps() ("json", "msgpack" or Backend
+                instance). None - backend configured for the namespace via
+                configure_backend(), JSON by default. loads() detects the
+                backend of each payload automatically.
+            max_depth: Maximum nesting depth of containers (dict, list, set,
+                tuple, model) for pack()/unpack(); deeper values raise
+                DepthLimitError (None - 254 for the JSON backend, the most
+                orjson encodes, 1024 for binary backends). Values within
+                max_depth whose markers nest deeper than orjson's limit
+                raise DepthLimitError too.
+            canonical: Deterministic output - map keys and set members are
+                written in sorted order, so equal values produce identical
+                bytes (required by digest())
+            soft_ttl: Default soft TTL in seconds for dumps(): values are
+                written with write time and soft TTL in the namespace
+                wrapper, see loads_with_meta() (None - no metadata)
+            intern_values: Deduplicate decoded values in unpack()/loads():
+                equal strings (dict values, list items, str fields) and
+                equal Decimal/date/datetime/time/timedelta/UUID values share
+                one instance. Shrinks long-lived decoded data (reference
+                data) at the cost of slower loads() of marker-free JSON,
+                which is then walked too.
+            intern_max_length: Longest string that is interned
+            intern_table_size: Max number of entries in the serializer's
+                intern table; once full, only existing entries are reused
+            max_bytes: Maximum size of dumps() output and loads() input;
+                larger data raises SizeLimitError (None - no limit)
+            max_nodes: Maximum total number of elements (items, fields,
+                dict values) pack()/unpack() walk in one value; more raise
+                NodeLimitError (None - no limit)
+            max_length: Maximum length of a single collection in
+                pack()/unpack(); longer raise LengthLimitError (None - no limit)
+            decode_cache_size: Number of results kept by loads_shared()
+                (LRU, 0 - results are frozen but not cached)
+
+        Raises:
+            ValueError: If max_depth, soft_ttl or a size limit is not positive
         """
+        if max_depth is not None and max_depth <= 0:
+            raise ValueError("max_depth must be positive")
+        if soft_ttl is not None and soft_ttl <= 0:
+            raise ValueError("soft_ttl must be positive")
+        for name, limit in (("max_bytes", max_bytes), ("max_nodes", max_nodes), ("max_length", max_length)):
+            if limit is not None and limit <= 0:
+                raise ValueError(f"{name} must be positive")
+        if decode_cache_size < 0:
+            raise ValueError("decode_cache_size must not be negative")
+
         self.namespace = namespace
+        self.trusted = trusted
+        self.compact_datetimes = compact_datetimes
+        self.ndarray_json_max_size = ndarray_json_max_size
+        self.bytes_as_memoryview = bytes_as_memoryview
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_length = max_length
+        # Нарушения лимитов по имени лимита - для поиска источников слишком больших значений
+        self.limit_violations: collections.Counter[str] = collections.Counter()
+
+        # Кэш loads_shared(): digest payload -> (неизменяемый результат, размер payload), порядок LRU
+        self.decode_cache_size = decode_cache_size
+        self._decode_cache: collections.OrderedDict[bytes, tuple[Any, int]] = collections.OrderedDict()
+        self._decode_lock = threading.Lock()
+        self._decode_hits = 0
+        self._decode_misses = 0
+        self._decode_payload_bytes = 0
+        self.canonical = canonical
+        self.soft_ttl = soft_ttl
+        self.intern_max_length = intern_max_length
+        self.intern_table_size = intern_table_size
+        # Таблица интернирования: строка -> строка, (маркер, значение) -> объект
+        self._intern_table: dict[Any, Any] | None = {} if intern_values else None
+        self.backend = get_backend(
+            backend if backend is not None else NAMESPACE_BACKENDS.get(namespace, "json")
+        )
+        if max_depth is None:
+            max_depth = DEFAULT_MAX_DEPTH if self.backend.binary else JSON_MAX_DEPTH
+        self.max_depth = max_depth
+
+        # Маркерные dict контейнеров: бинарный бэкенд кодирует MarkedDict как extension type
+        self._marker_dict: type[dict[str, Any]] = MarkedDict if self.backend.binary else dict
 
         # Dispatch-таблица для pack() - O(1) поиск обработчика по типу
-        self._pack_handlers: dict[type[Any], Callable[[Any], Any]] = {
-            datetime.datetime: self._pack_datetime,
-            datetime.date: self._pack_date,
+        # Типы вне таблиц (модели, ObjectId, ndarray, ...) разрешаются при первой встрече
+        # и кэшируются здесь же; None - у типа нет обработчика
+        self._pack_handlers: dict[type[Any], Callable[[Any], Any] | None] = {
+            datetime.datetime: self._pack_datetime_ts if compact_datetimes else self._pack_datetime,
+            datetime.date: self._pack_date_ordinal if compact_datetimes else self._pack_date,
             Decimal: self._pack_decimal,
-            set: self._pack_set,
+            bytes: self._pack_bytes,
+            bytearray: self._pack_bytes,
+            memoryview: self._pack_bytes,
+            uuid.UUID: self._pack_uuid,
+            datetime.timedelta: self._pack_timedelta,
+            datetime.time: self._pack_time,
+            ipaddress.IPv4Address: self._pack_ip_address,
+            ipaddress.IPv6Address: self._pack_ip_address,
+            ipaddress.IPv4Network: self._pack_ip_network,
+            ipaddress.IPv6Network: self._pack_ip_network,
+            ipaddress.IPv4Interface: self._pack_ip_interface,
+            ipaddress.IPv6Interface: self._pack_ip_interface,
+            pathlib.PosixPath: self._pack_path,
+            pathlib.WindowsPath: self._pack_path,
         }
 
-        # Условно добавляем ObjectId если pymongo установлен
-        if ObjectId is not None:
-            self._pack_handlers[ObjectId] = self._pack_object_id
+        # Контейнеры с маркером: обработчик возвращает (результат, дочерние элементы),
+        # дочерние элементы упаковываются на месте циклом pack() (без рекурсии)
+        self._pack_expanders: dict[type[Any], Callable[[Any], tuple[Any, Any]]] = {
+            set: self._pack_set,
+            tuple: self._pack_tuple,
+            frozenset: self._pack_frozenset,
+            collections.deque: self._pack_deque,
+            collections.OrderedDict: self._pack_ordered_dict,
+            collections.defaultdict: self._pack_defaultdict,
+            types.MappingProxyType: self._pack_mapping_proxy,
+        }
 
         # Dispatch-таблица для unpack() - O(1) поиск обработчика по маркеру
         # Используем строковые ключи для совместимости с JSON
         # Обработчики принимают expected_type для поддержки generic типов (set[Type], etc.)
         self._unpack_handlers: dict[str, Callable[[dict[str, Any], type[Any] | None], Any]] = {
+            str(Marks.BYTES): self._unpack_bytes,
             str(Marks.DATE): self._unpack_date,
             str(Marks.DATETIME): self._unpack_datetime,
             str(Marks.DECIMAL): self._unpack_decimal,
             str(Marks.OBJECT_ID): self._unpack_object_id,
+            str(Marks.NDARRAY): self._unpack_ndarray,
+            str(Marks.UUID): self._unpack_uuid,
+            str(Marks.ENUM): self._unpack_enum,
+            str(Marks.TIMEDELTA): self._unpack_timedelta,
+            str(Marks.TIME): self._unpack_time,
+            str(Marks.IP_ADDRESS): self._unpack_ip_address,
+            str(Marks.IP_NETWORK): self._unpack_ip_network,
+            str(Marks.IP_INTERFACE): self._unpack_ip_interface,
+            str(Marks.PATH): self._unpack_path,
+            # Компактные маркеры декодируются всегда (независимо от compact_datetimes)
+            str(Marks.DATETIME_TS): self._unpack_datetime_ts,
+            str(Marks.DATETIME_ARRAY): self._unpack_datetime_array,
+            str(Marks.DATE_ORDINAL): self._unpack_date_ordinal,
+        }
+
+        # Контейнеры с маркером: обработчик возвращает (дочерние элементы, их ожидаемые типы,
+        # сборщик результата); сборщик вызывается после распаковки всех дочерних элементов
+        self._unpack_expanders: dict[str, Callable[[dict[str, Any], type[Any] | None], Any]] = {
             str(Marks.SET): self._unpack_set,
             str(Marks.TUPLE): self._unpack_tuple,
+            str(Marks.MODEL): self._unpack_model,
+            str(Marks.FROZENSET): self._unpack_frozenset,
+            str(Marks.DEQUE): self._unpack_deque,
+            str(Marks.KEYED_DICT): self._unpack_keyed_dict,
+            str(Marks.ORDERED_DICT): self._unpack_ordered_dict,
+            str(Marks.DEFAULT_DICT): self._unpack_defaultdict,
+            str(Marks.NAMEDTUPLE): self._unpack_namedtuple,
         }
 
+        # Планы hash-представления моделей: класс -> ((поле, тип поля), ...)
+        self._hash_plans: dict[type[Any], tuple[tuple[str, Any], ...]] = {}
+
+        if self.backend.binary:
+            self._install_binary_handlers()
+        if intern_values:
+            self._install_intern_handlers()
+
+    def _install_binary_handlers(self) -> None:
+        """
+        Adapt pack handlers for a binary backend.
+
+        Binary data, UUIDs and IP addresses are kept raw (no base64/text
+        form). Marker dicts are returned as
+        MarkedDict by pack() so the backend can encode them as extension
+        types. Unpack handlers are unchanged: backends decode back to marker
+        dicts.
+        """
+        for bytes_type in (bytes, bytearray, memoryview):
+            self._pack_handlers[bytes_type] = self._pack_bytes_raw
+        self._pack_handlers[uuid.UUID] = self._pack_uuid_raw
+        for address_type in _IP_ADDRESS_TYPES:
+            self._pack_handlers[address_type] = self._pack_ip_address_raw
+
+    def _limit_exceeded(self, error: type[LimitExceededError], message: str) -> LimitExceededError:
+        """Count a limit violation and create its error."""
+        self.limit_violations[error.limit] += 1
+        return error(message)
+
+    def _check_size(self, size: int, total: int) -> None:
+        """Raise the error of a container size limit (called only when one is exceeded)."""
+        if self.max_length is not None and size > self.max_length:
+            raise self._limit_exceeded(
+                LengthLimitError, f"Collection length {size} exceeds max_length={self.max_length}"
+            )
+        raise self._limit_exceeded(NodeLimitError, f"Number of elements {total} exceeds max_nodes={self.max_nodes}")
+
+    def _check_array(self, size: int) -> None:
+        """Check a marker array (list[datetime]) packed or unpacked as one value."""
+        if size > (self.max_length or sys.maxsize) or size > (self.max_nodes or sys.maxsize):
+            self._check_size(size, size)
+
+    def check_bytes(self, size: int) -> None:
+        """
+        Check serialized size against max_bytes.
+
+        Lets storage reject an oversized value before fetching it (e.g. by
+        the size in a chunk manifest).
+
+        Args:
+            size: Serialized size in bytes
+
+        Raises:
+            SizeLimitError: If size exceeds max_bytes
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise self._limit_exceeded(SizeLimitError, f"Serialized size {size} exceeds max_bytes={self.max_bytes}")
+
+    def _install_intern_handlers(self) -> None:
+        """Wrap unpack handlers of immutable scalar markers to reuse equal results."""
+        for mark in _INTERNED_MARKS:
+            marker = str(mark)
+            self._unpack_handlers[marker] = partial(self._unpack_interned, marker, self._unpack_handlers[marker])
+
+    def _unpack_interned(
+        self,
+        marker: str,
+        handler: Callable[[dict[str, Any], type[Any] | None], Any],
+        obj: dict[str, Any],
+        expected_type: type[Any] | None = None,
+    ) -> Any:
+        """
+        Unpack marker value through the intern table.
+
+        The key is the encoded value, not the decoded one: Decimal("1.0") and
+        Decimal("1.00"), or datetimes in different time zones, compare equal
+        but must not replace each other.
+        """
+        raw = obj[marker]
+        if type(raw) not in _INTERN_KEY_TYPES:
+            return handler(obj, expected_type)
+        table: dict[Any, Any] = self._intern_table  # type: ignore[assignment]
+        key = (marker, raw)
+        value = table.get(key)
+        if value is None:
+            value = handler(obj, expected_type)
+            if len(table) < self.intern_table_size:
+                table[key] = value
+        return value
+
+    def _intern_string(self, value: str) -> str:
+        """Return the shared instance of a decoded string (or value itself)."""
+        if len(value) > self.intern_max_length:
+            return value
+        table: dict[Any, Any] = self._intern_table  # type: ignore[assignment]
+        interned = table.get(value)
+        if interned is not None:
+            return interned  # type: ignore[no-any-return]
+        if len(table) < self.intern_table_size:
+            table[value] = value
+        return value
+
+    def clear_intern_table(self) -> None:
+        """Drop interned values (e.g. after the decoded data they served is released)."""
+        if self._intern_table is not None:
+            self._intern_table.clear()
+
+    def _mark(self, packed: dict[str, Any]) -> dict[str, Any]:
+        """Return handler's marker dict as MarkedDict for a binary backend."""
+        return MarkedDict(packed) if self.backend.binary else packed
+
+    def _resolve_pack_handler(self, obj_type: type[Any]) -> Callable[[Any], Any] | None:
+        """
+        Find handler for a type missing in the dispatch table and cache it.
+
+        Optional integrations are detected through sys.modules, so resolving
+        never imports pydantic, bson, numpy or fastapi. Container types
+        (models, tuple subclasses) are cached in the expander table.
+
+        Args:
+            obj_type: Type of the object being packed
+
+        Returns:
+            Handler or None if the type has no marker handler (or is a container)
+        """
+        handler = self._find_pack_handler(obj_type)
+        if handler is None and obj_type not in self._pack_expanders:
+            expander = self._find_pack_expander(obj_type)
+            if expander is not None:
+                self._pack_expanders[obj_type] = expander
+        self._pack_handlers[obj_type] = handler
+        return handler
+
+    def _find_pack_handler(self, obj_type: type[Any]) -> Callable[[Any], Any] | None:
+        """Match type against optional integrations with scalar markers."""
+        # Response объекты (fastapi.Response - это starlette.responses.Response)
+        response_cls = loaded_class("starlette.responses", "Response")
+        if response_cls is not None and issubclass(obj_type, response_cls):
+            return self._reject_response
+
+        object_id = loaded_class("bson", "ObjectId")
+        if object_id is not None and issubclass(obj_type, object_id):
+            return self._pack_object_id
+
+        ndarray = loaded_class("numpy", "ndarray")
+        if ndarray is not None and issubclass(obj_type, ndarray):
+            return self._pack_ndarray
+
+        # Pure-пути и подклассы Path
+        if issubclass(obj_type, pathlib.PurePath):
+            return self._pack_path
+
+        return None
+
+    def _find_pack_expander(self, obj_type: type[Any]) -> Callable[[Any], tuple[Any, Any]] | None:
+        """Match type against models and container marker base types."""
+        base_model = loaded_class("pydantic", "BaseModel")
+        if base_model is not None and issubclass(obj_type, base_model):
+            return self._pack_pydantic
+
+        if dataclasses.is_dataclass(obj_type):
+            return self._pack_dataclass
+
+        # Enum (кроме str/int-подклассов - они упаковываются как значения)
+        if issubclass(obj_type, enum.Enum):
+            return self._pack_enum
+
+        # Подклассы set/frozenset (например, ReadOnlySet из loads_shared())
+        if issubclass(obj_type, frozenset):
+            return self._pack_frozenset
+        if issubclass(obj_type, set):
+            return self._pack_set
+
+        # namedtuple - по алиасу, если зарегистрирован; остальные подклассы tuple - как tuple
+        if issubclass(obj_type, tuple):
+            return self._pack_namedtuple if hasattr(obj_type, "_fields") else self._pack_tuple
+
+        return None
+
     # ========== Pack handlers (для dispatch-таблицы) ==========
 
     def _pack_datetime(self, obj: datetime.datetime) -> dict[str, Any]:
@@ -90,20 +729,274 @@ class JsonSerializer:
         """Pack date to dict with marker."""
         return {str(Marks.DATE): obj.isoformat()}
 
+    def _pack_datetime_ts(self, obj: datetime.datetime) -> dict[str, Any]:
+        """
+        Pack datetime as epoch microseconds (compact mode).
+
+        Naive datetime is stored as a bare integer, aware datetime as
+        [wall-clock microseconds, UTC offset in seconds].
+        """
+        offset = obj.utcoffset()
+        if offset is None:
+            return {str(Marks.DATETIME_TS): (obj - _EPOCH) // _ONE_MICROSECOND}
+        if offset.microseconds:
+            # Дробное смещение (секунды с долями) - храним ISO-строкой без потери точности
+            return self._pack_datetime(obj)
+        wall_clock = (obj.replace(tzinfo=None) - _EPOCH) // _ONE_MICROSECOND
+        return {str(Marks.DATETIME_TS): [wall_clock, offset // _ONE_SECOND]}
+
+    def _pack_date_ordinal(self, obj: datetime.date) -> dict[str, Any]:
+        """Pack date as proleptic Gregorian ordinal (compact mode)."""
+        return {str(Marks.DATE_ORDINAL): obj.toordinal()}
+
+    def _pack_datetime_list(self, obj: list[Any]) -> dict[str, Any] | None:
+        """
+        Pack homogeneous list[datetime] as one marker with an integer array.
+
+        All items must be datetime with the same UTC offset (or all naive).
+
+        Returns:
+            Dict with Marks.DATETIME_ARRAY marker or None if list is not homogeneous
+        """
+        first_offset = obj[0].utcoffset()
+        if first_offset is not None and first_offset.microseconds:
+            return None
+
+        for item in obj:
+            if type(item) is not datetime.datetime or item.utcoffset() != first_offset:
+                return None
+
+        if first_offset is None:
+            values = [(item - _EPOCH) // _ONE_MICROSECOND for item in obj]
+            return {str(Marks.DATETIME_ARRAY): [None, values]}
+
+        values = [(item.replace(tzinfo=None) - _EPOCH) // _ONE_MICROSECOND for item in obj]
+        return {str(Marks.DATETIME_ARRAY): [first_offset // _ONE_SECOND, values]}
+
     def _pack_decimal(self, obj: Decimal) -> dict[str, Any]:
         """Pack Decimal to dict with marker."""
         return {str(Marks.DECIMAL): str(obj)}
 
-    def _pack_set(self, obj: set[Any]) -> dict[str, Any]:
-        """Pack set to dict with marker and list of packed items."""
-        return {str(Marks.SET): [self.pack(item) for item in obj]}
+    def _pack_set(self, obj: set[Any]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack set to dict with marker; returns it with the list of items to pack."""
+        # Порядок итерации set зависит от хэшей (и PYTHONHASHSEED) - в canonical-режиме сортируем
+        items = canonical_sorted(obj, self._canonical_bytes) if self.canonical else list(obj)
+        return self._marker_dict({str(Marks.SET): items}), items
+
+    def _pack_bytes(self, obj: bytes | bytearray | memoryview) -> dict[str, Any]:
+        """Pack bytes-like object to dict with marker and base64 string."""
+        if type(obj) is memoryview and not obj.c_contiguous:
+            # binascii работает только с C-contiguous буферами
+            obj = obj.tobytes()
+        # binascii напрямую по буферу - без промежуточной копии в bytes
+        return {str(Marks.BYTES): binascii.b2a_base64(obj, newline=False).decode("ascii")}
+
+    def _pack_bytes_raw(self, obj: bytes | bytearray | memoryview) -> dict[str, Any]:
+        """Pack bytes-like object to dict with marker and raw bytes (binary backends)."""
+        return {str(Marks.BYTES): obj if type(obj) is bytes else bytes(obj)}
+
+    def _pack_tuple(self, obj: tuple[Any, ...]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack tuple to dict with marker; returns it with the list of items to pack."""
+        items = list(obj)
+        return self._marker_dict({str(Marks.TUPLE): items}), items
+
+    def _pack_frozenset(self, obj: frozenset[Any]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack frozenset to dict with marker; returns it with the list of items to pack."""
+        items = canonical_sorted(obj, self._canonical_bytes) if self.canonical else list(obj)
+        return self._marker_dict({str(Marks.FROZENSET): items}), items
+
+    def _pack_deque(self, obj: collections.deque[Any]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack deque to dict with marker and [maxlen, *items]."""
+        items = [obj.maxlen, *obj]
+        return self._marker_dict({str(Marks.DEQUE): items}), items
+
+    def _dict_pairs(self, obj: dict[Any, Any], keep_order: bool = False) -> list[Any]:
+        """Flatten dict to [key1, value1, key2, value2, ...] (keys sorted in canonical mode)."""
+        if self.canonical and not keep_order:
+            keys = canonical_sorted(obj, self._canonical_bytes)
+            return [item for key in keys for item in (key, obj[key])]
+        return list(chain.from_iterable(obj.items()))
+
+    def _canonical_bytes(self, obj: Any) -> bytes:
+        """Canonical encoding of one set member or dict key (its sort key in canonical mode)."""
+        return self.backend.encode(self.pack(obj, keyed_dicts=True), canonical=True)
+
+    def _pack_keyed_dict(self, obj: dict[Any, Any]) -> tuple[dict[str, Any], list[Any]]:
+        """
+        Pack dict with non-string keys to dict with marker and flat key/value list.
+
+        Keys are packed like values (tuple keys get the TUPLE marker, etc.),
+        so int, tuple, Enum or date keys come back with their types.
+        """
+        items = self._dict_pairs(obj)
+        return self._marker_dict({str(Marks.KEYED_DICT): items}), items
+
+    def _pack_ordered_dict(self, obj: collections.OrderedDict[Any, Any]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack OrderedDict to dict with marker and flat key/value list (order kept)."""
+        items = self._dict_pairs(obj, keep_order=True)
+        return self._marker_dict({str(Marks.ORDERED_DICT): items}), items
+
+    def _pack_defaultdict(self, obj: collections.defaultdict[Any, Any]) -> tuple[Any, Any]:
+        """
+        Pack defaultdict to dict with marker and [factory name, *flat key/value list].
+
+        Only builtin factories (list, dict, set, int, ...) are stored; a
+        defaultdict with another factory is packed as a plain dict.
+        """
+        factory = obj.default_factory
+        if factory is None:
+            name = None
+        elif _DEFAULT_FACTORIES.get(getattr(factory, "__name__", "")) is factory:
+            name = factory.__name__
+        else:
+            return self._pack_dict(obj)
+        items = [name, *self._dict_pairs(obj)]
+        return self._marker_dict({str(Marks.DEFAULT_DICT): items}), items
+
+    def _pack_dict(self, obj: dict[Any, Any]) -> tuple[Any, Any]:
+        """Copy dict for packing its values (dict with non-string keys - as KEYED_DICT)."""
+        if set(map(type, obj)) <= _STR_KEY_TYPES:
+            children = dict(obj)
+            return children, children
+        return self._pack_keyed_dict(obj)
+
+    def _pack_mapping_proxy(self, obj: types.MappingProxyType[Any, Any]) -> tuple[Any, Any]:
+        """Pack read-only mapping view like a dict."""
+        return self._pack_dict(dict(obj))
+
+    def _pack_namedtuple(self, obj: tuple[Any, ...]) -> tuple[dict[str, Any], list[Any]]:
+        """Pack registered namedtuple to dict with marker and [alias, *items] (else as tuple)."""
+        alias = MODEL_ALIASES.get(type(obj))
+        if alias is None:
+            return self._pack_tuple(obj)
+        items = [alias, *obj]
+        return self._marker_dict({str(Marks.NAMEDTUPLE): items}), items
+
+    def _pack_uuid(self, obj: uuid.UUID) -> dict[str, Any]:
+        """Pack UUID to dict with marker and 32 hex characters."""
+        return {str(Marks.UUID): obj.hex}
+
+    def _pack_uuid_raw(self, obj: uuid.UUID) -> dict[str, Any]:
+        """Pack UUID to dict with marker and 16 raw bytes (binary backends)."""
+        return {str(Marks.UUID): obj.bytes}
+
+    def _pack_timedelta(self, obj: datetime.timedelta) -> dict[str, Any]:
+        """Pack timedelta to dict with marker and integer microseconds."""
+        return {str(Marks.TIMEDELTA): obj // _ONE_MICROSECOND}
+
+    def _pack_time(self, obj: datetime.time) -> dict[str, Any]:
+        """Pack time to dict with marker."""
+        return {str(Marks.TIME): obj.isoformat()}
+
+    def _pack_ip_address(self, obj: ipaddress.IPv4Address | ipaddress.IPv6Address) -> dict[str, Any]:
+        """Pack IP address to dict with marker."""
+        return {str(Marks.IP_ADDRESS): str(obj)}
+
+    def _pack_ip_address_raw(self, obj: ipaddress.IPv4Address | ipaddress.IPv6Address) -> dict[str, Any]:
+        """Pack IP address to dict with marker and 4/16 raw bytes (binary backends)."""
+        return {str(Marks.IP_ADDRESS): obj.packed}
+
+    def _pack_ip_network(self, obj: ipaddress.IPv4Network | ipaddress.IPv6Network) -> dict[str, Any]:
+        """Pack IP network to dict with marker."""
+        return {str(Marks.IP_NETWORK): str(obj)}
+
+    def _pack_ip_interface(self, obj: ipaddress.IPv4Interface | ipaddress.IPv6Interface) -> dict[str, Any]:
+        """Pack IP interface (address with prefix) to dict with marker."""
+        return {str(Marks.IP_INTERFACE): str(obj)}
+
+    def _pack_path(self, obj: pathlib.PurePath) -> dict[str, Any]:
+        """Pack filesystem path to dict with marker (pure paths as [kind, path])."""
+        if isinstance(obj, pathlib.Path):
+            return {str(Marks.PATH): str(obj)}
+        kind = "windows" if isinstance(obj, pathlib.PureWindowsPath) else "posix"
+        return {str(Marks.PATH): [kind, str(obj)]}
+
+    def _pack_enum(self, obj: enum.Enum) -> tuple[dict[str, Any], list[Any]]:
+        """
+        Pack Enum member to dict with marker, registered alias and value.
+
+        Returns:
+            Marker dict and the list [alias, value] to pack in place
+
+        Raises:
+            RegistrationError: If Enum class is not registered
+        """
+        alias = MODEL_ALIASES.get(type(obj))
+        if alias is None:
+            raise RegistrationError(f"Enum {type(obj)} is not registered. Use @register_model()")
+        items = [alias, obj.value]
+        return self._marker_dict({str(Marks.ENUM): items}), items
+
+    def _reject_response(self, obj: Any) -> Any:
+        """Reject Response objects (explicitly not cacheable)."""
+        raise TypeError("Response objects cannot be serialized")
+
+    def _pack_list(self, obj: list[Any]) -> tuple[Any, list[Any] | None]:
+        """
+        Copy list for packing its items (or pack homogeneous list[datetime] as one marker).
+
+        Returns:
+            (packed list, same list with items to pack) or (array marker, None)
+        """
+        # Компактный режим: однородный list[datetime] - один маркер с массивом чисел
+        if self.compact_datetimes and obj and type(obj[0]) is datetime.datetime:
+            packed_array = self._pack_datetime_list(obj)
+            if packed_array is not None:
+                return self._mark(packed_array), None
+        items = list(obj)
+        return items, items
 
     def _pack_object_id(self, obj: Any) -> dict[str, Any]:
         """Pack ObjectId to dict with marker."""
         return {str(Marks.OBJECT_ID): str(obj)}
 
+    def _pack_ndarray(self, obj: Any) -> dict[str, Any]:
+        """
+        Pack NumPy array to dict with marker, dtype and shape.
+
+        Small numeric arrays are passed through to orjson (OPT_SERIALIZE_NUMPY)
+        as a JSON list, larger ones are stored as a base64 raw C-order buffer.
+        dtype is stored with explicit byte order (e.g. "<f8").
+
+        Raises:
+            TypeError: If array has object or structured dtype
+        """
+        np = sys.modules["numpy"]
+        dtype = obj.dtype
+        if dtype.hasobject or dtype.fields is not None:
+            raise TypeError(f"Unsupported ndarray dtype for packing: {dtype}")
+
+        packed: dict[str, Any] = {"dtype": dtype.str, "shape": list(obj.shape)}
+        if self.backend.binary:
+            # Бинарный бэкенд передаёт буфер как есть
+            packed["data"] = obj.tobytes()
+        elif (
+            0 < obj.ndim
+            and obj.size <= self.ndarray_json_max_size
+            and dtype.kind in _NUMPY_JSON_KINDS
+            and dtype.isnative
+        ):
+            # Маленький массив - дешевле записать числами прямо в JSON
+            packed["items"] = np.ascontiguousarray(obj)
+        else:
+            buffer = obj if obj.flags.c_contiguous else np.ascontiguousarray(obj)
+            # datetime64/timedelta64 не поддерживают buffer protocol - кодируем байтовое представление
+            raw = buffer.reshape(-1).view(np.uint8)
+            packed["data"] = binascii.b2a_base64(raw, newline=False).decode("ascii")
+        return {str(Marks.NDARRAY): packed}
+
     # ========== Unpack handlers (для dispatch-таблицы) ==========
 
+    def _unpack_bytes(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> bytes | memoryview:
+        """Unpack bytes from dict with marker (memoryview if bytes_as_memoryview)."""
+        data = obj[str(Marks.BYTES)]
+        # Бинарные бэкенды могут передать буфер без base64
+        decoded = data if isinstance(data, (bytes, memoryview)) else binascii.a2b_base64(data)
+        if self.bytes_as_memoryview:
+            # loads() уже заменил payload срезом общего буфера (_share_bytes)
+            return decoded if type(decoded) is memoryview else memoryview(decoded)
+        return decoded if type(decoded) is bytes else bytes(decoded)
+
     def _unpack_datetime(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> datetime.datetime:
         """Unpack datetime from dict with marker."""
         # expected_type игнорируется для datetime (тип уже определен маркером)
@@ -114,91 +1007,351 @@ class JsonSerializer:
         # expected_type игнорируется для date (тип уже определен маркером)
         return datetime.date.fromisoformat(obj[str(Marks.DATE)])
 
+    def _unpack_datetime_ts(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> datetime.datetime:
+        """Unpack datetime from epoch microseconds (compact mode)."""
+        value = obj[str(Marks.DATETIME_TS)]
+        if isinstance(value, int):
+            return _EPOCH + datetime.timedelta(0, 0, value)
+        wall_clock, offset = value
+        tz = datetime.timezone(datetime.timedelta(seconds=offset))
+        return _EPOCH.replace(tzinfo=tz) + datetime.timedelta(0, 0, wall_clock)
+
+    def _unpack_date_ordinal(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> datetime.date:
+        """Unpack date from ordinal (compact mode)."""
+        return datetime.date.fromordinal(obj[str(Marks.DATE_ORDINAL)])
+
+    def _unpack_datetime_array(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> list[datetime.datetime]:
+        """
+        Unpack list[datetime] from integer array in one batched pass.
+
+        Uses NumPy (timedelta64 -> timedelta in C) for large arrays when it
+        is already imported, otherwise a map() over timedelta without
+        per-item bytecode.
+        """
+        offset, values = obj[str(Marks.DATETIME_ARRAY)]
+        base = _EPOCH
+        if offset is not None:
+            base = _EPOCH.replace(tzinfo=datetime.timezone(datetime.timedelta(seconds=offset)))
+
+        # NumPy не импортируется ради этого пути - только если уже загружен
+        np = sys.modules.get("numpy")
+        if np is not None and len(values) >= _NUMPY_MIN_BATCH:
+            deltas = np.array(values, dtype=np.int64).astype("timedelta64[us]").tolist()
+            return list(map(base.__add__, deltas))
+
+        return list(map(base.__add__, map(datetime.timedelta, repeat(0), repeat(0), values)))
+
     def _unpack_decimal(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> Decimal:
         """Unpack Decimal from dict with marker."""
         # expected_type игнорируется для Decimal (тип уже определен маркером)
         return Decimal(obj[str(Marks.DECIMAL)])
 
-    def _unpack_set(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> set[Any]:
-        """Unpack set from dict with marker."""
-        elem_type = None
+    def _unpack_set(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """
+        Prepare set items for unpacking.
+
+        Returns:
+            (items to unpack, their expected types or None, set constructor)
+        """
+        items = list(obj[str(Marks.SET)])
         if expected_type:
             origin = get_origin(expected_type)
             if origin is set:
                 args = get_args(expected_type)
-                elem_type = args[0] if args else None
-        return {self.unpack(item, elem_type) for item in obj[str(Marks.SET)]}
+                if args:
+                    return items, [args[0]] * len(items), set
+        return items, None, set
 
-    def _unpack_tuple(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> tuple[Any, ...]:
+    def _unpack_tuple(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
         """
-        Unpack tuple from dict with TUPLE marker.
+        Prepare tuple items (dict with TUPLE marker) for unpacking.
 
         Args:
             obj: Dict with Marks.TUPLE marker and list of items
             expected_type: Optional expected type (tuple[Type1, Type2, ...])
 
         Returns:
-            tuple with unpacked items
+            (items to unpack, their expected types or None, tuple constructor)
+        """
+        items = list(obj[str(Marks.TUPLE)])
+        return items, self._tuple_item_types(items, expected_type), tuple
+
+    def _unpack_frozenset(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """Prepare frozenset items for unpacking (frozenset[Type] gives item types)."""
+        items = list(obj[str(Marks.FROZENSET)])
+        if expected_type and get_origin(expected_type) is frozenset:
+            args = get_args(expected_type)
+            if args:
+                return items, [args[0]] * len(items), frozenset
+        return items, None, frozenset
+
+    def _unpack_deque(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """Prepare deque [maxlen, *items] for unpacking."""
+        items = list(obj[str(Marks.DEQUE)])
+        types = None
+        if expected_type and get_origin(expected_type) is collections.deque:
+            args = get_args(expected_type)
+            if args:
+                types = [None, *repeat(args[0], len(items) - 1)]
+        return items, types, _build_deque
+
+    @staticmethod
+    def _pair_types(items: list[Any], expected_type: type[Any] | None, origin: Any, skip: int = 0) -> list[Any] | None:
+        """Get expected types of a flat key/value list from Mapping[Key, Value]."""
+        if not expected_type or get_origin(expected_type) is not origin:
+            return None
+        args = get_args(expected_type)
+        if len(args) != 2:
+            return None
+        return [None] * skip + list(args) * ((len(items) - skip) // 2)
+
+    def _unpack_keyed_dict(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """Prepare flat key/value list of a dict with non-string keys for unpacking."""
+        items = list(obj[str(Marks.KEYED_DICT)])
+        return items, self._pair_types(items, expected_type, dict), _build_dict
+
+    def _unpack_ordered_dict(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """Prepare flat key/value list of an OrderedDict for unpacking."""
+        items = list(obj[str(Marks.ORDERED_DICT)])
+        return items, self._pair_types(items, expected_type, collections.OrderedDict), _build_ordered_dict
+
+    def _unpack_defaultdict(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
         """
-        items = obj[str(Marks.TUPLE)]
+        Prepare defaultdict [factory name, *flat key/value list] for unpacking.
 
-        if expected_type:
-            origin = get_origin(expected_type)
-            if origin is tuple:
-                # tuple[Type1, Type2, ...] - более точная десериализация
-                elem_types = get_args(expected_type)
-                return tuple(
-                    self.unpack(item, elem_types[i] if i < len(elem_types) else None)
-                    for i, item in enumerate(items)
-                )
+        Raises:
+            ValueError: If factory name is not an allowed builtin
+        """
+        items = list(obj[str(Marks.DEFAULT_DICT)])
+        name = items[0]
+        if name is not None and name not in _DEFAULT_FACTORIES:
+            raise ValueError(f"Unsupported defaultdict factory '{name}'")
+        types = self._pair_types(items, expected_type, collections.defaultdict, skip=1)
+        return items, types, _build_defaultdict
+
+    def _unpack_namedtuple(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[list[Any], list[Any] | None, Callable[[list[Any]], Any]]:
+        """
+        Prepare namedtuple [alias, *items] for unpacking.
 
-        # Без expected_type - просто восстановление tuple
-        return tuple(self.unpack(item) for item in items)
+        Raises:
+            RegistrationError: If alias is not a registered namedtuple class
+        """
+        items = list(obj[str(Marks.NAMEDTUPLE)])
+        cls = REGISTERED_MODELS.get(items[0]) or lookup_model(items[0])
+        if cls is None or not issubclass(cls, tuple):
+            raise RegistrationError(
+                f"namedtuple with key '{items[0]}' is not registered. Use @register_model()"
+            )
+        # typing.NamedTuple - типы полей из аннотаций
+        annotations = getattr(cls, "__annotations__", {})
+        types = [None, *(annotations.get(field) for field in cls._fields)]  # type: ignore[attr-defined]
+        return items, types if len(types) == len(items) else None, partial(_build_namedtuple, cls)
+
+    @staticmethod
+    def _tuple_item_types(items: list[Any], expected_type: type[Any] | None) -> list[Any] | None:
+        """Get expected types of tuple items from tuple[Type1, Type2, ...]."""
+        if not expected_type or get_origin(expected_type) is not tuple:
+            return None
+        # tuple[Type1, Type2, ...] - более точная десериализация
+        elem_types = get_args(expected_type)
+        return [elem_types[i] if i < len(elem_types) else None for i in range(len(items))]
+
+    def _unpack_ndarray(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> Any:
+        """
+        Unpack NumPy array from dict with marker.
+
+        Raw buffers are wrapped with np.frombuffer() without per-element work,
+        so the returned array is read-only.
+        """
+        np = import_optional("numpy", "numpy is required to unpack ndarray")
+        packed = obj[str(Marks.NDARRAY)]
+        dtype = np.dtype(packed["dtype"])
+        shape = tuple(packed["shape"])
+
+        if "items" in packed:
+            return np.array(packed["items"], dtype=dtype).reshape(shape)
+
+        data = packed["data"]
+        # Бинарные бэкенды могут передать буфер без base64
+        buffer = data if isinstance(data, (bytes, bytearray, memoryview)) else binascii.a2b_base64(data)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape)
 
     def _unpack_object_id(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> Any:
         """Unpack ObjectId from dict with marker."""
         # expected_type игнорируется для ObjectId (тип уже определен маркером)
-        if ObjectId is None:
-            raise ImportError("pymongo is required to unpack ObjectId")
-        return ObjectId(obj[str(Marks.OBJECT_ID)])
+        bson = import_optional("bson", "pymongo is required to unpack ObjectId")
+        return bson.ObjectId(obj[str(Marks.OBJECT_ID)])
+
+    def _unpack_uuid(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> uuid.UUID:
+        """Unpack UUID from hex string or raw bytes."""
+        value = obj[str(Marks.UUID)]
+        if isinstance(value, str):
+            return uuid.UUID(hex=value)
+        return uuid.UUID(bytes=bytes(value))
+
+    def _unpack_enum(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> enum.Enum:
+        """
+        Unpack Enum member by registered alias and value.
+
+        Raises:
+            RegistrationError: If alias is not a registered Enum class
+        """
+        alias, value = obj[str(Marks.ENUM)]
+        cls = REGISTERED_MODELS.get(alias) or lookup_model(alias)
+        if cls is None or not issubclass(cls, enum.Enum):
+            raise RegistrationError(f"Enum with key '{alias}' is not registered. Use @register_model()")
+        if type(value) not in _SCALAR_TYPES:
+            # Составные значения (например, tuple) - через обычную распаковку
+            value = self.unpack(value)
+        return cls(value)
+
+    def _unpack_timedelta(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> datetime.timedelta:
+        """Unpack timedelta from integer microseconds."""
+        return datetime.timedelta(microseconds=obj[str(Marks.TIMEDELTA)])
+
+    def _unpack_time(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> datetime.time:
+        """Unpack time from dict with marker."""
+        return datetime.time.fromisoformat(obj[str(Marks.TIME)])
+
+    def _unpack_ip_address(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> ipaddress.IPv4Address | ipaddress.IPv6Address:
+        """Unpack IP address from string or raw bytes."""
+        value = obj[str(Marks.IP_ADDRESS)]
+        return ipaddress.ip_address(value if isinstance(value, str) else bytes(value))
+
+    def _unpack_ip_network(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+        """Unpack IP network from dict with marker."""
+        return ipaddress.ip_network(obj[str(Marks.IP_NETWORK)])
+
+    def _unpack_ip_interface(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> ipaddress.IPv4Interface | ipaddress.IPv6Interface:
+        """Unpack IP interface from dict with marker."""
+        return ipaddress.ip_interface(obj[str(Marks.IP_INTERFACE)])
+
+    def _unpack_path(self, obj: dict[str, Any], expected_type: type[Any] | None = None) -> pathlib.PurePath:
+        """Unpack path as pathlib.Path or packed pure path kind (or expected PurePath subclass)."""
+        value = obj[str(Marks.PATH)]
+        cls: type[pathlib.PurePath] = pathlib.Path
+        if isinstance(value, list):
+            kind, value = value
+            cls = _PURE_PATH_KINDS[kind]
+        if isinstance(expected_type, type) and issubclass(expected_type, pathlib.PurePath):
+            cls = expected_type
+        return cls(value)
 
     # ========== Model unpacking methods ==========
 
-    def _unpack_model(self, obj: dict[str, Any]) -> Any:
+    def _unpack_model(
+        self, obj: dict[str, Any], expected_type: type[Any] | None = None
+    ) -> tuple[dict[str, Any], dict[str, Any] | None, Callable[[dict[str, Any]], Any]]:
         """
-        Unpack model from dict with MODEL marker.
+        Prepare model fields (dict with MODEL marker) for unpacking.
 
         Args:
             obj: Dict with Marks.MODEL marker and model data
+            expected_type: Ignored (model class is defined by the marker)
 
         Returns:
-            Model instance (Pydantic or dataclass)
+            (fields to unpack, their annotated types, model builder)
 
         Raises:
-            RegistrationError: If model is not registered
+            RegistrationError: If model is not registered (and has no migration
+                to a registered model)
         """
-        from .registry import REGISTERED_MODELS
-
         model_key = obj[str(Marks.MODEL)]
-        cls = REGISTERED_MODELS.get(model_key)
+        # Объявленные в манифесте модели импортируются при первом чтении
+        cls = REGISTERED_MODELS.get(model_key) or lookup_model(model_key)
 
         if cls is None:
+            return self._unpack_migrated_model(obj, model_key)
+
+        data = {key: value for key, value in obj.items() if key != str(Marks.MODEL)}
+        # Типы полей из аннотаций
+        annotations = getattr(cls, '__annotations__', {})
+        field_types = {key: annotations.get(key) for key in data}
+        return data, field_types, partial(self._build_model, cls)
+
+    def _unpack_migrated_model(
+        self, obj: dict[str, Any], model_key: str
+    ) -> tuple[dict[str, Any], None, Callable[[dict[str, Any]], Any]]:
+        """
+        Prepare fields of an old model version for upcasting.
+
+        Field types of the old version are unknown, so fields are restored
+        by their markers only; the migration chain then converts them for
+        the latest registered model.
+
+        Raises:
+            RegistrationError: If the alias has no migration to a registered model
+        """
+        plan = MIGRATION_PLANS.get(model_key)
+        cls = lookup_model(plan[0]) if plan is not None else None
+        if plan is None or cls is None:
             raise RegistrationError(
                 f"Model with key '{model_key}' is not registered. Use @register_model()"
             )
 
-        # Рекурсивный unpack полей
-        data = {}
-        for key, value in obj.items():
-            if key != str(Marks.MODEL):
-                # Получаем тип поля из аннотаций
-                field_type = None
-                if hasattr(cls, '__annotations__'):
-                    field_type = cls.__annotations__.get(key)
-                data[key] = self.unpack(value, field_type)
+        data = {key: value for key, value in obj.items() if key != str(Marks.MODEL)}
+        return data, None, partial(self._build_migrated_model, cls, model_key, plan[1])
+
+    def _build_migrated_model(
+        self,
+        cls: type[Any],
+        model_key: str,
+        upgrades: tuple[Callable[[dict[str, Any]], dict[str, Any]], ...],
+        data: dict[str, Any],
+    ) -> Any:
+        """Apply migration chain to unpacked fields of an old version and build the model."""
+        for upgrade in upgrades:
+            data = upgrade(data)
+        migrated = _MIGRATED.get()
+        if migrated is not None:
+            migrated.append(model_key)
+        return self._build_model(cls, data)
+
+    def _build_model(self, cls: type[Any], data: dict[str, Any]) -> Any:
+        """
+        Create model instance from unpacked fields.
+
+        Args:
+            cls: Registered model class
+            data: Unpacked field values
+
+        Returns:
+            Model instance (Pydantic or dataclass)
+        """
+        # Trusted-режим: типы полей уже восстановлены маркерами, валидация не нужна
+        trusted = _TRUSTED_OVERRIDE.get()
+        if trusted is None:
+            trusted = self.trusted
+        if trusted:
+            return self._construct_model(cls, data)
 
         # Создание экземпляра
-        if BaseModel is not None and issubclass(cls, BaseModel):
+        base_model = loaded_class("pydantic", "BaseModel")
+        if base_model is not None and issubclass(cls, base_model):
             if hasattr(cls, 'model_validate'):
                 # Pydantic v2
                 return cls.model_validate(data)
@@ -209,9 +1362,67 @@ class JsonSerializer:
             # Dataclass
             return cls(**data)
 
+    def _construct_model(self, cls: type[Any], data: dict[str, Any]) -> Any:
+        """
+        Build model instance from unpacked fields without validation.
+
+        Pydantic models are created with model_construct(), dataclasses by
+        direct attribute assignment (no __init__/__post_init__ calls).
+
+        Args:
+            cls: Registered model class
+            data: Unpacked field values
+
+        Returns:
+            Model instance (Pydantic or dataclass)
+        """
+        base_model = loaded_class("pydantic", "BaseModel")
+        if base_model is not None and issubclass(cls, base_model):
+            if hasattr(cls, 'model_construct'):
+                # Pydantic v2
+                return cls.model_construct(**data)
+            # Pydantic v1
+            return cls.construct(**data)
+
+        # Dataclass: object.__new__ + прямое присваивание (минуя __init__ и frozen-__setattr__).
+        # Поля присваиваются в порядке объявления, как в __init__: иначе словарь экземпляра
+        # не разделяет ключи с другими экземплярами класса (PEP 412) и занимает больше памяти
+        instance = object.__new__(cls)
+        assigned = 0
+        for field in dataclasses.fields(cls):
+            name = field.name
+            if name in data:
+                value = data[name]
+                assigned += 1
+            # Отсутствующие в payload поля заполняются значениями по умолчанию
+            elif field.default is not dataclasses.MISSING:
+                value = field.default
+            elif field.default_factory is not dataclasses.MISSING:
+                value = field.default_factory()
+            else:
+                continue
+            object.__setattr__(instance, name, value)
+
+        if assigned < len(data):
+            # Значения, не объявленные полями, - после полей, как прежде
+            names = {field.name for field in dataclasses.fields(cls)}
+            for key, value in data.items():
+                if key not in names:
+                    object.__setattr__(instance, key, value)
+        return instance
+
     # ========== Model packing methods ==========
 
-    def _pack_pydantic(self, obj: Any) -> dict[str, Any]:
+    @staticmethod
+    def _model_alias(cls: type[Any]) -> str | None:
+        """Registered alias of a model class (frozen copies - alias of their base class)."""
+        alias = MODEL_ALIASES.get(cls)
+        if alias is None:
+            # Frozen-подкласс из loads_shared()/freeze() пишется как исходная модель
+            alias = MODEL_ALIASES.get(getattr(cls, FROZEN_BASE_ATTRIBUTE, None))  # type: ignore[arg-type]
+        return alias
+
+    def _pack_pydantic(self, obj: Any) -> tuple[dict[str, Any], dict[str, Any]]:
         """
         Pack Pydantic model to dict with marker.
 
@@ -219,13 +1430,14 @@ class JsonSerializer:
             obj: Pydantic BaseModel instance
 
         Returns:
-            Dict with Marks.MODEL marker and model data
+            Dict with Marks.MODEL marker and model fields (twice: as result
+            and as container of field values to pack)
 
         Raises:
             RegistrationError: If model is not registered
         """
         cls = type(obj)
-        model_key = MODEL_ALIASES.get(cls)
+        model_key = self._model_alias(cls)
 
         if model_key is None:
             raise RegistrationError(
@@ -235,29 +1447,27 @@ class JsonSerializer:
         # Извлечение полей вручную (без model_dump/dict для сохранения вложенных объектов)
         # model_dump() и dict() рекурсивно преобразуют вложенные модели в dict,
         # что приводит к потере маркеров моделей при последующей упаковке
-        packed_data = {}
+        packed_data = self._marker_dict({str(Marks.MODEL): model_key})
         if hasattr(cls, 'model_fields'):
             # Pydantic v2 - итерация по model_fields класса (не экземпляра)
             for field_name in cls.model_fields:
-                value = getattr(obj, field_name)
-                packed_data[field_name] = self.pack(value)  # Рекурсивная упаковка
+                packed_data[field_name] = getattr(obj, field_name)
         elif hasattr(cls, '__fields__'):
             # Pydantic v1 - итерация по __fields__ класса
             for field_name in cls.__fields__:
-                value = getattr(obj, field_name)
-                packed_data[field_name] = self.pack(value)  # Рекурсивная упаковка
+                packed_data[field_name] = getattr(obj, field_name)
         else:
             # Fallback для совместимости
             if hasattr(obj, 'model_dump'):
                 data = obj.model_dump(mode='python')
             else:
                 data = obj.dict()
-            for key, value in data.items():
-                packed_data[key] = self.pack(value)
+            packed_data.update(data)
 
-        return {str(Marks.MODEL): model_key, **packed_data}
+        # Значения полей упаковываются на месте циклом pack()
+        return packed_data, packed_data
 
-    def _pack_dataclass(self, obj: Any) -> dict[str, Any]:
+    def _pack_dataclass(self, obj: Any) -> tuple[dict[str, Any], dict[str, Any]]:
         """
         Pack dataclass to dict with marker.
 
@@ -265,13 +1475,14 @@ class JsonSerializer:
             obj: Dataclass instance
 
         Returns:
-            Dict with Marks.MODEL marker and dataclass data
+            Dict with Marks.MODEL marker and dataclass fields (twice: as result
+            and as container of field values to pack)
 
         Raises:
             RegistrationError: If dataclass is not registered
         """
         cls = type(obj)
-        model_key = MODEL_ALIASES.get(cls)
+        model_key = self._model_alias(cls)
 
         if model_key is None:
             raise RegistrationError(
@@ -281,12 +1492,12 @@ class JsonSerializer:
         # Извлечение полей вручную (без asdict для сохранения вложенных объектов)
         # dataclasses.asdict() рекурсивно преобразует вложенные dataclass в dict,
         # что приводит к потере маркеров моделей при последующей упаковке
-        packed_data = {}
+        packed_data = self._marker_dict({str(Marks.MODEL): model_key})
         for field in dataclasses.fields(obj):
-            value = getattr(obj, field.name)
-            packed_data[field.name] = self.pack(value)  # Рекурсивная упаковка
+            packed_data[field.name] = getattr(obj, field.name)
 
-        return {str(Marks.MODEL): model_key, **packed_data}
+        # Значения полей упаковываются на месте циклом pack()
+        return packed_data, packed_data
 
     # ========== Utility methods ==========
 
@@ -311,71 +1522,170 @@ class JsonSerializer:
         try:
             if expected_type is Decimal:
                 return Decimal(obj)
-            if expected_type is ObjectId and ObjectId is not None:
-                return ObjectId(obj)
+            object_id = loaded_class("bson", "ObjectId")
+            if object_id is not None and expected_type is object_id:
+                return object_id(obj)
             if expected_type is datetime.datetime:
                 return datetime.datetime.fromisoformat(obj)
             if expected_type is datetime.date:
                 return datetime.date.fromisoformat(obj)
+            if expected_type is bytes:
+                return _b64decode_strict(obj)
+            if expected_type is uuid.UUID:
+                if len(obj) == 22:
+                    # 22 символа - base64url от 16 байт без padding
+                    return uuid.UUID(bytes=_b64decode_strict(obj.replace("-", "+").replace("_", "/") + "=="))
+                return uuid.UUID(obj)
+            if expected_type is datetime.time:
+                return datetime.time.fromisoformat(obj)
+            if isinstance(expected_type, type) and issubclass(expected_type, _STRING_CONSTRUCTED_TYPES):
+                return expected_type(obj)
         except (ValueError, TypeError, Exception):
             # Перехватываем все исключения, включая decimal.InvalidOperation
             pass
         return obj
 
-    def pack(self, obj: Any) -> Any:
+    def pack(self, obj: Any, keyed_dicts: bool = False) -> Any:
         """
         Pack Python object to JSON-serializable structure.
 
+        Nested containers are walked iteratively with an explicit stack, so
+        nesting depth is limited by max_depth, not by the recursion limit.
+
         Args:
             obj: Python object to serialize
+            keyed_dicts: Check keys of plain dicts and pack dicts with
+                non-string keys with the KEYED_DICT marker (dumps() does
+                this automatically when the backend rejects a key)
 
         Returns:
             JSON-serializable structure
 
         Raises:
             TypeError: If object is a Response object or unsupported type
+            DepthLimitError: If nesting depth exceeds max_depth
+            NodeLimitError: If the value has more than max_nodes elements
+            LengthLimitError: If a collection is longer than max_length
         """
-        # Простые типы (быстрая проверка)
-        if obj is None or isinstance(obj, (str, int, float, bool)):
-            return obj
+        return self._pack(obj, keyed_dicts)[0]
 
-        # Проверка Response объектов (явный запрет сериализации)
-        if Response is not None and isinstance(obj, Response):
-            raise TypeError("Response objects cannot be serialized")
+    def _pack(self, obj: Any, keyed_dicts: bool = False) -> tuple[Any, bool]:
+        """
+        Pack value and report whether any type marker was emitted (see pack()).
 
-        # Dispatch-таблица (O(1) поиск обработчика)
-        obj_type = type(obj)
-        handler = self._pack_handlers.get(obj_type)
-        if handler:
-            return handler(obj)
+        A node is marked when a handler replaced it (datetime, Decimal, list
+        packed as one marker array, ...) or when it was expanded into a dict
+        whose first key is a marker (models, sets, tuples, ...); expanders
+        always put the marker first.
 
-        # Проверка Pydantic моделей
-        if BaseModel is not None and isinstance(obj, BaseModel):
-            return self._pack_pydantic(obj)
+        Returns:
+            (JSON-serializable structure, True if it may contain markers)
+        """
+        # Простые типы (быстрая проверка)
+        if obj is None or isinstance(obj, (str, int, float, bool)):
+            return obj, False
+
+        pack_node = self._pack_node_keyed if keyed_dicts else self._pack_node
+        packed, children = pack_node(obj)
+        marked = packed is not obj and (
+            children is None or (type(packed) is not list and next(iter(packed), None) in _MARKER_KEYS)
+        )
+        if children is None:
+            if type(obj) is list:
+                # list[datetime], упакованный одним маркером-массивом
+                self._check_array(len(obj))
+            return packed, marked
+
+        # Стек контейнеров (контейнер, глубина): элементы упаковываются на месте,
+        # вложенные контейнеры кладутся в стек вместо рекурсивного вызова
+        max_depth = self.max_depth
+        # Лимиты размера: без лимита сравнение с sys.maxsize никогда не срабатывает
+        max_nodes = self.max_nodes or sys.maxsize
+        max_length = self.max_length or sys.maxsize
+        nodes = 0
+        stack: list[tuple[Any, int]] = [(children, 1)]
+        while stack:
+            container, depth = stack.pop()
+            if depth > max_depth:
+                raise self._limit_exceeded(DepthLimitError, f"Nesting depth exceeds max_depth={max_depth}")
+            size = len(container)
+            nodes += size
+            if size > max_length or nodes > max_nodes:
+                self._check_size(size, nodes)
+            next_depth = depth + 1
+            for key, child in enumerate(container) if type(container) is list else container.items():
+                # Простые значения остаются на месте
+                if type(child) in _SCALAR_TYPES:
+                    continue
+                packed_child, grandchildren = pack_node(child)
+                container[key] = packed_child
+                if grandchildren is not None:
+                    stack.append((grandchildren, next_depth))
+                elif type(child) is list:
+                    # list[datetime] одним маркером-массивом: элементы считаются без обхода
+                    size = len(child)
+                    nodes += size
+                    if size > max_length or nodes > max_nodes:
+                        self._check_size(size, nodes)
+                # Маркер: значение заменено обработчиком или dict с маркером первым ключом
+                if not marked and packed_child is not child:
+                    if grandchildren is None:
+                        marked = True
+                    elif type(packed_child) is not list:
+                        marked = next(iter(packed_child), None) in _MARKER_KEYS
+        return packed, marked
+
+    def _pack_node(self, obj: Any) -> tuple[Any, Any]:
+        """
+        Pack one value without descending into its children.
 
-        # Проверка dataclass
-        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
-            return self._pack_dataclass(obj)
+        Returns:
+            (packed value, container of children to pack in place or None)
+        """
+        # Простые типы (в том числе подклассы str/int - например, StrEnum)
+        if obj is None or isinstance(obj, (str, int, float, bool)):
+            return obj, None
 
-        # Обработка list (рекурсивная упаковка)
+        # Самые частые контейнеры - до dispatch-таблицы
+        obj_type = type(obj)
+        if obj_type is dict:
+            children = obj.copy()
+            return children, children
+        if obj_type is list:
+            return self._pack_list(obj)
+
+        # Dispatch-таблицы (O(1) поиск обработчика); новые типы разрешаются один раз
+        handler = self._pack_handlers.get(obj_type, _UNRESOLVED)
+        if handler is _UNRESOLVED:
+            handler = self._resolve_pack_handler(obj_type)
+        if handler is not None:
+            return self._mark(handler(obj)), None
+        expander = self._pack_expanders.get(obj_type)
+        if expander is not None:
+            return expander(obj)
+
+        # Подклассы list/dict без собственного маркера
         if isinstance(obj, list):
-            return [self.pack(item) for item in obj]
-
-        # Обработка tuple (сериализуется как dict с маркером)
-        if isinstance(obj, tuple):
-            return {str(Marks.TUPLE): [self.pack(item) for item in obj]}
-
-        # Обработка dict (рекурсивная упаковка значений)
+            return self._pack_list(obj)
         if isinstance(obj, dict):
-            return {k: self.pack(v) for k, v in obj.items()}
+            return self._pack_dict(obj)
 
         # Fallback: другие типы...
         raise TypeError(f"Unsupported type for packing: {obj_type}")
 
+    def _pack_node_keyed(self, obj: Any) -> tuple[Any, Any]:
+        """_pack_node() with keys of plain dicts checked (non-string keys - KEYED_DICT)."""
+        if type(obj) is dict:
+            return self._pack_dict(obj)
+        return self._pack_node(obj)
+
     def unpack(self, obj: Any, expected_type: type[Any] | None = None) -> Any:
         """
         Unpack JSON-serializable structure to Python object.
 
+        Nested containers are walked iteratively with an explicit stack, so
+        nesting depth is limited by max_depth, not by the recursion limit.
+
         Args:
             obj: JSON-serializable structure
             expected_type: Optional expected type for better deserialization
@@ -385,59 +1695,135 @@ class JsonSerializer:
 
         Raises:
             RegistrationError: If model is not registered
+            DepthLimitError: If nesting depth exceeds max_depth
+            NodeLimitError: If the value has more than max_nodes elements
+            LengthLimitError: If a collection is longer than max_length
+        """
+        value, children, child_types, build = self._unpack_node(obj, expected_type)
+        if children is None:
+            if type(value) is list:
+                # Маркер-массив (list[datetime]), восстановленный одним обработчиком
+                self._check_array(len(value))
+            return value
+
+        # Стек задач двух видов:
+        # - (контейнер, ожидаемые типы элементов, глубина, None): элементы распаковываются
+        #   на месте, вложенные контейнеры кладутся в стек вместо рекурсивного вызова
+        # - (контейнер, слот, сборщик, True): container[slot] = сборщик() - сборка set/tuple/
+        #   модели; кладётся в стек до дочерних элементов, поэтому выполняется после них
+        root = [value]
+        stack: list[tuple[Any, Any, Any, bool | None]] = []
+        if build is not None:
+            stack.append((root, 0, partial(build, children), True))
+        stack.append((children, child_types, 1, None))
+
+        unpack_node = self._unpack_node
+        max_depth = self.max_depth
+        max_nodes = self.max_nodes or sys.maxsize
+        max_length = self.max_length or sys.maxsize
+        nodes = 0
+        intern_string = self._intern_string if self._intern_table is not None else None
+        while stack:
+            container, types, depth, is_build = stack.pop()
+            if is_build:
+                container[types] = depth()
+                continue
+            if depth > max_depth:
+                raise self._limit_exceeded(DepthLimitError, f"Nesting depth exceeds max_depth={max_depth}")
+            size = len(container)
+            nodes += size
+            if size > max_length or nodes > max_nodes:
+                self._check_size(size, nodes)
+            next_depth = depth + 1
+            for key, child in enumerate(container) if type(container) is list else container.items():
+                # Числа/None остаются на месте, строки - если не нужно преобразование по типу
+                child_type = types[key] if types is not None else None
+                if type(child) in _UNPACK_SCALAR_TYPES:
+                    continue
+                if type(child) is str and child_type is None:
+                    if intern_string is not None:
+                        container[key] = intern_string(child)
+                    continue
+                value, children, child_types, build = unpack_node(child, child_type)
+                if children is None:
+                    container[key] = value
+                    if type(value) is list:
+                        # Маркер-массив: элементы считаются без обхода
+                        size = len(value)
+                        nodes += size
+                        if size > max_length or nodes > max_nodes:
+                            self._check_size(size, nodes)
+                    continue
+                if build is not None:
+                    stack.append((container, key, partial(build, children), True))
+                else:
+                    container[key] = value
+                stack.append((children, child_types, next_depth, None))
+        return root[0]
+
+    def _unpack_node(self, obj: Any, expected_type: type[Any] | None) -> tuple[Any, Any, Any, Any]:
+        """
+        Unpack one value without descending into its children.
+
+        Returns:
+            (value, children, child_types, build): value is the result when
+            children is None (leaf). Otherwise children (list or dict) are
+            unpacked in place with expected types from child_types (same
+            shape or None); if build is set, the result is build(children),
+            else value (the children container itself).
         """
         # None
         if obj is None:
-            return None
+            return None, None, None, None
 
         # Простые типы (быстрая проверка) - исключаем str, она обрабатывается отдельно
         if isinstance(obj, (int, float, bool)):
-            return obj
+            return obj, None, None, None
 
         # Маркеры типов (dispatch-таблица) - проверяем dict с маркерами
         if isinstance(obj, dict):
             # Проверка маркеров через dispatch-таблицу (O(1))
             for marker, handler in self._unpack_handlers.items():
                 if marker in obj:
-                    return handler(obj, expected_type)
+                    return handler(obj, expected_type), None, None, None
 
-            # Проверка MODEL (обрабатывается отдельно)
-            if str(Marks.MODEL) in obj:
-                return self._unpack_model(obj)
+            # Контейнеры с маркером (set, tuple, модели) - элементы распаковываются циклом
+            for marker, expander in self._unpack_expanders.items():
+                if marker in obj:
+                    children, child_types, build = expander(obj, expected_type)
+                    return None, children, child_types, build
 
         # Обработка коллекций
         # list
         if isinstance(obj, list):
+            items = list(obj)
             if expected_type:
                 origin = get_origin(expected_type)
                 if origin is list:
                     # list[Type]
                     args = get_args(expected_type)
-                    elem_type = args[0] if args else None
-                    return [self.unpack(item, elem_type) for item in obj]
+                    if args and args[0] is not None:
+                        return items, items, [args[0]] * len(items), None
                 elif origin is tuple:
                     # tuple[Type1, Type2, ...] - восстановление tuple
-                    elem_types = get_args(expected_type)
-                    return tuple(
-                        self.unpack(item, elem_types[i] if i < len(elem_types) else None)
-                        for i, item in enumerate(obj)
-                    )
+                    return None, items, self._tuple_item_types(items, expected_type), tuple
 
-            # Без expected_type - просто рекурсивный unpack
-            return [self.unpack(item) for item in obj]
+            # Без expected_type - просто распаковка элементов
+            return items, items, None, None
 
         # dict (обычный, без маркеров)
         if isinstance(obj, dict):
+            children = dict(obj)
             if expected_type:
                 origin = get_origin(expected_type)
                 if origin is dict:
                     # dict[str, Type]
                     args = get_args(expected_type)
-                    value_type = args[1] if len(args) > 1 else None
-                    return {k: self.unpack(v, value_type) for k, v in obj.items()}
+                    if len(args) > 1 and args[1] is not None:
+                        return children, children, dict.fromkeys(children, args[1]), None
 
-            # Без expected_type - просто рекурсивный unpack
-            return {k: self.unpack(v) for k, v in obj.items()}
+            # Без expected_type - просто распаковка значений
+            return children, children, None, None
 
         # Обработка строк
         if isinstance(obj, str):
@@ -445,64 +1831,163 @@ class JsonSerializer:
             if expected_type:
                 converted = self._convert_string_to_type(obj, expected_type)
                 if converted is not obj:
-                    return converted
+                    return converted, None, None, None
 
             # УДАЛЕН блок агрессивной конвертации ISO строк
             # Конвертация происходит только при наличии expected_type
 
-            return obj
+            if self._intern_table is not None:
+                return self._intern_string(obj), None, None, None
+            return obj, None, None, None
 
         # Fallback для неизвестных типов
         raise TypeError(f"Unsupported type for unpacking: {type(obj).__name__}")
 
-    def dumps(self, value: Any) -> bytes:
+    def dumps(self, value: Any, soft_ttl: float | None = None, compute_time: float | None = None) -> bytes:
         """
-        Serialize to JSON bytes using orjson.
+        Serialize to bytes using the serializer's backend (orjson by default).
 
         All non-native JSON types (datetime, Decimal, set, models, etc.)
         are packed with type markers before serialization.
 
+        JSON without type markers is prefixed with a space (still valid JSON),
+        which lets loads() return the parsed result without the unpack() walk.
+
+        With a soft TTL the namespace wrapper also records the write time,
+        the soft TTL and optionally the compute time (read back with
+        loads_with_meta(); loads() ignores them).
+
         Args:
             value: Python object to serialize
+            soft_ttl: Soft TTL in seconds (None - serializer's soft_ttl)
+            compute_time: Seconds it took to compute value (used by
+                CacheMeta.should_refresh() for early refresh)
 
         Returns:
             JSON bytes
 
+        Raises:
+            LimitExceededError: If value exceeds max_bytes, max_depth,
+                max_nodes or max_length (nothing should be cached)
+
         Examples:
             >>> serializer = JsonSerializer()
             >>> data = {"name": "Alice", "age": 30}
             >>> serializer.dumps(data)
-            b'{"name":"Alice","age":30}'
+            b' {"name":"Alice","age":30}'
 
             >>> serializer = JsonSerializer(namespace="cache:v2:")
             >>> serializer.dumps(data)
-            b'{"$ns":"cache:v2:","$data":{"name":"Alice","age":30}}'
+            b' {"$ns":"cache:v2:","$data":{"name":"Alice","age":30}}'
+
+            >>> serializer.dumps(data, soft_ttl=60)
+            b' {"$ns":"cache:v2:","$at":1718000000000,"$ttl":60000,"$data":{...}}'
         """
-        import orjson
+        if soft_ttl is None:
+            soft_ttl = self.soft_ttl
+        if soft_ttl is None:
+            data = self._pack_encode(value, self.namespace)
+        else:
+            envelope = {WRITTEN_AT_KEY: round(time.time() * 1000), SOFT_TTL_KEY: round(soft_ttl * 1000)}
+            if compute_time is not None:
+                envelope[COMPUTE_TIME_KEY] = round(compute_time * 1000)
+            data = self._pack_encode(value, self.namespace, envelope)
 
-        # Pack объект (добавляет маркеры типов для нестандартных типов)
-        packed = self.pack(value)
+        if self.max_bytes is not None:
+            self.check_bytes(len(data))
+        return data
+
+    def _pack_encode(self, value: Any, namespace: str = "", envelope: dict[str, Any] | None = None) -> bytes:
+        """
+        Pack and encode value (with namespace wrapper if given).
 
+        Dict keys are not checked by pack() on the hot path: if the backend
+        rejects a key (int, tuple, Enum, ...), the value is packed again
+        with keyed_dicts=True.
+        """
+        # Pack объект (добавляет маркеры типов для нестандартных типов)
+        packed, marked = self._pack(value)
+        try:
+            data = self._encode(self._wrap(packed, namespace, envelope))
+        except TypeError as e:
+            if str(e) == _CODEC_RECURSION_MESSAGE:
+                # Маркеры добавляют уровни JSON: значение в пределах max_depth глубже лимита orjson
+                raise self._limit_exceeded(
+                    DepthLimitError, f"Encoded nesting exceeds the JSON limit of {JSON_MAX_DEPTH} levels"
+                ) from e
+            # Ключи dict не-строки - повторная упаковка с KEYED_DICT (только для таких значений)
+            packed, marked = self._pack(value, keyed_dicts=True)
+            data = self._encode(self._wrap(packed, namespace, envelope))
+        if self.backend.binary:
+            return data
+
+        # Флаг маркеров известен из pack(): loads() не ищет маркеры в байтах.
+        # Упакованная структура освобождается до копирования байтов с флагом
+        del packed
+        return (_MARKED_JSON_FLAG if marked else _PLAIN_JSON_FLAG) + data
+
+    @staticmethod
+    def _wrap(packed: Any, namespace: str, envelope: dict[str, Any] | None) -> Any:
+        """Add namespace wrapper with envelope metadata, if any."""
         # Namespace-обёртка (для версионирования)
-        if self.namespace:
-            packed = {NS_KEY: self.namespace, DATA_KEY: packed}
+        if envelope:
+            return {NS_KEY: namespace, **envelope, DATA_KEY: packed}
+        if namespace:
+            return {NS_KEY: namespace, DATA_KEY: packed}
+        return packed
+
+    def _encode(self, packed: Any) -> bytes:
+        """Encode packed structure with the backend (canonical mode)."""
+        # Сериализация бэкендом (все нестандартные типы уже обработаны в pack)
+        if self.canonical:
+            return self.backend.encode(packed, canonical=True)
+        return self.backend.encode(packed)
+
+    def digest(self, value: Any) -> str:
+        """
+        Stable content hash of a value (BLAKE2b of its canonical dumps() bytes).
 
-        # Сериализация через orjson (без passthrough опций, так как все типы уже обработаны в pack)
-        return orjson.dumps(packed)
+        Equal values give equal digests across processes and hash seeds,
+        which makes the digest usable for dedup and ETags. The namespace is
+        part of the serialized bytes and therefore of the digest; soft TTL
+        metadata (write time) is not.
 
-    def loads(self, value: bytes | None) -> Any:
+        Args:
+            value: Python object
+
+        Returns:
+            Hex digest (32 characters)
+
+        Raises:
+            ValueError: If the serializer is not in canonical mode
+        """
+        if not self.canonical:
+            raise ValueError("digest() requires JsonSerializer(canonical=True)")
+        return content_digest(self._pack_encode(value, self.namespace))
+
+    def loads(self, value: bytes | bytearray | memoryview | None, trusted: bool | None = None) -> Any:
         """
-        Deserialize from JSON bytes using orjson.
+        Deserialize from bytes produced by any backend.
 
-        Handles namespace wrapper and unpacks objects with type markers
-        back to their original Python types.
+        The backend is detected by payload header (JSON if none). Handles
+        namespace wrapper and unpacks objects with type markers back to
+        their original Python types. JSON without markers (flagged by dumps(),
+        or unflagged and found by a byte search) is returned as parsed,
+        without unpack().
 
         Args:
             value: JSON bytes to deserialize (or None)
+            trusted: Override serializer's trusted mode for this call
+                (None - use the serializer setting)
 
         Returns:
             Python object (or None if value is None)
 
+        Raises:
+            LimitExceededError: If data exceeds max_bytes or the unpack()
+                walk exceeds max_depth, max_nodes or max_length. Marker-free
+                JSON is returned without a walk and bounded by max_bytes only.
+
         Examples:
             >>> serializer = JsonSerializer()
             >>> data = b'{"name":"Alice","age":30}'
@@ -514,17 +1999,413 @@ class JsonSerializer:
             >>> serializer.loads(data)
             {'name': 'Alice', 'age': 30}
         """
-        import orjson
-
         if value is None:
             return None
+        if self.max_bytes is not None:
+            self.check_bytes(len(value))
 
-        # Десериализация через orjson
-        data = orjson.loads(value)
+        # Десериализация бэкендом, определённым по заголовку payload
+        backend = detect_backend(value)
+        data = backend.decode(value)
 
         # Обработка namespace-обёртки
         if isinstance(data, dict) and NS_KEY in data and DATA_KEY in data:
             data = data[DATA_KEY]
+        return self._restore(value, backend, data, trusted)
+
+    def loads_with_meta(
+        self, value: bytes | bytearray | memoryview | None, trusted: bool | None = None
+    ) -> tuple[Any, CacheMeta | None]:
+        """
+        Deserialize like loads() and return the envelope metadata.
+
+        Lets a cache layer serve a stale value while refreshing it in the
+        background, or refresh early with CacheMeta.should_refresh().
+
+        Args:
+            value: Serialized bytes (or None)
+            trusted: Override serializer's trusted mode for this call
+
+        Returns:
+            (Python object, CacheMeta or None if written without soft TTL)
+
+        Example:
+            value, meta = serializer.loads_with_meta(redis.get(key))
+            if meta is not None and meta.should_refresh():
+                schedule_refresh(key)
+        """
+        if value is None:
+            return None, None
+        if self.max_bytes is not None:
+            self.check_bytes(len(value))
+
+        backend = detect_backend(value)
+        data = backend.decode(value)
+
+        meta = None
+        if isinstance(data, dict) and NS_KEY in data and DATA_KEY in data:
+            meta = CacheMeta.from_envelope(data)
+            data = data[DATA_KEY]
+        return self._restore(value, backend, data, trusted), meta
+
+    def _restore(
+        self, value: bytes | bytearray | memoryview, backend: Backend, data: Any, trusted: bool | None
+    ) -> Any:
+        """
+        Return decoded data as is if it has no markers, otherwise unpack() it.
+
+        Shared tail of loads() and loads_with_meta(): marker flag check, byte
+        search for unflagged JSON and the per-call trusted override.
+        """
+        # Быстрый путь: маркеров нет - результат orjson уже окончательный (без интернирования)
+        if not backend.binary and self._intern_table is None:
+            flag = value[:1]
+            plain = flag == _PLAIN_JSON_FLAG or (
+                flag != _MARKED_JSON_FLAG and not isinstance(value, memoryview) and not _has_markers(value)
+            )
+            if plain and self._plain_within_limits(value):
+                return data
+
+        if self.bytes_as_memoryview:
+            data = self._share_bytes(value, backend, data)
 
         # Unpack объект (восстанавливает типы по маркерам)
-        return self.unpack(data)
+        if trusted is None:
+            return self.unpack(data)
+        token = _TRUSTED_OVERRIDE.set(trusted)
+        try:
+            return self.unpack(data)
+        finally:
+            _TRUSTED_OVERRIDE.reset(token)
+
+    def _plain_within_limits(self, value: bytes | bytearray | memoryview) -> bool:
+        """
+        Check by byte counts that a marker-free JSON payload is within the limits.
+
+        The bracket count bounds the nesting depth (the exact depth is then
+        found by _json_depth_exceeds()), brackets plus commas bound the number
+        of elements (strings may only add to the counts). A payload that may
+        exceed max_nodes or max_length is unpack()ed instead, which checks
+        the limits exactly.
+        """
+        # Глубже DEFAULT_MAX_DEPTH orjson.loads не разбирает - проверять нечего
+        if self.max_depth >= DEFAULT_MAX_DEPTH and self.max_nodes is None and self.max_length is None:
+            return True
+        if isinstance(value, memoryview):
+            return False
+        containers = value.count(b"[") + value.count(b"{")
+        if containers > self.max_depth and _json_depth_exceeds(value, self.max_depth):
+            return False
+        if self.max_nodes is None and self.max_length is None:
+            return True
+        elements = containers + value.count(b",")
+        return elements <= min(self.max_nodes or sys.maxsize, self.max_length or sys.maxsize)
+
+    @staticmethod
+    def _share_bytes(value: bytes | bytearray | memoryview, backend: Backend, data: Any) -> Any:
+        """
+        Decode all binary values of a payload into one shared read-only buffer.
+
+        BYTES marker payloads of the freshly decoded structure are replaced
+        in place with memoryview slices of the buffer, which _unpack_bytes()
+        returns as is. Values are appended to the buffer one at a time, so
+        at most one decoded value exists outside of it.
+        """
+        marker = str(Marks.BYTES)
+        # JSON без маркера bytes - обход структуры не нужен
+        if not backend.binary and not isinstance(value, memoryview) and marker.encode("ascii") not in value:
+            return data
+
+        nodes: list[dict[str, Any]] = []
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if type(node) is list:
+                stack.extend(node)
+            elif isinstance(node, dict):
+                if len(node) == 1 and isinstance(node.get(marker), (str, bytes, bytearray, memoryview)):
+                    nodes.append(node)
+                else:
+                    stack.extend(node.values())
+
+        if len(nodes) == 1:
+            # Единственное значение само становится буфером - без копии
+            payload = nodes[0][marker]
+            decoded = binascii.a2b_base64(payload) if isinstance(payload, str) else payload
+            nodes[0][marker] = memoryview(decoded).toreadonly()
+            return data
+
+        # BytesIO.getvalue() отдаёт внутренний bytes без копии; bytes (в отличие от
+        # bytearray) хешируем, поэтому срезы можно класть в set/frozenset
+        stream = io.BytesIO()
+        bounds: list[tuple[int, int]] = []
+        for node in nodes:
+            payload = node[marker]
+            # Исходный payload освобождается сразу после копирования в буфер
+            node[marker] = None
+            start = stream.tell()
+            stream.write(binascii.a2b_base64(payload) if isinstance(payload, str) else payload)
+            del payload
+            bounds.append((start, stream.tell()))
+
+        view = memoryview(stream.getvalue())
+        for node, (start, stop) in zip(nodes, bounds):
+            node[marker] = view[start:stop]
+        return data
+
+    def loads_or_miss(self, value: bytes | bytearray | memoryview | None, trusted: bool | None = None) -> Any:
+        """
+        Deserialize a cache read, telling a missing key from a cached None.
+
+        dumps(None) writes a non-empty payload, so a client reply of None
+        can only mean the key is missing.
+
+        Args:
+            value: Client reply (None - key is missing)
+            trusted: Override serializer's trusted mode for this call
+
+        Returns:
+            MISS if value is None, otherwise loads(value) (None for a cached None)
+
+        Example:
+            result = serializer.loads_or_miss(redis.get(key))
+            if result is MISS:
+                result = compute()
+                redis.set(key, serializer.dumps(result))
+        """
+        if value is None:
+            return MISS
+        return self.loads(value, trusted)
+
+    def loads_shared(self, value: bytes | bytearray | memoryview | None) -> Any:
+        """
+        Deserialize into an immutable result shared between calls with equal bytes.
+
+        Results are memoized by a BLAKE2b digest of the payload (LRU of
+        decode_cache_size entries), so repeated reads of a hot key cost a
+        hash and a dict lookup. Results are frozen (see frozen.freeze()):
+        read-only list/dict/set subclasses and frozen model copies, so
+        callers cannot modify a shared result; dumps() writes them like
+        the original values.
+
+        Args:
+            value: Serialized bytes (or None)
+
+        Returns:
+            Immutable Python object (or None if value is None)
+
+        Example:
+            countries = serializer.loads_shared(redis.get("ref:countries"))
+            countries["DE"]  # ReadOnlyDict - changes raise TypeError
+        """
+        if value is None:
+            return None
+
+        key = hashlib.blake2b(value, digest_size=_DECODE_KEY_SIZE).digest()
+        cache = self._decode_cache
+        with self._decode_lock:
+            entry = cache.get(key)
+            if entry is not None:
+                cache.move_to_end(key)
+                self._decode_hits += 1
+                return entry[0]
+            self._decode_misses += 1
+
+        result = freeze(self.loads(value))
+        if self.decode_cache_size == 0:
+            return result
+
+        with self._decode_lock:
+            if key not in cache:
+                cache[key] = (result, len(value))
+                self._decode_payload_bytes += len(value)
+                while len(cache) > self.decode_cache_size:
+                    _, (_, size) = cache.popitem(last=False)
+                    self._decode_payload_bytes -= size
+        return result
+
+    def decode_cache_info(self) -> dict[str, Any]:
+        """
+        Statistics of the loads_shared() cache.
+
+        Returns:
+            {"hits", "misses", "hit_ratio", "size", "max_size",
+            "payload_bytes" - total size of payloads of cached results}
+        """
+        with self._decode_lock:
+            lookups = self._decode_hits + self._decode_misses
+            return {
+                "hits": self._decode_hits,
+                "misses": self._decode_misses,
+                "hit_ratio": self._decode_hits / lookups if lookups else 0.0,
+                "size": len(self._decode_cache),
+                "max_size": self.decode_cache_size,
+                "payload_bytes": self._decode_payload_bytes,
+            }
+
+    def clear_decode_cache(self) -> None:
+        """Drop results cached by loads_shared() and reset statistics."""
+        with self._decode_lock:
+            self._decode_cache.clear()
+            self._decode_hits = 0
+            self._decode_misses = 0
+            self._decode_payload_bytes = 0
+
+    def loads_migrated(
+        self, value: bytes | bytearray | memoryview | None, trusted: bool | None = None
+    ) -> tuple[Any, bool]:
+        """
+        Deserialize like loads() and report whether old model versions were upcast.
+
+        Args:
+            value: Serialized bytes (or None)
+            trusted: Override serializer's trusted mode for this call
+
+        Returns:
+            (Python object, True if any model was upgraded by a migration -
+            write the value back with dumps() to store it in the new form)
+        """
+        migrated: list[str] = []
+        token = _MIGRATED.set(migrated)
+        try:
+            result = self.loads(value, trusted)
+        finally:
+            _MIGRATED.reset(token)
+        return result, bool(migrated)
+
+    # ========== Redis hash mappings ==========
+
+    def _hash_plan(self, cls: type[Any]) -> tuple[tuple[str, Any], ...]:
+        """
+        Get cached per-model plan: top-level fields with their annotated types.
+
+        Raises:
+            RegistrationError: If model is not registered
+        """
+        plan = self._hash_plans.get(cls)
+        if plan is not None:
+            return plan
+
+        if cls not in MODEL_ALIASES:
+            raise RegistrationError(f"Model {cls} is not registered. Use @register_model()")
+
+        try:
+            hints = get_type_hints(cls)
+        except (NameError, TypeError):
+            # Неразрешимые forward-ссылки - поля без expected_type
+            hints = {}
+
+        if dataclasses.is_dataclass(cls):
+            names = [field.name for field in dataclasses.fields(cls)]
+        elif hasattr(cls, 'model_fields'):
+            # Pydantic v2
+            names = list(cls.model_fields)
+        else:
+            # Pydantic v1
+            names = list(cls.__fields__)
+
+        plan = tuple((name, hints.get(name)) for name in names)
+        self._hash_plans[cls] = plan
+        return plan
+
+    def to_hash_mapping(self, obj: Any, fields: list[str] | None = None) -> dict[str, bytes]:
+        """
+        Encode top-level fields of a registered model as Redis hash fields.
+
+        Each field value is packed and encoded separately (same markers as
+        dumps(), without the namespace wrapper), so a model can be stored
+        with HSET and updated field by field.
+
+        Args:
+            obj: Registered Pydantic model or dataclass instance
+            fields: Only these fields (partial update), None - all fields
+
+        Returns:
+            Mapping {field name: encoded value} for HSET
+
+        Raises:
+            RegistrationError: If model is not registered
+            ValueError: If a requested field does not exist
+
+        Example:
+            client.hset("user:1", mapping=serializer.to_hash_mapping(user))
+            user.name = "Bob"
+            client.hset("user:1", mapping=serializer.to_hash_mapping(user, fields=["name"]))
+        """
+        plan = self._hash_plan(type(obj))
+        if fields is not None:
+            names = {name for name, _ in plan}
+            unknown = [field for field in fields if field not in names]
+            if unknown:
+                raise ValueError(f"{type(obj).__name__} has no fields {unknown}")
+            selected = set(fields)
+            plan = tuple(entry for entry in plan if entry[0] in selected)
+
+        return {name: self._pack_encode(getattr(obj, name)) for name, _ in plan}
+
+    def from_hash_mapping(
+        self,
+        cls: type[Any],
+        mapping: dict[str, Any] | dict[bytes, Any] | list[Any],
+        fields: list[str] | None = None,
+    ) -> Any:
+        """
+        Decode Redis hash fields written by to_hash_mapping().
+
+        Field values are decoded with the field's annotated type. Without
+        fields the result is a model instance (HGETALL reply); hash fields
+        missing from the mapping take model defaults, unknown ones are
+        ignored. With fields the result is a projection dict (HMGET reply,
+        given as a list in the order of fields, or as a mapping).
+
+        Args:
+            cls: Registered model class
+            mapping: HGETALL reply (str or bytes keys) or HMGET reply list
+            fields: Field names for a projection, None - build the model
+
+        Returns:
+            Model instance, or {field: value} for fields present in the hash
+
+        Raises:
+            RegistrationError: If model is not registered
+            ValueError: If a requested field does not exist
+
+        Example:
+            user = serializer.from_hash_mapping(User, client.hgetall("user:1"))
+            fields = ["name", "settings"]
+            partial = serializer.from_hash_mapping(User, client.hmget("user:1", fields), fields)
+        """
+        plan = self._hash_plan(cls)
+        if isinstance(mapping, list):
+            if fields is None or len(fields) != len(mapping):
+                raise ValueError("HMGET reply requires fields of the same length")
+            values = dict(zip(fields, mapping, strict=True))
+        else:
+            # redis-py возвращает ключи bytes (без decode_responses)
+            values = {
+                key.decode() if isinstance(key, bytes) else key: value
+                for key, value in mapping.items()
+            }
+
+        if fields is not None:
+            types = dict(plan)
+            unknown = [field for field in fields if field not in types]
+            if unknown:
+                raise ValueError(f"{cls.__name__} has no fields {unknown}")
+            return {
+                field: self._decode_field(values[field], types[field])
+                for field in fields
+                if values.get(field) is not None
+            }
+
+        data = {
+            name: self._decode_field(values[name], field_type)
+            for name, field_type in plan
+            if values.get(name) is not None
+        }
+        return self._build_model(cls, data)
+
+    def _decode_field(self, value: bytes | bytearray | memoryview, field_type: Any) -> Any:
+        """Decode one hash field with the field's expected type."""
+        backend = detect_backend(value)
+        return self.unpack(backend.decode(value), field_type)
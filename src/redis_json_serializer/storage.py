@@ -0,0 +1,486 @@
+"""
+Redis storage helpers built on JsonSerializer.
+
+ChunkedStore splits oversized serialized values across several keys so
+that each Redis command stays small and predictable. JsonDocumentStore
+keeps values as RedisJSON documents for partial reads and writes by path.
+"""
+
+import struct
+import zlib
+from typing import Any
+
+import orjson
+
+from .backends import BINARY_MAGIC
+from .jsonpath import resolve_path
+from .serializer import CacheMeta, JsonSerializer
+from .utils import content_digest
+
+# Заголовок манифеста: не может начинать JSON и не совпадает с заголовками бэкендов
+CHUNK_MANIFEST_HEADER = bytes((BINARY_MAGIC, 0x43))
+# Манифест: количество частей, общая длина, CRC32
+_MANIFEST = struct.Struct(">III")
+# Длина заголовка и манифеста - префикс значения, читаемый GETRANGE при перезаписи
+_MANIFEST_SIZE = len(CHUNK_MANIFEST_HEADER) + _MANIFEST.size
+
+DEFAULT_CHUNK_SIZE = 512 * 1024
+
+
+class ChunkedStore:
+    """
+    Key-value store that transparently chunks oversized values.
+
+    Values whose serialized size exceeds chunk_size are split into parts
+    stored under "<key>:chunk:<n>"; the key itself holds a small manifest
+    (part count, total length, CRC32). Reads fetch all parts with one MGET
+    and reassemble them into a single preallocated buffer.
+
+    Parts are written before the manifest. A reader racing with a writer
+    sees a checksum mismatch and gets a miss instead of corrupted data.
+    Every write reads the previous manifest in the same pipeline (GETRANGE
+    of its first bytes); when the new value has fewer parts or is stored
+    inline, the parts left over are deleted with one more DEL.
+
+    set_if_changed() skips the write when the value is unchanged, comparing
+    content digests kept in a small sidecar key "<key>:digest" (set() and
+    set_raw() drop the sidecar). Use it with a canonical serializer
+    (JsonSerializer(canonical=True)) so that equal values serialize to
+    equal bytes.
+
+    With rewrite_migrated, get() writes a value back in the new form when
+    it was upcast from an old model version (see register_migration()),
+    keeping the remaining TTL. The rewrite is not atomic with the read:
+    a concurrent set() of the same key can be overwritten.
+
+    Example:
+        store = ChunkedStore(redis.Redis(), JsonSerializer(namespace="cache:v2:"))
+        store.set("report:42", big_report, ex=3600)
+        report = store.get("report:42")
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        serializer: JsonSerializer | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rewrite_migrated: bool = False,
+    ):
+        """
+        Initialize store.
+
+        Args:
+            client: redis-py compatible client (get/set/mget/delete/pipeline)
+            serializer: Serializer for values (default: JsonSerializer())
+            chunk_size: Max size of a single stored value/part in bytes
+            rewrite_migrated: Write values upcast from old model versions
+                back in the new form on get()
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.serializer = serializer if serializer is not None else JsonSerializer()
+        self.chunk_size = chunk_size
+        self.rewrite_migrated = rewrite_migrated
+
+    @staticmethod
+    def part_key(key: str, index: int) -> str:
+        """Return key of the index-th part of a chunked value."""
+        return f"{key}:chunk:{index}"
+
+    @staticmethod
+    def digest_key(key: str) -> str:
+        """Return key of the content digest stored by set_if_changed()."""
+        return f"{key}:digest"
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ex: int | None = None,
+        soft_ttl: float | None = None,
+        compute_time: float | None = None,
+    ) -> None:
+        """
+        Serialize and store value, chunking it if it exceeds chunk_size.
+
+        Args:
+            key: Redis key
+            value: Python object to store
+            ex: Optional TTL in seconds (applied to manifest and parts)
+            soft_ttl: Soft TTL in seconds recorded with the value (see
+                get_with_meta(); None - serializer's soft_ttl). Usually
+                shorter than ex, so a stale value is still there to serve.
+            compute_time: Seconds it took to compute value
+        """
+        data = self.serializer.dumps(value, soft_ttl, compute_time)
+        self.set_raw(key, data, ex=ex)
+
+    def set_raw(self, key: str, data: bytes, ex: int | None = None) -> None:
+        """
+        Store already serialized value, chunking it if it exceeds chunk_size.
+
+        The content digest of set_if_changed() is deleted in the same
+        pipeline, so the next set_if_changed() of the key always writes.
+
+        Args:
+            key: Redis key
+            data: Serialized bytes (output of JsonSerializer.dumps())
+            ex: Optional TTL in seconds (applied to manifest and parts)
+        """
+        pipe = self.client.pipeline(transaction=False)
+        count = self._queue_set(pipe, key, data, ex)
+        pipe.delete(self.digest_key(key))
+        self._drop_stale_parts(key, pipe.execute()[0], count)
+
+    def set_if_changed(self, key: str, value: Any, ex: int | None = None) -> bool:
+        """
+        Store value unless the stored one has the same content digest.
+
+        An unchanged value costs one round trip (GET of the digest and
+        EXISTS of the value keys) instead of a SET of the whole value (no
+        write traffic or replication of the payload); with ex the TTL of
+        the stored keys is refreshed by EXPIRE. The value is written again
+        if the value key or any of its parts was evicted or expired.
+
+        With a serializer soft_ttl every call writes (the write time is
+        part of the payload), which refreshes the stored soft TTL.
+
+        Args:
+            key: Redis key
+            value: Python object to store
+            ex: Optional TTL in seconds (applied to value, parts and digest)
+
+        Returns:
+            True if the value was written, False if it was unchanged
+        """
+        data = self.serializer.dumps(value)
+        digest = content_digest(data).encode("ascii")
+        digest_key = self.digest_key(key)
+        value_keys = [key, *self._part_keys(key, len(data))]
+
+        # Sidecar может пережить само значение (eviction, истёкший TTL) - проверяем оба
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(digest_key)
+        pipe.exists(*value_keys)
+        stored_digest, existing = pipe.execute()
+
+        if stored_digest == digest and existing == len(value_keys):
+            if ex is not None:
+                # Значение не изменилось - только продлеваем TTL
+                pipe = self.client.pipeline(transaction=False)
+                for name in (*value_keys, digest_key):
+                    pipe.expire(name, ex)
+                pipe.execute()
+            return False
+
+        # Digest пишется после значения - при сбое между командами будет лишняя запись, не пропуск
+        pipe = self.client.pipeline(transaction=False)
+        count = self._queue_set(pipe, key, data, ex)
+        pipe.set(digest_key, digest, ex=ex)
+        self._drop_stale_parts(key, pipe.execute()[0], count)
+        return True
+
+    def _part_keys(self, key: str, total: int) -> list[str]:
+        """Return part keys of a value of the given serialized length (none if not chunked)."""
+        if total <= self.chunk_size:
+            return []
+        count = (total + self.chunk_size - 1) // self.chunk_size
+        return [self.part_key(key, index) for index in range(count)]
+
+    def _queue_set(self, pipe: Any, key: str, data: bytes, ex: int | None) -> int:
+        """
+        Queue commands storing serialized value (chunked if oversized) into pipeline.
+
+        The first queued command reads the prefix of the previous value, so
+        the first pipeline result is passed to _drop_stale_parts().
+
+        Returns:
+            Number of parts of the new value (0 if stored inline)
+        """
+        pipe.getrange(key, 0, _MANIFEST_SIZE - 1)
+        total = len(data)
+        if total <= self.chunk_size:
+            pipe.set(key, data, ex=ex)
+            return 0
+
+        view = memoryview(data)
+        count = (total + self.chunk_size - 1) // self.chunk_size
+        manifest = CHUNK_MANIFEST_HEADER + _MANIFEST.pack(count, total, zlib.crc32(data))
+
+        # Части пишутся до манифеста - читатель не увидит манифест без частей
+        for index in range(count):
+            start = index * self.chunk_size
+            pipe.set(self.part_key(key, index), view[start:start + self.chunk_size].tobytes(), ex=ex)
+        pipe.set(key, manifest, ex=ex)
+        return count
+
+    def _drop_stale_parts(self, key: str, previous: bytes, count: int) -> None:
+        """Delete parts of the previous chunked value beyond the new part count."""
+        if len(previous) != _MANIFEST_SIZE or not previous.startswith(CHUNK_MANIFEST_HEADER):
+            return
+        previous_count = _MANIFEST.unpack_from(previous, len(CHUNK_MANIFEST_HEADER))[0]
+        if previous_count > count:
+            self.client.delete(*(self.part_key(key, index) for index in range(count, previous_count)))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Load and deserialize value.
+
+        Args:
+            key: Redis key
+            default: Returned if key is missing or a chunked value is
+                incomplete/corrupted (pass MISS to tell it from a cached None)
+
+        Returns:
+            Python object, or default
+        """
+        data = self.get_raw(key)
+        if data is None:
+            return default
+        if not self.rewrite_migrated:
+            return self.serializer.loads(data)
+
+        value, migrated = self.serializer.loads_migrated(data)
+        if migrated:
+            self._rewrite(key, value)
+        return value
+
+    def _rewrite(self, key: str, value: Any) -> None:
+        """Store upcast value in the new form, keeping the remaining TTL."""
+        ttl = self.client.ttl(key)
+        if ttl == -2:
+            # Ключ истёк или удалён после чтения
+            return
+        self.set_raw(key, self.serializer.dumps(value), ex=ttl if ttl > 0 else None)
+
+    def get_with_meta(self, key: str, default: Any = None) -> tuple[Any, CacheMeta | None]:
+        """
+        Load value with its soft TTL metadata (stale-while-revalidate).
+
+        Args:
+            key: Redis key
+            default: Returned as value if key is missing
+
+        Returns:
+            (Python object or default, CacheMeta or None if stored without soft TTL)
+        """
+        data = self.get_raw(key)
+        if data is None:
+            return default, None
+        return self.serializer.loads_with_meta(data)
+
+    def get_raw(self, key: str) -> bytes | bytearray | None:
+        """
+        Load serialized value, reassembling chunked values.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Serialized bytes, or None if key is missing or a chunked value
+            is incomplete/corrupted
+
+        Raises:
+            SizeLimitError: If a chunked value exceeds the serializer's max_bytes
+        """
+        raw: bytes | None = self.client.get(key)
+        if raw is None or not raw.startswith(CHUNK_MANIFEST_HEADER):
+            return raw
+
+        count, total, checksum = _MANIFEST.unpack_from(raw, len(CHUNK_MANIFEST_HEADER))
+        # Слишком большое значение отклоняется по манифесту - части не загружаются
+        self.serializer.check_bytes(total)
+        parts = self.client.mget([self.part_key(key, index) for index in range(count)])
+
+        # Один предвыделенный буфер вместо конкатенации частей
+        buffer = bytearray(total)
+        offset = 0
+        for part in parts:
+            if part is None or offset + len(part) > total:
+                return None
+            buffer[offset:offset + len(part)] = part
+            offset += len(part)
+
+        if offset != total or zlib.crc32(buffer) != checksum:
+            return None
+        return buffer
+
+    def delete(self, key: str) -> int:
+        """
+        Delete value, all its parts and its content digest.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Number of deleted keys
+        """
+        raw = self.client.get(key)
+        keys = [key, self.digest_key(key)]
+        if raw is not None and raw.startswith(CHUNK_MANIFEST_HEADER):
+            count = _MANIFEST.unpack_from(raw, len(CHUNK_MANIFEST_HEADER))[0]
+            keys.extend(self.part_key(key, index) for index in range(count))
+        deleted: int = self.client.delete(*keys)
+        return deleted
+
+
+class JsonDocumentStore:
+    """
+    Values stored as RedisJSON documents, readable and writable by path.
+
+    Documents are pack() output written as plain JSON (no namespace
+    wrapper, no plain-JSON flag), so RedisJSON path commands work on them
+    and every marker subtree stays self-contained. Attribute paths on
+    registered models are translated to JSONPath (see jsonpath.py); only
+    the addressed fragment is transferred and decoded with the field's type.
+
+    Example:
+        store = JsonDocumentStore(redis.Redis())
+        store.set("user:42", user)
+        theme = store.get_path("user:42", User, "settings.theme")
+        store.set_path("user:42", User, "settings.theme", "dark")
+    """
+
+    def __init__(self, client: Any, serializer: JsonSerializer | None = None):
+        """
+        Initialize store.
+
+        Args:
+            client: redis-py compatible client with RedisJSON (execute_command/pipeline)
+            serializer: Serializer for values (default: JsonSerializer())
+
+        Raises:
+            ValueError: If serializer uses a binary backend or compact datetimes
+                (list[datetime] arrays are not addressable by element)
+        """
+        self.client = client
+        self.serializer = serializer if serializer is not None else JsonSerializer()
+        if self.serializer.backend.binary:
+            raise ValueError("JsonDocumentStore requires a JSON backend serializer")
+        if self.serializer.compact_datetimes:
+            raise ValueError("JsonDocumentStore does not support compact_datetimes")
+
+    def document(self, value: Any) -> bytes:
+        """
+        Serialize value as a RedisJSON document (JSON text of pack() output).
+
+        Args:
+            value: Python object
+
+        Returns:
+            JSON bytes for JSON.SET
+        """
+        packed = self.serializer.pack(value, keyed_dicts=True)
+        if self.serializer.canonical:
+            return self.serializer.backend.encode(packed, canonical=True)
+        return self.serializer.backend.encode(packed)
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        """
+        Store value as a document.
+
+        Args:
+            key: Redis key
+            value: Python object to store
+            ex: Optional TTL in seconds
+        """
+        pipe = self.client.pipeline(transaction=False)
+        pipe.execute_command("JSON.SET", key, "$", self.document(value))
+        if ex is not None:
+            pipe.expire(key, ex)
+        pipe.execute()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Load and decode the whole document.
+
+        Args:
+            key: Redis key
+            default: Returned if key is missing (pass MISS to tell it from a cached None)
+
+        Returns:
+            Python object, or default
+        """
+        found, fragment = self._get_fragment(key, "$")
+        return self.serializer.unpack(fragment) if found else default
+
+    def get_path(self, key: str, model: type[Any], path: str, default: Any = None) -> Any:
+        """
+        Load and decode one field of a stored model by attribute path.
+
+        Args:
+            key: Redis key of a document holding a model instance
+            model: Registered model class of the document
+            path: Attribute path, e.g. "settings.theme" or "orders[0].total"
+            default: Returned if the key or the path is missing
+
+        Returns:
+            Field value decoded with the field's annotated type
+
+        Raises:
+            RegistrationError: If model is not registered
+            ValueError: If path does not match the model fields
+        """
+        jsonpath, expected_type = resolve_path(model, path)
+        found, fragment = self._get_fragment(key, jsonpath)
+        if not found:
+            return default
+        return self.serializer.unpack(fragment, expected_type)
+
+    def set_path(self, key: str, model: type[Any], path: str, value: Any) -> bool:
+        """
+        Overwrite one field of a stored model by attribute path.
+
+        Args:
+            key: Redis key of a document holding a model instance
+            model: Registered model class of the document
+            path: Attribute path, e.g. "settings.theme"
+            value: New field value (packed with type markers)
+
+        Returns:
+            True if the field was written, False if the key or the parent
+            of the path is missing
+
+        Raises:
+            RegistrationError: If model is not registered
+            ValueError: If path is empty or does not match the model fields
+        """
+        if not path:
+            raise ValueError("Use set() to replace the whole document")
+        jsonpath, _ = resolve_path(model, path)
+        try:
+            reply = self.client.execute_command("JSON.SET", key, jsonpath, self.document(value))
+        except Exception as exc:
+            # Ключа нет: RedisJSON создаёт документы только по корневому пути
+            if "created at the root" in str(exc):
+                return False
+            raise
+        return reply is not None
+
+    def delete(self, key: str) -> int:
+        """
+        Delete document.
+
+        Args:
+            key: Redis key
+
+        Returns:
+            Number of deleted keys
+        """
+        deleted: int = self.client.delete(key)
+        return deleted
+
+    def _get_fragment(self, key: str, jsonpath: str) -> tuple[bool, Any]:
+        """Fetch value at JSONPath, return (found, packed fragment)."""
+        raw = self.client.execute_command("JSON.GET", key, jsonpath)
+        if raw is None:
+            return False, None
+        # $-пути возвращают JSON-массив совпадений
+        matches = orjson.loads(raw)
+        if not matches:
+            return False, None
+        return True, matches[0]
@@ -0,0 +1,398 @@
+"""
+In-process stand-ins for Redis, for tests and local development.
+
+InMemoryRedis implements the subset of the redis-py client API used by
+this package (strings with TTL, MGET/MSET, hashes, pipelines) on plain
+dicts, and the RedisJSON path commands (JSON.GET/JSON.SET/JSON.DEL via
+execute_command()) for the JSONPath subset produced by jsonpath.py.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+
+# Шаг JSONPath: .name, [index], ["key"] / ['key']
+_JSON_PATH_STEP = re.compile(
+    r"""\.(?P<name>[A-Za-z_][A-Za-z0-9_]*)|\[(?P<index>-?\d+)\]|\[(?P<key>"(?:[^"\\]|\\.)*"|'[^']*')\]"""
+)
+
+
+class ResponseError(Exception):
+    """Error reply of a command (same role as redis.ResponseError)."""
+
+
+class _JsonDocument:
+    """RedisJSON value stored under a key (not readable with GET)."""
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: Any) -> None:
+        self.root = root
+
+
+def _parse_json_path(path: str) -> list[str | int]:
+    """Parse JSONPath subset ($, .name, [index], ["key"]) into steps."""
+    if not path.startswith("$"):
+        raise ResponseError(f"ERR unsupported path '{path}' (only $-paths)")
+    steps: list[str | int] = []
+    position = 1
+    while position < len(path):
+        match = _JSON_PATH_STEP.match(path, position)
+        if match is None:
+            raise ResponseError(f"ERR invalid path '{path}'")
+        position = match.end()
+        if match["name"] is not None:
+            steps.append(match["name"])
+        elif match["index"] is not None:
+            steps.append(int(match["index"]))
+        elif match["key"].startswith('"'):
+            steps.append(orjson.loads(match["key"]))
+        else:
+            steps.append(match["key"][1:-1])
+    return steps
+
+
+def _walk(root: Any, steps: list[str | int]) -> tuple[bool, Any]:
+    """Follow path steps, return (found, value)."""
+    current = root
+    for step in steps:
+        if isinstance(step, int) and isinstance(current, list):
+            if not -len(current) <= step < len(current):
+                return False, None
+        elif not (isinstance(step, str) and isinstance(current, dict) and step in current):
+            return False, None
+        current = current[step]
+    return True, current
+
+
+class InMemoryRedis:
+    """
+    Minimal in-memory Redis client (redis-py compatible subset).
+
+    Values are stored as bytes; str values are encoded as UTF-8 like
+    redis-py does. Expired keys are removed lazily on access.
+
+    Example:
+        client = InMemoryRedis()
+        client.set("key", b"value", ex=60)
+        client.get("key")  # b"value"
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty storage."""
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+        # Счётчик выполненных команд (для проверки количества round trip в тестах)
+        self.commands: list[str] = []
+
+    # ========== Internal helpers ==========
+
+    def _json_document(self, name: str) -> _JsonDocument | None:
+        if not self._alive(name):
+            return None
+        document = self._data[name]
+        if not isinstance(document, _JsonDocument):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return document
+
+    def _alive(self, name: str) -> bool:
+        expires_at = self._expires.get(name)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return name in self._data
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        # redis-py приводит числа к строке
+        return str(value).encode("utf-8")
+
+    # ========== String commands ==========
+
+    def get(self, name: str) -> bytes | None:
+        """Get value of key (None if missing)."""
+        self.commands.append("GET")
+        if not self._alive(name):
+            return None
+        value = self._data[name]
+        if not isinstance(value, bytes):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def set(self, name: str, value: Any, ex: int | None = None, px: int | None = None) -> bool:
+        """Set value of key with optional TTL in seconds (ex) or milliseconds (px)."""
+        self.commands.append("SET")
+        self._data[name] = self._encode(value)
+        self._expires.pop(name, None)
+        if ex is not None:
+            self._expires[name] = time.monotonic() + ex
+        elif px is not None:
+            self._expires[name] = time.monotonic() + px / 1000
+        return True
+
+    def getrange(self, name: str, start: int, end: int) -> bytes:
+        """Get substring of value from start to end inclusive (empty if missing)."""
+        self.commands.append("GETRANGE")
+        if not self._alive(name):
+            return b""
+        value = self._data[name]
+        if not isinstance(value, bytes):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        # Как в Redis: end включительно, -1 - до конца значения
+        return value[start:len(value) + end + 1 if end < 0 else end + 1]
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        """Get values of multiple keys in one command."""
+        self.commands.append("MGET")
+        values: list[bytes | None] = []
+        for name in keys:
+            value = self._data[name] if self._alive(name) else None
+            # MGET возвращает nil для ключей другого типа
+            values.append(value if isinstance(value, bytes) else None)
+        return values
+
+    def mset(self, mapping: dict[str, Any]) -> bool:
+        """Set multiple keys in one command."""
+        self.commands.append("MSET")
+        for name, value in mapping.items():
+            self._data[name] = self._encode(value)
+            self._expires.pop(name, None)
+        return True
+
+    def delete(self, *names: str) -> int:
+        """Delete keys, return number of deleted keys."""
+        self.commands.append("DEL")
+        deleted = 0
+        for name in names:
+            if self._alive(name):
+                del self._data[name]
+                self._expires.pop(name, None)
+                deleted += 1
+        return deleted
+
+    def exists(self, *names: str) -> int:
+        """Return number of existing keys."""
+        self.commands.append("EXISTS")
+        return sum(1 for name in names if self._alive(name))
+
+    def expire(self, name: str, time_seconds: int) -> bool:
+        """Set TTL of key in seconds."""
+        self.commands.append("EXPIRE")
+        if not self._alive(name):
+            return False
+        self._expires[name] = time.monotonic() + time_seconds
+        return True
+
+    def ttl(self, name: str) -> int:
+        """Return TTL of key in seconds (-1 without TTL, -2 if missing)."""
+        self.commands.append("TTL")
+        if not self._alive(name):
+            return -2
+        expires_at = self._expires.get(name)
+        if expires_at is None:
+            return -1
+        return max(0, round(expires_at - time.monotonic()))
+
+    def flushall(self) -> bool:
+        """Delete all keys."""
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    # ========== Hash commands ==========
+
+    def _hash(self, name: str) -> dict[bytes, bytes] | None:
+        if not self._alive(name):
+            return None
+        value = self._data[name]
+        if not isinstance(value, dict):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def hset(
+        self,
+        name: str,
+        key: str | None = None,
+        value: Any = None,
+        mapping: dict[str, Any] | None = None,
+    ) -> int:
+        """Set hash fields (key/value and/or mapping), return number of new fields."""
+        self.commands.append("HSET")
+        fields = dict(mapping or {})
+        if key is not None:
+            fields[key] = value
+        if not fields:
+            raise ResponseError("ERR wrong number of arguments for 'hset' command")
+
+        hash_value = self._hash(name)
+        if hash_value is None:
+            hash_value = self._data[name] = {}
+        added = 0
+        for field, field_value in fields.items():
+            field_key = self._encode(field)
+            added += field_key not in hash_value
+            hash_value[field_key] = self._encode(field_value)
+        return added
+
+    def hget(self, name: str, key: str) -> bytes | None:
+        """Get value of hash field (None if missing)."""
+        self.commands.append("HGET")
+        hash_value = self._hash(name)
+        return None if hash_value is None else hash_value.get(self._encode(key))
+
+    def hmget(self, name: str, keys: list[str]) -> list[bytes | None]:
+        """Get values of multiple hash fields in one command."""
+        self.commands.append("HMGET")
+        hash_value = self._hash(name) or {}
+        return [hash_value.get(self._encode(key)) for key in keys]
+
+    def hgetall(self, name: str) -> dict[bytes, bytes]:
+        """Get all fields and values of hash."""
+        self.commands.append("HGETALL")
+        return dict(self._hash(name) or {})
+
+    def hdel(self, name: str, *keys: str) -> int:
+        """Delete hash fields, return number of deleted fields."""
+        self.commands.append("HDEL")
+        hash_value = self._hash(name)
+        if hash_value is None:
+            return 0
+        deleted = 0
+        for key in keys:
+            if hash_value.pop(self._encode(key), None) is not None:
+                deleted += 1
+        if not hash_value:
+            # Пустой hash удаляется, как в Redis
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return deleted
+
+    # ========== RedisJSON ==========
+
+    def execute_command(self, *args: Any) -> Any:
+        """
+        Execute a raw command (RedisJSON JSON.GET/JSON.SET/JSON.DEL).
+
+        Raises:
+            ResponseError: If command or path is not supported
+        """
+        command = str(args[0]).upper()
+        handlers: dict[str, Callable[..., Any]] = {
+            "JSON.GET": self._json_get,
+            "JSON.SET": self._json_set,
+            "JSON.DEL": self._json_del,
+        }
+        handler = handlers.get(command)
+        if handler is None:
+            raise ResponseError(f"ERR unknown command '{args[0]}'")
+        self.commands.append(command)
+        return handler(*args[1:])
+
+    def _json_get(self, name: str, path: str = "$") -> bytes | None:
+        """JSON.GET: JSON array of values matching the path (None if key is missing)."""
+        document = self._json_document(name)
+        if document is None:
+            return None
+        found, value = _walk(document.root, _parse_json_path(path))
+        return orjson.dumps([value] if found else [])
+
+    def _json_set(self, name: str, path: str, value: Any, *flags: str) -> bytes | None:
+        """JSON.SET: set value at path (new keys only at root), NX/XX flags."""
+        steps = _parse_json_path(path)
+        parsed = orjson.loads(value)
+        document = self._json_document(name)
+
+        if not steps:
+            if ("NX" in flags and document is not None) or ("XX" in flags and document is None):
+                return None
+            if document is None:
+                self._data[name] = _JsonDocument(parsed)
+            else:
+                # Как и RedisJSON, перезапись документа сохраняет TTL
+                document.root = parsed
+            return b"OK"
+
+        if document is None:
+            raise ResponseError("ERR new objects must be created at the root")
+        found, parent = _walk(document.root, steps[:-1])
+        last = steps[-1]
+        if not found:
+            return None
+        if isinstance(parent, dict) and isinstance(last, str):
+            exists = last in parent
+        elif isinstance(parent, list) and isinstance(last, int):
+            exists = -len(parent) <= last < len(parent)
+            if not exists:
+                return None
+        else:
+            return None
+        if ("NX" in flags and exists) or ("XX" in flags and not exists):
+            return None
+        parent[last] = parsed
+        return b"OK"
+
+    def _json_del(self, name: str, path: str = "$") -> int:
+        """JSON.DEL: delete value at path, return number of deleted values."""
+        document = self._json_document(name)
+        if document is None:
+            return 0
+        steps = _parse_json_path(path)
+        if not steps:
+            del self._data[name]
+            self._expires.pop(name, None)
+            return 1
+        found, parent = _walk(document.root, steps[:-1])
+        found_value, _ = _walk(document.root, steps)
+        if not (found and found_value):
+            return 0
+        del parent[steps[-1]]
+        return 1
+
+    # ========== Pipelines ==========
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        """Create pipeline buffering commands until execute()."""
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    """Pipeline for InMemoryRedis: buffers commands and runs them on execute()."""
+
+    def __init__(self, client: InMemoryRedis) -> None:
+        """
+        Initialize pipeline.
+
+        Args:
+            client: Client to execute buffered commands on
+        """
+        self._client = client
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        # Любой метод клиента буферизуется; выполнение - в execute()
+        if not callable(getattr(self._client, name, None)) or name.startswith("_"):
+            raise AttributeError(name)
+
+        def buffered(*args: Any, **kwargs: Any) -> "InMemoryPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return buffered
+
+    def execute(self) -> list[Any]:
+        """Execute buffered commands, return their results."""
+        commands, self._commands = self._commands, []
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    def __enter__(self) -> "InMemoryPipeline":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._commands = []
@@ -21,6 +21,25 @@ if sys.version_info >= (3, 11):
         DECIMAL = "b0648f86-d983-424a-8743-9828c2ff9f6b"
         OBJECT_ID = "c5c64f69-2a90-4c7b-914a-1a0e8d0e5f2a"
         TUPLE = "d7e4f5a6-3b7c-4d8e-9f0a-1b2c3d4e5f6a"
+        DATETIME_TS = "45b056f5-4b81-40ee-ab80-530521deefae"
+        DATETIME_ARRAY = "b336e8bf-b607-4295-af5f-784bfb3769b9"
+        DATE_ORDINAL = "358e2a69-e7d6-48bb-b26c-2d88c3a8b3c1"
+        NDARRAY = "5ddfac91-0604-44dc-8b79-0a71f5e70bc8"
+        BYTES = "c962ac71-c694-4d7d-a086-daa5191bb4e6"
+        UUID = "48f9ab4d-186a-4561-b3c8-6f200c8c7576"
+        ENUM = "53cef28b-99ff-4e59-8337-6ee9680b749e"
+        TIMEDELTA = "6ccb7c0b-0bd0-4ee1-84f7-4e8df327fc2b"
+        TIME = "0b4979bb-24a6-4f71-b087-3d1f69fb182a"
+        IP_ADDRESS = "13fff771-80fa-41e6-9640-91296445be00"
+        IP_NETWORK = "a36c1baa-68c2-4ec2-85e7-f28486db67c8"
+        IP_INTERFACE = "2a6c985c-6fa3-43a1-932e-4cc6c356cc1c"
+        PATH = "63910ffe-dc05-449c-8bbd-818f2d7c6c5a"
+        FROZENSET = "e372d4fa-baf3-419b-911f-5a71f4dd7fc0"
+        DEQUE = "95584d9c-08b8-4c1e-b90a-adbf89ab56a0"
+        ORDERED_DICT = "e5ea0bc1-0e11-4cb4-bc2d-2ad265aa2577"
+        DEFAULT_DICT = "30e579b8-7e2f-4edf-9143-ff1b365a6637"
+        NAMEDTUPLE = "1fa4f2e4-5842-4436-bb61-9791f95606d7"
+        KEYED_DICT = "90d14364-42c2-4e5d-8777-53d28bf398b4"
 else:
     # Fallback для Python 3.10
     class Marks(str, Enum):
@@ -33,6 +52,25 @@ else:
         DECIMAL = "b0648f86-d983-424a-8743-9828c2ff9f6b"
         OBJECT_ID = "c5c64f69-2a90-4c7b-914a-1a0e8d0e5f2a"
         TUPLE = "d7e4f5a6-3b7c-4d8e-9f0a-1b2c3d4e5f6a"
+        DATETIME_TS = "45b056f5-4b81-40ee-ab80-530521deefae"
+        DATETIME_ARRAY = "b336e8bf-b607-4295-af5f-784bfb3769b9"
+        DATE_ORDINAL = "358e2a69-e7d6-48bb-b26c-2d88c3a8b3c1"
+        NDARRAY = "5ddfac91-0604-44dc-8b79-0a71f5e70bc8"
+        BYTES = "c962ac71-c694-4d7d-a086-daa5191bb4e6"
+        UUID = "48f9ab4d-186a-4561-b3c8-6f200c8c7576"
+        ENUM = "53cef28b-99ff-4e59-8337-6ee9680b749e"
+        TIMEDELTA = "6ccb7c0b-0bd0-4ee1-84f7-4e8df327fc2b"
+        TIME = "0b4979bb-24a6-4f71-b087-3d1f69fb182a"
+        IP_ADDRESS = "13fff771-80fa-41e6-9640-91296445be00"
+        IP_NETWORK = "a36c1baa-68c2-4ec2-85e7-f28486db67c8"
+        IP_INTERFACE = "2a6c985c-6fa3-43a1-932e-4cc6c356cc1c"
+        PATH = "63910ffe-dc05-449c-8bbd-818f2d7c6c5a"
+        FROZENSET = "e372d4fa-baf3-419b-911f-5a71f4dd7fc0"
+        DEQUE = "95584d9c-08b8-4c1e-b90a-adbf89ab56a0"
+        ORDERED_DICT = "e5ea0bc1-0e11-4cb4-bc2d-2ad265aa2577"
+        DEFAULT_DICT = "30e579b8-7e2f-4edf-9143-ff1b365a6637"
+        NAMEDTUPLE = "1fa4f2e4-5842-4436-bb61-9791f95606d7"
+        KEYED_DICT = "90d14364-42c2-4e5d-8777-53d28bf398b4"
 
         def __str__(self) -> str:
             return self.value
@@ -41,3 +79,8 @@ else:
 # Константы для namespace-обёртки
 NS_KEY = "$ns"
 DATA_KEY = "$data"
+
+# Метаданные stale-while-revalidate в той же обёртке (миллисекунды)
+WRITTEN_AT_KEY = "$at"
+SOFT_TTL_KEY = "$ttl"
+COMPUTE_TIME_KEY = "$cost"
@@ -1,9 +1,60 @@
 """
-Utility functions for cache key generation.
+Utility functions for cache key generation and canonical output.
 """
 
+import base64
 import hashlib
-from typing import Any
+import inspect
+import math
+import re
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .serializer import JsonSerializer
+
+# Размер content digest в байтах (128 бит - вероятность коллизии пренебрежимо мала)
+DIGEST_SIZE = 16
+
+# Компактные ключи: длина токена функции и digest аргументов (символы base64url, 6 бит каждый)
+DEFAULT_TOKEN_LENGTH = 6
+DEFAULT_KEY_DIGEST_LENGTH = 16
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_.\-]+")
+
+# Атрибут класса с именем (или кортежем имён) атрибутов, задающих идентичность экземпляра в ключе
+CACHE_IDENTITY_ATTRIBUTE = "__cache_identity__"
+
+# Имена первого параметра, по которым функция распознаётся как метод
+_RECEIVER_PARAMETERS = frozenset({"self", "cls"})
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+# Явно заданные токены функций: {module.qualname: token} и обратный индекс для проверки коллизий
+KEY_TOKENS: dict[str, str] = {}
+_TOKEN_OWNERS: dict[str, str] = {}
+# Производные токены: {(module.qualname, длина): token} - не зависят от порядка вызовов
+_DERIVED_TOKENS: dict[tuple[str, int], str] = {}
+
+# Типы с полным порядком, не зависящим от хэшей: однотипные значения сортируются напрямую
+_TOTALLY_ORDERED = frozenset({str, int, bool, bytes})
+
+
+def _args_repr(args: tuple[Any, ...], kwargs: dict[str, Any]) -> bytes:
+    """Stable byte representation of call arguments."""
+    # Сохраняем порядок позиционных аргументов (не сортировать!)
+    args_repr = repr(args).encode("utf-8")
+    # Сортируем только kwargs для детерминированности
+    kwargs_repr = repr(tuple(sorted(kwargs.items()))).encode("utf-8")
+    return args_repr + kwargs_repr
+
+
+def _function_identity(func: Any) -> str:
+    """module.qualname of a function."""
+    # Использовать module.qualname вместо str(func) для стабильности
+    module = getattr(func, "__module__", "")
+    qualname = getattr(func, "__qualname__", getattr(func, "__name__", ""))
+    return f"{module}.{qualname}"
 
 
 def hash_args(*args: Any, **kwargs: Any) -> str:
@@ -19,12 +70,269 @@ def hash_args(*args: Any, **kwargs: Any) -> str:
     Returns:
         SHA1 hash hexdigest
     """
-    # Сохраняем порядок позиционных аргументов (не сортировать!)
-    args_repr = repr(args).encode("utf-8")
-    # Сортируем только kwargs для детерминированности
-    kwargs_repr = repr(tuple(sorted(kwargs.items()))).encode("utf-8")
     # SHA1 используется для хеширования ключей кеша, не для криптографии
-    return hashlib.sha1(args_repr + kwargs_repr, usedforsecurity=False).hexdigest()  # noqa: S324
+    return hashlib.sha1(_args_repr(args, kwargs), usedforsecurity=False).hexdigest()  # noqa: S324
+
+
+def _base64url_digest(data: bytes, length: int) -> str:
+    """First length characters of base64url(BLAKE2b(data)) without padding."""
+    digest = hashlib.blake2b(data, digest_size=math.ceil(length * 6 / 8)).digest()
+    return base64.urlsafe_b64encode(digest).decode("ascii")[:length]
+
+
+def configure_key_token(func: Callable[..., Any] | str, token: str) -> None:
+    """
+    Set an explicit short token for a function in compact cache keys.
+
+    Explicit tokens keep keys stable when a function is moved or renamed
+    (configure the old token for the new location).
+
+    Args:
+        func: Function or its "module.qualname"
+        token: Short token (letters, digits, "_", "-", ".")
+
+    Raises:
+        ValueError: If token has invalid characters or is used by another function
+    """
+    identity = func if isinstance(func, str) else _function_identity(func)
+    if not _TOKEN_PATTERN.fullmatch(token):
+        raise ValueError(f"Invalid key token '{token}': use letters, digits, '_', '-', '.'")
+    _claim_token(identity, token)
+
+
+def _claim_token(identity: str, token: str) -> None:
+    """Assign token to function identity, rejecting collisions with other functions."""
+    owner = _TOKEN_OWNERS.get(token)
+    if owner is not None and owner != identity:
+        raise ValueError(f"Key token '{token}' of {identity} is already used by {owner}")
+    previous = KEY_TOKENS.get(identity)
+    if previous is not None and previous != token:
+        del _TOKEN_OWNERS[previous]
+    KEY_TOKENS[identity] = token
+    _TOKEN_OWNERS[token] = identity
+
+
+def function_token(func: Any, length: int = DEFAULT_TOKEN_LENGTH) -> str:
+    """
+    Short stable token of a function for compact cache keys.
+
+    Explicitly configured token, or base64url of BLAKE2b("module.qualname")
+    truncated to length characters. Derived tokens are cached per length
+    (the same function gets the same token for a given length whatever
+    was built before) and checked for collisions between functions.
+
+    Args:
+        func: Function
+        length: Length of a derived token
+
+    Returns:
+        Token string
+
+    Raises:
+        ValueError: If a derived token collides with another function's token
+    """
+    identity = _function_identity(func)
+    token = KEY_TOKENS.get(identity)
+    if token is not None:
+        return token
+
+    token = _DERIVED_TOKENS.get((identity, length))
+    if token is None:
+        token = _base64url_digest(identity.encode("utf-8"), length)
+        owner = _TOKEN_OWNERS.setdefault(token, identity)
+        if owner != identity:
+            raise ValueError(f"Key token '{token}' of {identity} is already used by {owner}")
+        _DERIVED_TOKENS[(identity, length)] = token
+    return token
+
+
+def make_compact_key_builder(
+    digest_length: int = DEFAULT_KEY_DIGEST_LENGTH,
+    token_length: int = DEFAULT_TOKEN_LENGTH,
+) -> Callable[..., str]:
+    """
+    Create a compact cache key builder: "<function token>:<base64url args digest>".
+
+    Keys are stable across processes and restarts (no hash seeds or memory
+    addresses). Use collision_probability() to choose digest_length for
+    the expected number of keys per function.
+
+    Args:
+        digest_length: Characters of the arguments digest (6 bits each)
+        token_length: Characters of derived function tokens
+
+    Returns:
+        Key builder with the default_key_builder(func, *args, **kwargs) signature
+
+    Raises:
+        ValueError: If a length is not positive
+
+    Example:
+        key_builder = make_compact_key_builder(digest_length=12)
+        key_builder(get_profile, 42)  # "kqM3Xz:9dTq0f3sWc1L"
+    """
+    if digest_length <= 0 or token_length <= 0:
+        raise ValueError("digest_length and token_length must be positive")
+
+    def compact_key_builder(func: Any, *args: Any, **kwargs: Any) -> str:
+        token = function_token(func, token_length)
+        return f"{token}:{_base64url_digest(_args_repr(args, kwargs), digest_length)}"
+
+    return compact_key_builder
+
+
+@lru_cache(maxsize=1024)
+def _call_signature(func: Callable[..., Any]) -> tuple[inspect.Signature, str | None]:
+    """Cached signature of a function and the name of its self/cls parameter (None - not a method)."""
+    signature = inspect.signature(func)
+    first = next(iter(signature.parameters.values()), None)
+    if (
+        first is not None
+        and first.name in _RECEIVER_PARAMETERS
+        and first.kind in _POSITIONAL_KINDS
+        and "." in getattr(func, "__qualname__", "")
+    ):
+        return signature, first.name
+    return signature, None
+
+
+def normalized_arguments(
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    ignore: frozenset[str] = frozenset(),
+) -> dict[str, Any]:
+    """
+    Bind call arguments to parameter names, with defaults applied.
+
+    Positional and keyword calls of the same arguments give equal results
+    (f(1), f(x=1) and f(1, y=2) with default y=2). For methods the
+    instance is replaced by the values of the attributes named in the
+    class's __cache_identity__ ("id" or ("tenant", "id")), or dropped if
+    the class declares none; cls is replaced by the class's
+    "module.qualname".
+
+    Args:
+        func: Called function (plain function or bound method)
+        args: Positional arguments (including self for plain functions of methods)
+        kwargs: Keyword arguments
+        ignore: Parameter names left out (sessions, clients, ...)
+
+    Returns:
+        {parameter name: value} in signature order
+
+    Raises:
+        TypeError: If arguments do not match the signature
+    """
+    if inspect.ismethod(func):
+        args = (func.__self__, *args)
+        func = func.__func__
+
+    signature, receiver = _call_signature(func)
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = bound.arguments
+
+    if receiver is not None:
+        instance = arguments.pop(receiver)
+        if receiver == "cls":
+            arguments[receiver] = _function_identity(instance)
+        else:
+            names = getattr(type(instance), CACHE_IDENTITY_ATTRIBUTE, None)
+            if isinstance(names, str):
+                arguments[receiver] = getattr(instance, names)
+            elif names is not None:
+                arguments[receiver] = tuple(getattr(instance, name) for name in names)
+
+    for name in ignore:
+        arguments.pop(name, None)
+    return dict(arguments)
+
+
+def make_method_key_builder(
+    serializer: "JsonSerializer | None" = None,
+    ignore: Iterable[str] = (),
+    digest_length: int | None = None,
+    token_length: int = DEFAULT_TOKEN_LENGTH,
+) -> Callable[..., str]:
+    """
+    Create a key builder that understands methods and normalizes arguments.
+
+    default_key_builder hashes repr(self) of methods, which usually holds
+    a memory address: every instance and process gets its own keys. This
+    builder binds arguments to the (cached) signature, drops self or keeps
+    only its declared identity (see normalized_arguments()) and hashes the
+    canonical serializer form of the arguments, so equal calls give equal
+    keys across instances, processes and call styles.
+
+    Args:
+        serializer: Canonical serializer for the arguments (default:
+            JsonSerializer(canonical=True)); arguments must be types it can pack
+        ignore: Parameter names left out of the key
+        digest_length: None - "module.qualname:<32 hex digest>"; a number -
+            compact "<function token>:<base64url digest>" of that length
+        token_length: Characters of derived function tokens (compact keys)
+
+    Returns:
+        Key builder with the default_key_builder(func, *args, **kwargs) signature
+
+    Raises:
+        ValueError: If serializer is not canonical or a length is not positive
+
+    Example:
+        class UserService:
+            __cache_identity__ = "tenant"
+
+            @cached(key_builder=make_method_key_builder(ignore=["session"]))
+            async def get_profile(self, user_id: int, session=None, full: bool = False):
+                ...
+    """
+    if serializer is None:
+        from .serializer import JsonSerializer
+
+        serializer = JsonSerializer(canonical=True)
+    elif not serializer.canonical:
+        raise ValueError("make_method_key_builder() requires JsonSerializer(canonical=True)")
+    if (digest_length is not None and digest_length <= 0) or token_length <= 0:
+        raise ValueError("digest_length and token_length must be positive")
+
+    ignored = frozenset(ignore)
+    digest = serializer.digest
+
+    def method_key_builder(func: Any, *args: Any, **kwargs: Any) -> str:
+        arguments = normalized_arguments(func, args, kwargs, ignored)
+        function = func.__func__ if inspect.ismethod(func) else func
+        if digest_length is None:
+            return f"{_function_identity(function)}:{digest(arguments)}"
+        compact = _base64url_digest(bytes.fromhex(digest(arguments)), digest_length)
+        return f"{function_token(function, token_length)}:{compact}"
+
+    return method_key_builder
+
+
+def collision_probability(count: int, length: int, bits_per_char: int = 6) -> float:
+    """
+    Estimate probability of at least one collision among count random keys.
+
+    Birthday bound 1 - exp(-n(n-1) / 2^(bits+1)) for keys of length
+    characters (6 bits per base64url character, 4 per hex character).
+    Applies to argument digests per function and to derived function tokens.
+
+    Args:
+        count: Number of distinct keys (or functions for tokens)
+        length: Key digest (or token) length in characters
+        bits_per_char: Bits per character of the encoding
+
+    Returns:
+        Collision probability in [0, 1]
+
+    Example:
+        collision_probability(50_000_000, 16)  # ~1.6e-14
+    """
+    if count < 2:
+        return 0.0
+    space = 2.0 ** (length * bits_per_char)
+    return -math.expm1(-count * (count - 1) / (2 * space))
 
 
 def default_key_builder(func: Any, *args: Any, **kwargs: Any) -> str:
@@ -41,9 +349,48 @@ def default_key_builder(func: Any, *args: Any, **kwargs: Any) -> str:
     Returns:
         Cache key string
     """
-    # Использовать module.qualname вместо str(func) для стабильности
-    module = getattr(func, "__module__", "")
-    qualname = getattr(func, "__qualname__", getattr(func, "__name__", ""))
-    func_key = f"{module}.{qualname}"
+    func_key = _function_identity(func)
     args_hash = hash_args(*args, **kwargs)
     return f"{func_key}:{args_hash}"
+
+
+def canonical_sorted(
+    values: Iterable[Any], encode: Callable[[Any], bytes] | None = None
+) -> list[Any]:
+    """
+    Sort values into a deterministic order (set members, map keys).
+
+    Values of one totally ordered type (all str, all int, ...) are sorted
+    naturally. Any other mix is ordered by encode(value) - canonical
+    serialized bytes - because sorted() silently keeps input order for
+    partially ordered values (sets of frozensets) and repr() of containers
+    depends on PYTHONHASHSEED.
+
+    Args:
+        values: Values to order
+        encode: Canonical encoding of one value (None - (type name, repr),
+            deterministic for scalars only)
+
+    Returns:
+        Sorted list
+    """
+    items = list(values)
+    item_types = {type(item) for item in items}
+    if len(item_types) <= 1 and item_types <= _TOTALLY_ORDERED:
+        return sorted(items)
+    if encode is None:
+        return sorted(items, key=lambda item: (type(item).__qualname__, repr(item)))
+    return sorted(items, key=encode)
+
+
+def content_digest(data: bytes | bytearray | memoryview) -> str:
+    """
+    Content hash of serialized bytes (BLAKE2b, 128 bit).
+
+    Args:
+        data: Serialized bytes
+
+    Returns:
+        Hex digest (32 characters)
+    """
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
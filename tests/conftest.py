@@ -10,7 +10,13 @@ from typing import Any
 import pytest
 
 from redis_json_serializer import JsonSerializer, ModelRegistry, register_model
-from redis_json_serializer.registry import MODEL_ALIASES, REGISTERED_MODELS
+from redis_json_serializer.registry import (
+    LAZY_MODELS,
+    MIGRATION_PLANS,
+    MIGRATIONS,
+    MODEL_ALIASES,
+    REGISTERED_MODELS,
+)
 
 try:
     from pydantic import BaseModel
@@ -49,12 +55,18 @@ def clear_registry():
     # Clear before test
     REGISTERED_MODELS.clear()
     MODEL_ALIASES.clear()
+    MIGRATIONS.clear()
+    MIGRATION_PLANS.clear()
+    LAZY_MODELS.clear()
 
     yield
 
     # Clear after test
     REGISTERED_MODELS.clear()
     MODEL_ALIASES.clear()
+    MIGRATIONS.clear()
+    MIGRATION_PLANS.clear()
+    LAZY_MODELS.clear()
 
 
 @pytest.fixture
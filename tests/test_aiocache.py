@@ -0,0 +1,124 @@
+"""
+Tests for aiocache integration.
+"""
+
+import asyncio
+import importlib.metadata
+import inspect
+
+import pytest
+
+from redis_json_serializer import MISS
+
+pytest.importorskip("aiocache")
+
+from aiocache import Cache  # noqa: E402
+from aiocache import cached as aiocache_cached  # noqa: E402
+from aiocache.base import BaseCache  # noqa: E402
+from aiocache.serializers import PickleSerializer  # noqa: E402
+
+from redis_json_serializer.aiocache import AiocacheJsonSerializer, cached  # noqa: E402
+
+
+@pytest.fixture
+def serializer():
+    """Create the aiocache serializer adapter."""
+    return AiocacheJsonSerializer()
+
+
+class TestAiocacheJsonSerializer:
+    """Test the aiocache serializer adapter."""
+
+    def test_round_trip(self, serializer, sample_datetime):
+        """Test dumps()/loads() through the adapter."""
+        value = {"at": sample_datetime, "tags": {"a"}}
+        assert serializer.loads(serializer.dumps(value)) == value
+
+    def test_loads_or_miss(self, serializer):
+        """Test that a missing key decodes to MISS, a stored None to None."""
+        assert serializer.loads_or_miss(None) is MISS
+        assert serializer.loads_or_miss(serializer.dumps(None)) is None
+
+
+class TestCachedDecorator:
+    """Test @cached serving cached None results."""
+
+    def test_none_result_is_cached(self, serializer):
+        """Test that a function returning None runs once."""
+        calls = []
+
+        @cached(cache=Cache.MEMORY, serializer=serializer)
+        async def find_user(user_id):
+            calls.append(user_id)
+            return None
+
+        async def run():
+            assert await find_user("u1") is None
+            assert await find_user("u1") is None
+            assert await find_user("u2") is None
+
+        asyncio.run(run())
+        assert calls == ["u1", "u2"]
+
+    def test_values_are_cached(self, serializer, sample_datetime):
+        """Test that regular values are served from cache."""
+        calls = []
+
+        @cached(cache=Cache.MEMORY, serializer=serializer)
+        async def load(key):
+            calls.append(key)
+            return {"key": key, "at": sample_datetime}
+
+        async def run():
+            first = await load("k")
+            assert await load("k") == first == {"key": "k", "at": sample_datetime}
+
+        asyncio.run(run())
+        assert calls == ["k"]
+
+    def test_cache_read_false_recomputes(self, serializer):
+        """Test that cache_read=False bypasses the cached None."""
+        calls = []
+
+        @cached(cache=Cache.MEMORY, serializer=serializer)
+        async def find(key):
+            calls.append(key)
+
+        async def run():
+            await find("k")
+            await find("k", cache_read=False)
+
+        asyncio.run(run())
+        assert calls == ["k", "k"]
+
+    def test_rejects_other_serializers(self):
+        """Test that a non-AiocacheJsonSerializer cache is rejected."""
+        with pytest.raises(TypeError, match="AiocacheJsonSerializer"):
+
+            @cached(cache=Cache.MEMORY, serializer=PickleSerializer())
+            async def find(key):
+                return None
+
+
+class TestSupportedAiocache:
+    """Test the aiocache internals overridden by cached() (pinned range >=0.12.0,<0.13)."""
+
+    def test_installed_version_in_pinned_range(self):
+        """Test that the installed aiocache is within the range pinned in pyproject.toml."""
+        major, minor = (int(part) for part in importlib.metadata.version("aiocache").split(".")[:2])
+        assert (0, 12) <= (major, minor) < (0, 13)
+
+    def test_overridden_internals(self):
+        """Test signatures of the aiocache internals cached() overrides or calls."""
+
+        def parameters(func):
+            return list(inspect.signature(func).parameters)
+
+        assert parameters(aiocache_cached.decorator) == [
+            "self", "f", "args", "cache_read", "cache_write", "aiocache_wait_for_write", "kwargs",
+        ]
+        assert parameters(aiocache_cached.get_from_cache) == ["self", "key"]
+        assert parameters(aiocache_cached.get_cache_key) == ["self", "f", "args", "kwargs"]
+        assert parameters(aiocache_cached.set_in_cache) == ["self", "key", "value"]
+        assert "loads_fn" in parameters(BaseCache.get)
+        assert aiocache_cached(cache=Cache.MEMORY).skip_cache_func(None) is False
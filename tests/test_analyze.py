@@ -0,0 +1,170 @@
+"""
+Tests for the payload size analyzer CLI.
+"""
+
+import datetime
+import io
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from redis_json_serializer import JsonSerializer, register_model
+from redis_json_serializer.__main__ import main as cli_main
+from redis_json_serializer.analyze import PayloadAnalyzer, analyze, main, read_payloads
+
+
+@dataclass
+class Order:
+    id: int
+    total: Decimal
+    at: datetime.datetime
+
+
+@pytest.fixture(autouse=True)
+def models(clear_registry):
+    """Register payload models (after the registry is cleared)."""
+    register_model("order.v1")(Order)
+
+
+@pytest.fixture
+def orders():
+    """List of model records with marker fields."""
+    return [Order(i, Decimal("1.50"), datetime.datetime(2024, 1, 1)) for i in range(10)]
+
+
+class TestPayloadAnalyzer:
+    """Test byte attribution."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"a": 1, "b": [True, None, "xé"], "c": {}},
+            [],
+            "text",
+            {"nested": [[1.5, -2], {"k": False}]},
+        ],
+    )
+    def test_sizes_match_compact_json(self, serializer, value):
+        """Test that measured container sizes equal orjson output size."""
+        data = orjson.loads(serializer.dumps(value))
+        sizes = PayloadAnalyzer()._walk(data)
+
+        if isinstance(data, (dict, list)):
+            assert sizes[id(data)] == len(orjson.dumps(data))
+
+    def test_markers_and_models(self, serializer, orders):
+        """Test breakdown by marker type, model alias and field name."""
+        payload = serializer.dumps(orders)
+        report = analyze([payload])
+
+        assert report["payloads"] == 1
+        assert report["bytes"] == len(payload)
+        assert report["markers"]["MODEL"]["count"] == 10
+        assert report["markers"]["DECIMAL"]["count"] == 10
+        assert report["markers"]["DATETIME"]["count"] == 10
+        assert report["models"]["order.v1"]["count"] == 10
+        assert report["fields"]["total"]["count"] == 10
+
+        # Поддерево Decimal: {"<marker>":"1.50"}
+        decimal_size = len(orjson.dumps(serializer.pack(Decimal("1.50"))))
+        assert report["markers"]["DECIMAL"]["bytes"] == 10 * decimal_size
+
+    def test_namespace_overhead(self, orders):
+        """Test that namespace wrapper bytes are reported separately."""
+        plain = JsonSerializer().dumps(orders)
+        wrapped = JsonSerializer(namespace="cache:v2:").dumps(orders)
+
+        report = analyze([wrapped])
+        assert report["namespace_bytes"] == len(wrapped) - len(plain)
+        assert "$data" not in report["fields"]
+
+    def test_estimates(self, serializer, orders):
+        """Test compression, compact marker and columnar estimates."""
+        payload = serializer.dumps(orders)
+        estimates = analyze([payload])["estimates"]
+
+        assert 0 < estimates["compression"]["saving"] < len(payload)
+        assert estimates["compact_markers"]["saving"] == 30 * (36 + 2 - 4)
+        assert estimates["columnar"]["saving"] > 0
+
+    def test_plain_records_columnar(self, serializer):
+        """Test columnar estimate for plain records with identical keys."""
+        rows = [{"id": i, "name": "x"} for i in range(3)]
+        report = analyze([serializer.dumps(rows)])
+
+        # 3 строки по ("id": + "name":) минус заголовок
+        key_bytes = len('"id":') + len('"name":')
+        assert report["estimates"]["columnar"]["saving"] == 3 * key_bytes - (key_bytes + 2)
+        assert report["flag_bytes"] == 1
+
+    def test_binary_payload(self, orders):
+        """Test that binary backend payloads are decoded and analyzed."""
+        pytest.importorskip("msgpack")
+        payload = JsonSerializer(backend="msgpack").dumps({"blob": b"\x00" * 30, "orders": orders})
+
+        report = analyze([payload])
+        assert report["markers"]["BYTES"]["count"] == 1
+        assert report["models"]["order.v1"]["count"] == 10
+
+    def test_invalid_payload_skipped(self, serializer):
+        """Test that undecodable values are counted as skipped."""
+        report = analyze([b"{not json", serializer.dumps(1)])
+
+        assert report["payloads"] == 1
+        assert report["skipped"] == 1
+
+
+class TestInput:
+    """Test export readers."""
+
+    def test_ndjson(self):
+        """Test one payload per line, blank lines ignored."""
+        stream = io.BytesIO(b' {"a":1}\n\n[1,2]\r\n')
+        assert list(read_payloads(stream)) == [b' {"a":1}', b"[1,2]"]
+
+    def test_rdb_json(self):
+        """Test redis-rdb-tools JSON export (string values only)."""
+        export = [{"user:1": '{"a":1}', "set:1": ["x", "y"]}, {"user:2": "[1]"}]
+        stream = io.BytesIO(json.dumps(export).encode())
+
+        assert list(read_payloads(stream, "rdb-json")) == [b'{"a":1}', b"[1]"]
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown input format"):
+            list(read_payloads(io.BytesIO(b""), "csv"))
+
+
+class TestCli:
+    """Test command line interface."""
+
+    def test_json_report_from_file(self, tmp_path, capsys, serializer, orders):
+        """Test analyze command with a file and JSON output."""
+        path = tmp_path / "values.ndjson"
+        path.write_bytes(b"\n".join(serializer.dumps(orders) for _ in range(3)))
+
+        assert cli_main(["analyze", str(path), "--json", "--limit", "2"]) == 0
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["payloads"] == 2
+        assert report["models"]["order.v1"]["count"] == 20
+
+    def test_text_report_from_stdin(self, monkeypatch, capsys, serializer, orders):
+        """Test analyze command reading stdin with text output."""
+        stdin = io.TextIOWrapper(io.BytesIO(serializer.dumps(orders) + b"\n"))
+        monkeypatch.setattr("sys.stdin", stdin)
+
+        assert main([]) == 0
+
+        output = capsys.readouterr().out
+        assert "Payloads: 1" in output
+        assert "order.v1" in output
+        assert "compact markers" in output
+
+    def test_unknown_command(self, capsys):
+        """Test usage message for unknown commands."""
+        assert cli_main(["unknown"]) == 2
+        assert "usage" in capsys.readouterr().err
@@ -0,0 +1,191 @@
+"""
+Tests for codec backends.
+"""
+
+import collections
+import datetime
+import ipaddress
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from redis_json_serializer import JsonSerializer, register_model
+from redis_json_serializer.backends import (
+    BINARY_MAGIC,
+    NAMESPACE_BACKENDS,
+    Backend,
+    configure_backend,
+    detect_backend,
+    get_backend,
+)
+from redis_json_serializer.types import Marks
+
+msgpack = pytest.importorskip("msgpack")
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    pytest.skip("Pydantic not installed", allow_module_level=True)
+    BaseModel = None
+
+
+@pytest.fixture
+def binary_serializer():
+    """Create a JsonSerializer with the MessagePack backend."""
+    return JsonSerializer(backend="msgpack")
+
+
+@pytest.fixture(autouse=True)
+def clear_namespace_backends():
+    """Reset namespace backend configuration around each test."""
+    NAMESPACE_BACKENDS.clear()
+    yield
+    NAMESPACE_BACKENDS.clear()
+
+
+class TestMsgpackBackend:
+    """Test MessagePack backend."""
+
+    def test_round_trip(self, binary_serializer, sample_datetime, sample_date, sample_decimal):
+        """Test that marker semantics are preserved with the binary codec."""
+        data = {
+            "datetime": sample_datetime,
+            "date": sample_date,
+            "decimal": sample_decimal,
+            "set": {1, 2, 3},
+            "tuple": (1, "a", sample_decimal),
+            "bytes": b"\x00\xff",
+            "nested": [{"key": "value"}, None, True, 3.14],
+        }
+
+        serialized = binary_serializer.dumps(data)
+        assert serialized[0] == BINARY_MAGIC
+        # Маркеры кодируются extension-типами, а не строками
+        assert str(Marks.DATETIME).encode() not in serialized
+        assert str(Marks.DECIMAL).encode() not in serialized
+
+        assert binary_serializer.loads(serialized) == data
+
+    def test_stdlib_types_raw(self, binary_serializer):
+        """Test that UUID and IP addresses are written as raw bytes."""
+        value = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "ip": ipaddress.IPv6Address("2001:db8::1"),
+            "ttl": datetime.timedelta(seconds=90),
+        }
+
+        serialized = binary_serializer.dumps(value)
+        assert value["id"].bytes in serialized
+        assert value["ip"].packed in serialized
+        assert binary_serializer.loads(serialized) == value
+
+    def test_collection_types(self, binary_serializer):
+        """Test collection markers and non-string keys with the binary codec."""
+        value = {
+            "frozen": frozenset({1, 2}),
+            "queue": collections.deque([1, 2], maxlen=5),
+            "ordered": collections.OrderedDict([("b", 1), ("a", 2)]),
+            "keyed": {1: "a", (2, 3): "b"},
+        }
+        assert binary_serializer.loads(binary_serializer.dumps(value)) == value
+
+    def test_canonical_output(self, sample_decimal):
+        """Test that canonical mode sorts map keys for the binary codec."""
+        serializer = JsonSerializer(backend="msgpack", canonical=True)
+        first = {"b": {"y": 1, "x": (sample_decimal, {"q": 1, "p": 2})}, "a": [{"d": 1, "c": 2}]}
+        second = {"a": [{"c": 2, "d": 1}], "b": {"x": (sample_decimal, {"p": 2, "q": 1}), "y": 1}}
+
+        assert serializer.dumps(first) == serializer.dumps(second)
+        assert serializer.loads(serializer.dumps(first)) == first
+        assert list(serializer.loads(serializer.dumps(first))) == ["a", "b"]
+
+    def test_pack_output_unchanged(self, binary_serializer, sample_datetime):
+        """Test that pack() keeps marker dicts with the binary backend."""
+        packed = binary_serializer.pack(sample_datetime)
+        assert packed == {str(Marks.DATETIME): sample_datetime.isoformat()}
+        assert binary_serializer.unpack(packed) == sample_datetime
+
+    def test_models(self, binary_serializer, sample_decimal):
+        """Test nested models are encoded as extension types."""
+        @register_model("backend.inner.v1")
+        class Inner(BaseModel):
+            price: Decimal
+
+        @register_model("backend.outer.v1")
+        class Outer(BaseModel):
+            inner: Inner
+            created_at: datetime.datetime
+
+        value = Outer(inner=Inner(price=sample_decimal), created_at=datetime.datetime(2024, 1, 1))
+        serialized = binary_serializer.dumps(value)
+        assert str(Marks.MODEL).encode() not in serialized
+
+        unpacked = binary_serializer.loads(serialized)
+        assert unpacked == value
+        assert isinstance(unpacked.inner, Inner)
+
+    def test_smaller_than_json(self, serializer, binary_serializer, sample_datetime):
+        """Test that binary payload with markers is smaller than JSON."""
+        data = [{"at": sample_datetime, "amount": Decimal("1.5")} for _ in range(10)]
+        assert len(binary_serializer.dumps(data)) < len(serializer.dumps(data))
+
+    def test_namespace_wrapper(self):
+        """Test namespace wrapper with the binary backend."""
+        serializer = JsonSerializer(namespace="hot:v1", backend="msgpack")
+        assert serializer.loads(serializer.dumps({"key": "value"})) == {"key": "value"}
+
+    def test_soft_ttl_envelope(self, sample_datetime):
+        """Test soft TTL metadata with the binary backend."""
+        serializer = JsonSerializer(namespace="hot:v1", backend="msgpack", soft_ttl=30)
+        value, meta = serializer.loads_with_meta(serializer.dumps({"at": sample_datetime}))
+
+        assert value == {"at": sample_datetime}
+        assert meta.soft_ttl == 30
+
+
+class TestBackendSelection:
+    """Test backend configuration and auto-detection."""
+
+    def test_auto_detection_on_read(self, serializer, binary_serializer, sample_decimal):
+        """Test that any serializer reads payloads of any backend."""
+        data = {"decimal": sample_decimal}
+
+        assert serializer.loads(binary_serializer.dumps(data)) == data
+        assert binary_serializer.loads(serializer.dumps(data)) == data
+
+    def test_detect_backend(self, serializer, binary_serializer):
+        """Test payload header detection."""
+        assert detect_backend(serializer.dumps(1)).name == "json"
+        assert detect_backend(binary_serializer.dumps(1)).name == "msgpack"
+
+        with pytest.raises(ValueError, match="Unknown binary payload header"):
+            detect_backend(bytes((BINARY_MAGIC, 0xFF)))
+
+    def test_configure_backend_per_namespace(self):
+        """Test that namespace configuration selects the backend."""
+        configure_backend("hot:v1", "msgpack")
+
+        assert JsonSerializer(namespace="hot:v1").backend.name == "msgpack"
+        assert JsonSerializer(namespace="cold:v1").backend.name == "json"
+        # Явный параметр имеет приоритет над конфигурацией
+        assert JsonSerializer(namespace="hot:v1", backend="json").backend.name == "json"
+
+    def test_incomplete_backend_not_instantiable(self):
+        """Test that a backend without decode() fails on instantiation."""
+
+        class EncodeOnly(Backend):
+            name = "encode-only"
+
+            def encode(self, packed, canonical=False):
+                return b""
+
+        with pytest.raises(TypeError, match="decode"):
+            EncodeOnly()
+
+    def test_unknown_backend_raises(self):
+        """Test that unknown backend names raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown backend"):
+            get_backend("xml")
+        with pytest.raises(ValueError, match="Unknown backend"):
+            configure_backend("ns", "xml")
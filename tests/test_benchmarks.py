@@ -0,0 +1,80 @@
+"""
+Benchmarks for pack/unpack on deep and wide payload shapes.
+
+Run with pytest-benchmark (dev dependency):
+    pytest tests/test_benchmarks.py --benchmark-only
+"""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from redis_json_serializer import JsonSerializer
+
+pytest.importorskip("pytest_benchmark")
+
+# Глубина заметно больше, чем выдерживала рекурсивная реализация (~200 уровней)
+DEEP_LEVELS = 900
+WIDE_ROWS = 5_000
+
+
+def _deep_tree(levels):
+    """Comment thread: each node holds one reply."""
+    node = {"id": 0, "text": "leaf", "replies": []}
+    for i in range(1, levels):
+        node = {"id": i, "text": "reply", "replies": [node]}
+    return node
+
+
+def _deep_schema(levels):
+    """JSON-schema-like blob mixing dicts, tuples and sets at every level."""
+    node = {"type": "string"}
+    for i in range(levels):
+        node = {"properties": {"child": node}, "required": ("child",), "tags": {f"t{i % 3}"}}
+    return node
+
+
+def _wide_rows(rows):
+    """Flat table: many small records with marker types."""
+    at = datetime.datetime(2024, 1, 1, 12, 0)
+    return {
+        "rows": [
+            {"id": i, "name": f"row-{i}", "price": Decimal("9.99"), "at": at, "pair": (i, "x")}
+            for i in range(rows)
+        ]
+    }
+
+
+@pytest.fixture
+def serializer():
+    """Serializer with max_depth large enough for the deep shapes."""
+    return JsonSerializer(max_depth=10_000)
+
+
+@pytest.mark.parametrize("shape", [_deep_tree, _deep_schema], ids=["tree", "schema"])
+def test_pack_deep(benchmark, serializer, shape):
+    """Benchmark pack() of deeply nested payloads."""
+    value = shape(DEEP_LEVELS)
+    benchmark(serializer.pack, value)
+
+
+@pytest.mark.parametrize("shape", [_deep_tree, _deep_schema], ids=["tree", "schema"])
+def test_unpack_deep(benchmark, serializer, shape):
+    """Benchmark unpack() of deeply nested payloads."""
+    packed = serializer.pack(shape(DEEP_LEVELS))
+    benchmark(serializer.unpack, packed)
+
+
+def test_pack_wide(benchmark, serializer):
+    """Benchmark pack() of a wide flat payload."""
+    value = _wide_rows(WIDE_ROWS)
+    packed = benchmark(serializer.pack, value)
+    assert len(packed["rows"]) == WIDE_ROWS
+
+
+def test_unpack_wide(benchmark, serializer):
+    """Benchmark unpack() of a wide flat payload."""
+    value = _wide_rows(WIDE_ROWS)
+    unpacked = benchmark(serializer.unpack, serializer.pack(value))
+    assert unpacked == value
@@ -0,0 +1,143 @@
+"""
+Tests for immutable copies of decoded values.
+"""
+
+import collections
+import copy
+import dataclasses
+import pickle
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import pytest
+
+from redis_json_serializer.frozen import (
+    ReadOnlyDict,
+    ReadOnlyList,
+    ReadOnlySet,
+    freeze,
+    frozen_class,
+)
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    pytest.skip("Pydantic not installed", allow_module_level=True)
+    BaseModel = None
+
+
+@dataclass
+class Item:
+    """Dataclass model."""
+
+    name: str
+    tags: list[str]
+
+
+@dataclass
+class Point:
+    """Dataclass without containers (frozen copy equals the original)."""
+
+    name: str
+    x: int
+
+
+@dataclass(slots=True)
+class SlotItem:
+    """Dataclass with slots."""
+
+    name: str
+
+
+class Profile(BaseModel):
+    """Pydantic model."""
+
+    name: str
+    settings: dict[str, str]
+
+
+class Pair(NamedTuple):
+    """Namedtuple."""
+
+    left: list[int]
+    right: int
+
+
+class TestFreeze:
+    """Test conversion of decoded values to immutable copies."""
+
+    def test_containers(self):
+        """Test lists, sets, deques and dicts at every level."""
+        value = {"rows": [{"ids": {1, 2}}, collections.deque([1])], "od": collections.OrderedDict(a=[1])}
+        frozen = freeze(value)
+
+        assert type(frozen) is ReadOnlyDict
+        assert type(frozen["rows"]) is ReadOnlyList
+        assert type(frozen["rows"][0]["ids"]) is ReadOnlySet
+        assert frozen == {"rows": [{"ids": {1, 2}}, (1,)], "od": {"a": [1]}}
+        with pytest.raises(TypeError):
+            frozen["rows"][0]["new"] = 1
+        with pytest.raises(TypeError):
+            frozen["rows"].append(1)
+        with pytest.raises(TypeError):
+            frozen["rows"][0]["ids"].add(3)
+        with pytest.raises(TypeError):
+            frozen["od"]["a"] += [2]
+
+    def test_read_only_copies(self):
+        """Test that copies and pickles of read-only containers keep their contents."""
+        frozen = freeze({"a": [1, {2}]})
+
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+        assert copy.deepcopy(frozen) == frozen
+        assert type(copy.copy(frozen["a"])) is ReadOnlyList
+
+    def test_scalars_unchanged(self, sample_datetime):
+        """Test that immutable scalars are returned as is."""
+        assert freeze("x") == "x"
+        assert freeze(sample_datetime) is sample_datetime
+        assert freeze(None) is None
+
+    def test_namedtuple_keeps_class(self):
+        """Test that namedtuples are rebuilt with frozen fields."""
+        frozen = freeze(Pair([1, 2], 3))
+        assert frozen == Pair([1, 2], 3)
+        assert type(frozen) is Pair
+        assert type(frozen.left) is ReadOnlyList
+
+    def test_shared_children_frozen_once(self):
+        """Test that a value referenced twice is frozen before both parents."""
+        shared = [1]
+        frozen = freeze({"a": [shared], "b": shared})
+
+        assert frozen["b"] == [1]
+        assert frozen["a"][0] is frozen["b"]
+
+    @pytest.mark.parametrize(
+        "model",
+        [Point("a", 1), SlotItem("a"), Profile(name="a", settings={"k": "v"})],
+        ids=["dataclass", "slots", "pydantic"],
+    )
+    def test_models_frozen(self, model):
+        """Test that model copies reject changes and compare equal to originals."""
+        frozen = freeze(model)
+
+        assert isinstance(frozen, type(model))
+        assert frozen == model
+        assert model == frozen
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.name = "b"
+        assert model.name == "a"
+
+    def test_model_fields_frozen(self):
+        """Test that containers inside models are frozen too and still equal the originals."""
+        frozen = freeze(Profile(name="a", settings={"k": "v"}))
+        assert type(frozen.settings) is ReadOnlyDict
+        assert freeze(Item("a", ["x"])) == Item("a", ["x"])
+        with pytest.raises(TypeError):
+            freeze(Item("a", ["x"])).tags.append("y")
+
+    def test_frozen_class_cached(self):
+        """Test that frozen subclasses are created once per model class."""
+        assert frozen_class(Item) is frozen_class(Item)
+        assert frozen_class(Item).__qualname__ == Item.__qualname__
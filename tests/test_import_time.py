@@ -0,0 +1,69 @@
+"""
+Import-time benchmark: the package must not import optional integrations.
+
+Runs in subprocesses because the test session itself imports pydantic,
+numpy and others via conftest.
+"""
+
+import subprocess
+import sys
+
+# Опциональные интеграции, которые не должны загружаться при импорте пакета
+OPTIONAL_MODULES = ("pydantic", "fastapi", "starlette", "bson", "numpy", "aiocache", "msgpack")
+
+# Бюджет на cumulative-время импорта пакета (микросекунды, с запасом для CI)
+IMPORT_BUDGET_US = 150_000
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_times() -> dict[str, int]:
+    """Return cumulative import time (us) per module from python -X importtime."""
+    # Первый запуск прогревает .pyc, измеряется второй
+    _run("import redis_json_serializer")
+    result = _run("import redis_json_serializer", "-X", "importtime")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self | cumulative | module"
+        _, cumulative_us, name = line.split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+class TestImportTime:
+    """Test package import cost."""
+
+    def test_optional_modules_not_imported(self):
+        """Test that importing the package does not import optional integrations."""
+        times = _import_times()
+        imported = sorted(
+            name for name in times if name.split(".")[0] in OPTIONAL_MODULES
+        )
+        assert imported == [], f"Optional modules imported eagerly: {imported}"
+
+    def test_import_within_budget(self):
+        """Test that package import time stays within budget."""
+        times = _import_times()
+        assert times["redis_json_serializer"] < IMPORT_BUDGET_US
+
+    def test_round_trip_does_not_import_optional_modules(self):
+        """Test that serializing plain and marker types keeps integrations unloaded."""
+        code = (
+            "import datetime, decimal, sys\n"
+            "from redis_json_serializer import JsonSerializer\n"
+            "s = JsonSerializer()\n"
+            "value = {'a': [1, 2], 'at': datetime.datetime(2024, 1, 1), 'd': decimal.Decimal('1')}\n"
+            "assert s.loads(s.dumps(value)) == value\n"
+            f"print(sorted(m for m in {OPTIONAL_MODULES!r} if m in sys.modules))\n"
+        )
+        assert _run(code).stdout.strip() == "[]"
@@ -0,0 +1,94 @@
+"""
+Tests for attribute path to JSONPath translation.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import pytest
+
+from redis_json_serializer import register_model
+from redis_json_serializer.jsonpath import json_path, resolve_path
+from redis_json_serializer.registry import RegistrationError
+from redis_json_serializer.types import Marks
+
+
+@dataclass
+class Settings:
+    theme: str
+    updated_at: datetime.datetime | None = None
+
+
+@dataclass
+class Order:
+    total: Decimal
+    pair: tuple[int, str] = (0, "")
+
+
+@dataclass
+class User:
+    name: str
+    settings: Settings
+    orders: list[Order] = field(default_factory=list)
+    labels: dict[str, int] = field(default_factory=dict)
+    tags: set[str] = field(default_factory=set)
+
+
+@pytest.fixture(autouse=True)
+def models(clear_registry):
+    """Register document models (after the registry is cleared)."""
+    register_model("jsonpath.user")(User)
+    register_model("jsonpath.settings")(Settings)
+    register_model("jsonpath.order")(Order)
+
+
+class TestResolvePath:
+    """Test attribute path resolution."""
+
+    def test_nested_attribute(self):
+        """Test attribute of a nested model."""
+        assert resolve_path(User, "settings.theme") == ("$.settings.theme", str)
+
+    def test_optional_field(self):
+        """Test that Optional fields keep their declared type."""
+        path, expected = resolve_path(User, "settings.updated_at")
+        assert path == "$.settings.updated_at"
+        assert expected == datetime.datetime | None
+
+    def test_list_index(self):
+        """Test list index followed by an attribute."""
+        assert resolve_path(User, "orders[0].total") == ("$.orders[0].total", Decimal)
+        assert resolve_path(User, "orders[-1]") == ("$.orders[-1]", Order)
+
+    def test_tuple_index_goes_through_marker(self):
+        """Test that tuple items are addressed under the TUPLE marker."""
+        path, expected = resolve_path(User, "orders[0].pair[1]")
+        assert path == f'$.orders[0].pair["{Marks.TUPLE}"][1]'
+        assert expected is str
+
+    def test_dict_key(self):
+        """Test dict key with quoting."""
+        assert resolve_path(User, 'labels["env"]') == ('$.labels["env"]', int)
+        assert json_path(User, "labels['a\"b']") == '$.labels["a\\"b"]'
+
+    def test_root(self):
+        """Test that an empty path addresses the whole document."""
+        assert resolve_path(User, "") == ("$", User)
+
+    @pytest.mark.parametrize(
+        "path", ["missing", "name.length", "tags[0]", "settings[0]", ".name", "orders[x]"]
+    )
+    def test_invalid_paths(self, path):
+        """Test paths that do not match field types."""
+        with pytest.raises(ValueError):
+            resolve_path(User, path)
+
+    def test_unregistered_model(self):
+        """Test that the root model must be registered."""
+        @dataclass
+        class Unregistered:
+            name: str
+
+        with pytest.raises(RegistrationError):
+            resolve_path(Unregistered, "name")
@@ -0,0 +1,305 @@
+"""
+Memory benchmarks: peak allocation of dumps()/loads() and retained size
+of decoded results, compared against stored baselines.
+
+Peaks are measured with tracemalloc, retained size with a deep
+sys.getsizeof() walk. Baselines live in memory_baselines.json per Python
+version (allocation sizes differ between interpreter versions) and are
+recorded for every version in the CI matrix; a metric growing by more
+than TOLERANCE fails the test, and so does a missing baseline.
+
+Update baselines after an intended change:
+    UPDATE_MEMORY_BASELINES=1 pytest tests/test_memory.py
+"""
+
+import datetime
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from redis_json_serializer import JsonSerializer, register_model
+
+BASELINES_PATH = Path(__file__).with_name("memory_baselines.json")
+PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+UPDATE_BASELINES = os.environ.get("UPDATE_MEMORY_BASELINES") == "1"
+
+# Допустимый рост метрики относительно baseline
+TOLERANCE = 0.10
+
+# Размер и количество значений в blobs_payload()
+BLOB_SIZE = 256 * 1024
+BLOB_COUNT = 8
+
+
+# ========== Measurement helpers ==========
+
+
+def peak_allocation(fn: Callable[[], Any]) -> tuple[int, Any]:
+    """
+    Measure peak traced memory allocated while fn() runs.
+
+    Returns:
+        (peak bytes above the level before the call, fn() result)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - before, result
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Total size of an object graph: sys.getsizeof() of every reachable object,
+    each object counted once.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, memoryview):
+            # Буфер, на который ссылается view
+            stack.append(item.obj)
+        elif getattr(item, "base", None) is not None and hasattr(item, "nbytes"):
+            # numpy view (например, np.frombuffer) - данные принадлежат base
+            stack.append(item.base)
+
+        if hasattr(item, "__dict__"):
+            stack.append(item.__dict__)
+        for slot in getattr(type(item), "__slots__", ()):
+            if hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
+
+
+# ========== Payloads ==========
+
+
+@dataclass
+class Order:
+    id: int
+    customer: str
+    total: Decimal
+    created_at: datetime.datetime
+    tags: set[str]
+
+
+def records_payload() -> Any:
+    """Typical API response: list of flat dicts with marker types."""
+    at = datetime.datetime(2024, 1, 1, 12, 0)
+    return [
+        {"id": i, "name": f"user-{i}", "score": i * 0.5, "balance": Decimal("10.25"), "seen": at}
+        for i in range(2_000)
+    ]
+
+
+def plain_payload() -> Any:
+    """Marker-free JSON (fast path in loads())."""
+    return [{"id": i, "name": f"user-{i}", "active": i % 2 == 0} for i in range(5_000)]
+
+
+def timeseries_payload() -> Any:
+    """Homogeneous list[datetime] (compact array encoding)."""
+    start = datetime.datetime(2024, 1, 1)
+    return {"points": [start + datetime.timedelta(seconds=i) for i in range(10_000)]}
+
+
+def binary_payload() -> Any:
+    """Single large binary value."""
+    return {"blob": bytes(range(256)) * 4_096}
+
+
+def blobs_payload() -> Any:
+    """Several large binary values."""
+    return {"blobs": [bytes([i]) * BLOB_SIZE for i in range(BLOB_COUNT)]}
+
+
+def models_payload() -> Any:
+    """Registered dataclass instances."""
+    at = datetime.datetime(2024, 1, 1, 12, 0)
+    return [Order(i, f"customer-{i}", Decimal("99.90"), at, {"new", "vip"}) for i in range(1_000)]
+
+
+def ndarray_payload() -> Any:
+    """Large numeric NumPy array."""
+    np = pytest.importorskip("numpy")
+    return {"matrix": np.arange(100_000, dtype=np.float64).reshape(250, 400)}
+
+
+def reference_payload() -> Any:
+    """Reference data: few distinct values repeated across many records."""
+    at = datetime.datetime(2024, 1, 1, 12, 0)
+    statuses = ("active", "blocked", "pending")
+    countries = ("DE", "FR", "US", "GB")
+    return [
+        {"id": i, "status": statuses[i % 3], "country": countries[i % 4], "price": Decimal("9.99"), "at": at}
+        for i in range(5_000)
+    ]
+
+
+# (id, фабрика payload, параметры сериализатора)
+CASES = [
+    ("records-json", records_payload, {}),
+    ("records-compact", records_payload, {"compact_datetimes": True}),
+    ("records-msgpack", records_payload, {"backend": "msgpack"}),
+    ("plain-json", plain_payload, {}),
+    ("timeseries-json", timeseries_payload, {}),
+    ("timeseries-compact", timeseries_payload, {"compact_datetimes": True}),
+    ("binary-json", binary_payload, {}),
+    ("blobs-json", blobs_payload, {}),
+    ("blobs-memoryview", blobs_payload, {"bytes_as_memoryview": True}),
+    ("binary-msgpack", binary_payload, {"backend": "msgpack"}),
+    ("models-json", models_payload, {}),
+    ("models-trusted", models_payload, {"trusted": True}),
+    ("ndarray-json", ndarray_payload, {}),
+]
+
+
+# ========== Baselines ==========
+
+
+def load_baselines() -> dict[str, Any]:
+    """Load stored baselines for the running Python version."""
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text()).get(PYTHON_VERSION, {})
+
+
+def save_baseline(case_id: str, metrics: dict[str, int]) -> None:
+    """Store metrics of one case for the running Python version."""
+    data = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    data.setdefault(PYTHON_VERSION, {})[case_id] = metrics
+    BASELINES_PATH.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def measure(payload_factory: Callable[[], Any], options: dict[str, Any]) -> dict[str, int]:
+    """Measure memory metrics of a dumps()/loads() round trip."""
+    if "backend" in options:
+        pytest.importorskip(options["backend"])
+
+    serializer = JsonSerializer(**options)
+    value = payload_factory()
+    # Прогрев: разрешение обработчиков и ленивые импорты не входят в измерение
+    serializer.loads(serializer.dumps(value))
+
+    dumps_peak, data = peak_allocation(lambda: serializer.dumps(value))
+    loads_peak, result = peak_allocation(lambda: serializer.loads(data))
+    return {
+        "payload_bytes": len(data),
+        "dumps_peak": dumps_peak,
+        "loads_peak": loads_peak,
+        "loads_retained": deep_sizeof(result),
+    }
+
+
+# ========== Tests ==========
+
+
+@pytest.fixture(autouse=True)
+def registered_models(clear_registry):
+    """Register payload models (after the registry is cleared)."""
+    register_model("order")(Order)
+
+
+class TestMemoryBaselines:
+    """Test that memory metrics do not regress against stored baselines."""
+
+    @pytest.mark.parametrize(
+        ("case_id", "payload_factory", "options"), CASES, ids=[case[0] for case in CASES]
+    )
+    def test_memory_within_baseline(self, case_id, payload_factory, options):
+        """Test peak allocation and retained size of one payload/mode."""
+        metrics = measure(payload_factory, options)
+
+        if UPDATE_BASELINES:
+            save_baseline(case_id, metrics)
+            return
+
+        baseline = load_baselines().get(case_id)
+        if baseline is None:
+            pytest.fail(
+                f"No memory baseline for {case_id} on Python {PYTHON_VERSION}: "
+                "record it with UPDATE_MEMORY_BASELINES=1"
+            )
+
+        regressions = {
+            name: f"{value} > {baseline[name]} (+{TOLERANCE:.0%})"
+            for name, value in metrics.items()
+            if name in baseline and value > baseline[name] * (1 + TOLERANCE)
+        }
+        assert not regressions, f"Memory regression in {case_id}: {regressions}"
+
+
+class TestMemorySavingModes:
+    """Test that memory-saving modes actually reduce memory."""
+
+    def test_compact_datetimes_reduce_peaks(self):
+        """Test that compact datetimes lower dumps/loads peaks for time series."""
+        plain = measure(timeseries_payload, {})
+        compact = measure(timeseries_payload, {"compact_datetimes": True})
+
+        assert compact["payload_bytes"] < plain["payload_bytes"]
+        assert compact["dumps_peak"] < plain["dumps_peak"]
+        assert compact["loads_peak"] < plain["loads_peak"]
+
+    def test_interning_reduces_retained(self):
+        """Test that interning shrinks decoded reference data."""
+        plain = measure(reference_payload, {})
+        interned = measure(reference_payload, {"intern_values": True})
+
+        assert interned["loads_retained"] < plain["loads_retained"] * 0.7
+
+    @pytest.mark.parametrize("backend", ["json", "msgpack"])
+    def test_memoryview_adds_no_copy(self, backend):
+        """Test that the shared memoryview buffer holds no second copy of the blobs."""
+        copied = measure(blobs_payload, {"backend": backend})
+        viewed = measure(blobs_payload, {"backend": backend, "bytes_as_memoryview": True})
+
+        # Копия всех значений подняла бы пик на BLOB_SIZE * BLOB_COUNT; допускается меньше одного значения
+        assert viewed["loads_peak"] < copied["loads_peak"] + BLOB_SIZE
+        assert viewed["loads_retained"] < copied["loads_retained"] + BLOB_SIZE
+
+
+class TestDeepSizeof:
+    """Test the deep size walk used by the benchmarks."""
+
+    def test_counts_nested_objects_once(self):
+        """Test that shared objects are counted once."""
+        shared = "x" * 1_000
+        value = [shared, shared, {"a": shared}]
+
+        expected = (
+            sys.getsizeof(value) + sys.getsizeof(shared)
+            + sys.getsizeof(value[2]) + sys.getsizeof("a")
+        )
+        assert deep_sizeof(value) == expected
+
+    def test_includes_memoryview_buffer(self):
+        """Test that a memoryview is counted with its underlying buffer."""
+        data = bytes(10_000)
+        assert deep_sizeof(memoryview(data)) >= sys.getsizeof(data)
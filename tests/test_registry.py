@@ -2,15 +2,32 @@
 Tests for model registry.
 """
 
+import enum
+import json
+import sys
+import textwrap
 from dataclasses import dataclass
 
 import pytest
 
-from redis_json_serializer import register_model
+from redis_json_serializer import (
+    JsonSerializer,
+    declare_model,
+    export_manifest,
+    load_entry_points,
+    load_manifest,
+    register_migration,
+    register_model,
+)
+from redis_json_serializer.__main__ import main as cli_main
 from redis_json_serializer.registry import (
+    LAZY_MODELS,
+    MIGRATION_PLANS,
+    MIGRATIONS,
     MODEL_ALIASES,
     REGISTERED_MODELS,
     RegistrationError,
+    lookup_model,
 )
 
 try:
@@ -81,6 +98,14 @@ class TestRegisterModel:
         assert REGISTERED_MODELS["test.item.v1"] is Item
         assert MODEL_ALIASES[Item] == "test.item.v1"
 
+    def test_register_enum(self):
+        """Test that Enum classes can be registered."""
+        @register_model("test.status.v1")
+        class Status(enum.Enum):
+            ACTIVE = 1
+
+        assert REGISTERED_MODELS["test.status.v1"] is Status
+
     def test_register_non_model_raises(self):
         """Test that registering a non-model class raises TypeError."""
         with pytest.raises(TypeError, match="must be Pydantic BaseModel or dataclass"):
@@ -137,3 +162,329 @@ class TestModelRegistry:
 
         assert registry.is_registered(RegisteredModel) is True
         assert registry.is_registered(UnregisteredModel) is False
+
+
+@dataclass
+class UserV1:
+    """First version of a stored model."""
+
+    name: str
+
+
+@dataclass
+class UserV2:
+    """Second version: name split into first/last."""
+
+    first: str
+    last: str
+
+
+@dataclass
+class UserV3:
+    """Third version: adds email."""
+
+    first: str
+    last: str
+    email: str | None
+
+
+def split_name(data):
+    """Upgrade user.v1 -> user.v2."""
+    first, _, last = data.pop("name").partition(" ")
+    return {**data, "first": first, "last": last}
+
+
+def add_email(data):
+    """Upgrade user.v2 -> user.v3."""
+    return {**data, "email": None}
+
+
+def write_old(cls, alias, value):
+    """Serialize value under an alias that is then unregistered (old payload in cache)."""
+    register_model(alias)(cls)
+    data = JsonSerializer().dumps(value)
+    del REGISTERED_MODELS[alias]
+    del MODEL_ALIASES[cls]
+    return data
+
+
+class TestMigrations:
+    """Test upcasting of old model versions on read."""
+
+    def test_upcast_on_read(self):
+        """Test that a v1 payload is read as v2 through the migration."""
+        data = write_old(UserV1, "user.v1", {"user": UserV1("Ada Lovelace")})
+        register_model("user.v2", migrations={"user.v1": split_name})(UserV2)
+
+        value, migrated = JsonSerializer().loads_migrated(data)
+
+        assert value == {"user": UserV2("Ada", "Lovelace")}
+        assert migrated is True
+        assert JsonSerializer().loads_migrated(JsonSerializer().dumps(value)) == (value, False)
+
+    def test_chain_is_precomputed(self):
+        """Test that v1 -> v2 -> v3 resolves to one plan."""
+        data = write_old(UserV1, "user.v1", [UserV1("Ada Lovelace")])
+        register_migration("user.v1", "user.v2", split_name)
+        register_model("user.v3", migrations={"user.v2": add_email})(UserV3)
+
+        assert MIGRATION_PLANS["user.v1"] == ("user.v3", (split_name, add_email))
+        assert JsonSerializer(trusted=True).loads(data) == [UserV3("Ada", "Lovelace", None)]
+
+    def test_nested_values_restored_before_upgrade(self, sample_datetime):
+        """Test that upgrade functions receive decoded field values."""
+
+        @dataclass
+        class Event:
+            at: object
+
+        seen = []
+        data = write_old(Event, "event.v1", Event(at=sample_datetime))
+
+        @register_model("event.v2", migrations={"event.v1": lambda data: seen.append(data) or data})
+        @dataclass
+        class EventV2:
+            at: object
+
+        assert JsonSerializer().loads(data) == EventV2(at=sample_datetime)
+        assert seen == [{"at": sample_datetime}]
+
+    def test_missing_target_raises(self):
+        """Test that a migration to an unregistered alias does not hide the error."""
+        data = write_old(UserV1, "user.v1", UserV1("Ada"))
+        register_migration("user.v1", "user.v2", split_name)
+
+        with pytest.raises(RegistrationError, match="user.v1"):
+            JsonSerializer().loads(data)
+
+    def test_cycle_rejected(self):
+        """Test that migrations cannot form a cycle."""
+        register_migration("a", "b", add_email)
+
+        with pytest.raises(RegistrationError, match="cycle"):
+            register_migration("b", "a", add_email)
+        assert set(MIGRATION_PLANS) == {"a"}
+
+    def test_registered_alias_cannot_be_migrated(self):
+        """Test that a live model alias and a migration source are exclusive."""
+        register_model("user.v1")(UserV1)
+        with pytest.raises(RegistrationError, match="registered"):
+            register_migration("user.v1", "user.v2", split_name)
+
+        register_migration("user.v0", "user.v1", split_name)
+        with pytest.raises(RegistrationError, match="migrated"):
+            register_model("user.v0")(UserV2)
+
+    def test_duplicate_migration_rejected(self):
+        """Test that one alias has at most one migration."""
+        register_migration("user.v1", "user.v2", split_name)
+        with pytest.raises(RegistrationError, match="already registered"):
+            register_migration("user.v1", "user.v3", split_name)
+
+
+LAZY_MODULE_SOURCE = """
+    import enum
+    from dataclasses import dataclass
+
+    from redis_json_serializer import register_model
+
+
+    @register_model("lazy.point")
+    @dataclass
+    class Point:
+        x: int
+        y: int
+
+
+    @dataclass
+    class Plain:
+        value: str
+
+
+    class Color(enum.Enum):
+        RED = 1
+        BLUE = 2
+
+
+    @register_model("lazy.user.v2", migrations={"lazy.user.v1": lambda data: {**data, "email": None}})
+    @dataclass
+    class User:
+        name: str
+        email: str | None
+"""
+
+
+@pytest.fixture
+def lazy_module(tmp_path, monkeypatch):
+    """Importable module with models, not imported yet (removed from sys.modules after the test)."""
+    (tmp_path / "lazy_models.py").write_text(textwrap.dedent(LAZY_MODULE_SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_models"
+    sys.modules.pop("lazy_models", None)
+
+
+def write_lazy(alias, name, value_factory):
+    """Serialize a model from lazy_models, then forget the module and its registrations."""
+    import lazy_models
+
+    cls = getattr(lazy_models, name)
+    if alias not in REGISTERED_MODELS:
+        register_model(alias)(cls)
+    data = JsonSerializer().dumps(value_factory(lazy_models))
+    REGISTERED_MODELS.clear()
+    MODEL_ALIASES.clear()
+    MIGRATIONS.clear()
+    MIGRATION_PLANS.clear()
+    del sys.modules["lazy_models"]
+    return data
+
+
+class TestLazyModels:
+    """Test models declared by import path and imported on first use."""
+
+    def test_import_on_first_use(self, lazy_module):
+        """Test that a declared model's module is imported by the first loads()."""
+        data = write_lazy("lazy.point", "Point", lambda module: [module.Point(1, 2)])
+        declare_model("lazy.point", "lazy_models:Point")
+
+        assert "lazy_models" not in sys.modules
+        value = JsonSerializer().loads(data)
+
+        assert value == [sys.modules["lazy_models"].Point(1, 2)]
+        assert REGISTERED_MODELS["lazy.point"] is sys.modules["lazy_models"].Point
+        assert LAZY_MODELS == {}
+
+    def test_undecorated_class_registered_by_declaration(self, lazy_module):
+        """Test that a declared class without @register_model is registered under its alias."""
+        data = write_lazy("lazy.plain", "Plain", lambda module: module.Plain("a"))
+        declare_model("lazy.plain", "lazy_models:Plain")
+        declare_model("lazy.color", "lazy_models:Color")
+
+        assert JsonSerializer().loads(data).value == "a"
+        assert lookup_model("lazy.color") is sys.modules["lazy_models"].Color
+        assert MODEL_ALIASES[sys.modules["lazy_models"].Plain] == "lazy.plain"
+
+    def test_undeclared_alias_does_not_import(self, lazy_module):
+        """Test that payloads cannot trigger imports of undeclared models."""
+        data = write_lazy("lazy_models.Plain", "Plain", lambda module: module.Plain("a"))
+
+        with pytest.raises(RegistrationError, match="not registered"):
+            JsonSerializer().loads(data)
+        assert "lazy_models" not in sys.modules
+
+    def test_import_error(self, lazy_module):
+        """Test that a broken declaration raises RegistrationError on use."""
+        declare_model("lazy.missing", "lazy_models:Missing")
+
+        with pytest.raises(RegistrationError, match="Cannot import model 'lazy.missing'"):
+            lookup_model("lazy.missing")
+
+    def test_alias_mismatch(self, lazy_module):
+        """Test that a class registered under another alias is not re-registered."""
+        declare_model("lazy.point.v2", "lazy_models:Point")
+
+        with pytest.raises(RegistrationError, match="registered as 'lazy.point'"):
+            lookup_model("lazy.point.v2")
+
+    def test_declaration_conflicts(self):
+        """Test declaration validation against registrations and migrations."""
+        register_model("user.v1")(UserV1)
+        register_migration("user.v0", "user.v1", split_name)
+
+        with pytest.raises(ValueError, match="module:qualname"):
+            declare_model("user.v2", "tests.test_registry.UserV2")
+        with pytest.raises(RegistrationError, match="already registered"):
+            declare_model("user.v1", "tests.test_registry:UserV2")
+
+        # Алиас с зарегистрированной миграцией разрешается без объявления
+        declare_model("user.v0", "tests.test_registry:UserV1")
+        declare_model("user.v1", "tests.test_registry:UserV1")
+        declare_model("user.v2", "tests.test_registry:UserV2")
+        assert LAZY_MODELS == {"user.v2": "tests.test_registry:UserV2"}
+        with pytest.raises(RegistrationError, match="already declared"):
+            declare_model("user.v2", "tests.test_registry:UserV3")
+
+        # Миграция с объявленного алиаса заменяет объявление
+        register_migration("user.v2", "user.v1", split_name)
+        assert LAZY_MODELS == {}
+
+    def test_export_and_load_manifest(self, tmp_path):
+        """Test that exported registrations restore lookups from a manifest file."""
+        register_model("user.v1")(UserV1)
+        declare_model("user.v2", "tests.test_registry:UserV2")
+
+        @register_model("local")
+        @dataclass
+        class Local:
+            value: int
+
+        manifest = export_manifest()
+        assert manifest == {
+            "user.v1": "tests.test_registry:UserV1",
+            "user.v2": "tests.test_registry:UserV2",
+        }
+
+        path = tmp_path / "models.json"
+        path.write_text(json.dumps(manifest))
+        REGISTERED_MODELS.clear()
+        MODEL_ALIASES.clear()
+        LAZY_MODELS.clear()
+        load_manifest(path)
+
+        assert LAZY_MODELS == manifest
+        assert lookup_model("user.v2") is UserV2
+
+    def test_entry_points(self, monkeypatch):
+        """Test that entry points of the group declare models."""
+        from importlib.metadata import EntryPoint
+
+        group = "redis_json_serializer.models"
+        points = [EntryPoint("user.v1", "tests.test_registry:UserV1", group)]
+        monkeypatch.setattr(
+            "importlib.metadata.entry_points",
+            lambda group: points if group == "redis_json_serializer.models" else [],
+        )
+
+        assert load_entry_points() == 1
+        assert LAZY_MODELS == {"user.v1": "tests.test_registry:UserV1"}
+
+    def test_migrated_payload_from_manifest(self, lazy_module):
+        """Test that a worker bootstrapped from the manifest upcasts old model versions."""
+
+        # Payload старой версии, записанный до появления lazy.user.v2
+        @dataclass
+        class OldUser:
+            name: str
+
+        data = write_old(OldUser, "lazy.user.v1", [OldUser("Ada")])
+
+        import lazy_models
+
+        manifest = export_manifest()
+        assert manifest["lazy.user.v1"] == manifest["lazy.user.v2"] == "lazy_models:User"
+
+        # "Воркер": реестр пуст, модуль не импортирован
+        REGISTERED_MODELS.clear()
+        MODEL_ALIASES.clear()
+        MIGRATIONS.clear()
+        MIGRATION_PLANS.clear()
+        del sys.modules["lazy_models"]
+        del lazy_models
+        load_manifest(manifest)
+
+        value, migrated = JsonSerializer().loads_migrated(data)
+
+        assert value == [sys.modules["lazy_models"].User("Ada", None)]
+        assert migrated is True
+        assert LAZY_MODELS == {}
+
+    def test_manifest_cli(self, lazy_module, tmp_path):
+        """Test that the manifest command imports modules and writes their models."""
+        output = tmp_path / "models.json"
+
+        assert cli_main(["manifest", "lazy_models", "-o", str(output)]) == 0
+        assert json.loads(output.read_text()) == {
+            "lazy.point": "lazy_models:Point",
+            "lazy.user.v1": "lazy_models:User",
+            "lazy.user.v2": "lazy_models:User",
+        }
@@ -2,13 +2,22 @@
 Basic tests for JsonSerializer.
 """
 
+import collections
 import datetime
+import enum
+import importlib.util
+import ipaddress
+import pathlib
+import sys
+import types
+import uuid
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Any, NamedTuple
 
 import pytest
 
-from redis_json_serializer import register_model
+from redis_json_serializer import MISS, CacheMeta, JsonSerializer, register_model
 from redis_json_serializer.registry import RegistrationError
 from redis_json_serializer.types import Marks
 
@@ -96,6 +105,23 @@ class TestDatetime:
         assert isinstance(unpacked, str)
         assert not isinstance(unpacked, datetime.datetime)
 
+    @pytest.mark.parametrize("backend", ["json", "msgpack"])
+    def test_memoryviews_share_one_buffer(self, backend):
+        """Test that all binary values of a payload are views of one buffer."""
+        from redis_json_serializer import JsonSerializer
+
+        if backend == "msgpack":
+            pytest.importorskip("msgpack")
+        serializer = JsonSerializer(bytes_as_memoryview=True, backend=backend)
+        value = {"a": b"first", "nested": [b"", (b"second", frozenset({b"third"}))]}
+
+        unpacked = serializer.loads(serializer.dumps(value))
+        views = [unpacked["a"], unpacked["nested"][0], unpacked["nested"][1][0], *unpacked["nested"][1][1]]
+
+        assert all(isinstance(view, memoryview) and view.readonly for view in views)
+        assert len({id(view.obj) for view in views}) == 1
+        assert [bytes(view) for view in views] == [b"first", b"", b"second", b"third"]
+
     def test_string_conversion_with_expected_type(self, serializer):
         """Test that strings are converted only with expected_type."""
         iso_string = "2024-12-23T10:30:00"
@@ -442,3 +468,1380 @@ class TestRoundTrip:
         assert deserialized.name == user.name
         assert deserialized.email == user.email
         assert deserialized.age == user.age
+
+
+class TestTrustedMode:
+    """Test trusted decode mode (models built without validation)."""
+
+    def test_trusted_pydantic_skips_validation(self):
+        """Test that trusted mode uses model_construct instead of model_validate."""
+        from pydantic import field_validator
+
+        from redis_json_serializer import JsonSerializer
+
+        calls = []
+
+        @register_model("trusted.user.v1")
+        class User(BaseModel):
+            id: str
+            created_at: datetime.datetime
+            price: Decimal
+
+            @field_validator("id")
+            @classmethod
+            def check_id(cls, value: str) -> str:
+                calls.append(value)
+                return value
+
+        user = User(id="1", created_at=datetime.datetime(2024, 1, 1), price=Decimal("1.5"))
+        calls.clear()
+
+        serializer = JsonSerializer(trusted=True)
+        unpacked = serializer.loads(serializer.dumps(user))
+
+        assert calls == []
+        assert isinstance(unpacked, User)
+        assert unpacked == user
+        assert isinstance(unpacked.created_at, datetime.datetime)
+        assert isinstance(unpacked.price, Decimal)
+
+    def test_trusted_dataclass_skips_post_init(self):
+        """Test that trusted mode builds dataclasses without __init__/__post_init__."""
+        from redis_json_serializer import JsonSerializer
+
+        calls = []
+
+        @register_model("trusted.item.v1")
+        @dataclass
+        class Item:
+            id: str
+            price: Decimal
+
+            def __post_init__(self) -> None:
+                calls.append(self.id)
+
+        serializer = JsonSerializer(trusted=True)
+        data = serializer.dumps(Item(id="1", price=Decimal("2.5")))
+        calls.clear()
+
+        unpacked = serializer.loads(data)
+        assert calls == []
+        assert isinstance(unpacked, Item)
+        assert unpacked == Item(id="1", price=Decimal("2.5"))
+
+    def test_trusted_dataclass_slots_and_frozen(self):
+        """Test trusted mode with slots and frozen dataclasses."""
+        from redis_json_serializer import JsonSerializer
+
+        @register_model("trusted.point.v1")
+        @dataclass(frozen=True, slots=True)
+        class Point:
+            x: int
+            y: int = 0
+
+        serializer = JsonSerializer(trusted=True)
+        # Поле с default отсутствует в payload - заполняется значением по умолчанию
+        unpacked = serializer.unpack({str(Marks.MODEL): "trusted.point.v1", "x": 1})
+        assert unpacked == Point(x=1, y=0)
+
+    def test_trusted_dataclass_retains_no_extra_memory(self):
+        """Test that trusted instances keep field order and key-sharing instance dicts."""
+        from redis_json_serializer import JsonSerializer
+
+        @register_model("trusted.row.v1")
+        @dataclass
+        class Row:
+            id: int
+            name: str
+            score: float
+            note: str = ""
+
+        # Поля payload в обратном порядке, note отсутствует
+        packed = [{str(Marks.MODEL): "trusted.row.v1", "score": i * 0.5, "name": f"row-{i}", "id": i} for i in range(100)]
+        validated = JsonSerializer().unpack(packed)
+        trusted = JsonSerializer(trusted=True).unpack(packed)
+
+        assert trusted == validated
+        assert list(vars(trusted[0])) == ["id", "name", "score", "note"]
+        assert sum(sys.getsizeof(vars(row)) for row in trusted) <= sum(sys.getsizeof(vars(row)) for row in validated)
+
+    def test_trusted_per_call_override(self, serializer):
+        """Test that loads(trusted=...) overrides the serializer setting."""
+        calls = []
+
+        @register_model("trusted.override.v1")
+        @dataclass
+        class Item:
+            id: str
+
+            def __post_init__(self) -> None:
+                calls.append(self.id)
+
+        data = serializer.dumps(Item(id="1"))
+        calls.clear()
+
+        serializer.loads(data, trusted=True)
+        assert calls == []
+
+        # Переопределение действует только на время вызова
+        serializer.loads(data)
+        assert calls == ["1"]
+
+
+class TestCompactDatetimes:
+    """Test compact numeric datetime/date encoding."""
+
+    @pytest.fixture
+    def compact_serializer(self):
+        """Create a JsonSerializer with compact datetime encoding."""
+        from redis_json_serializer import JsonSerializer
+
+        return JsonSerializer(compact_datetimes=True)
+
+    def test_naive_datetime(self, compact_serializer, sample_datetime):
+        """Test naive datetime is stored as epoch microseconds."""
+        packed = compact_serializer.pack(sample_datetime)
+        assert isinstance(packed[str(Marks.DATETIME_TS)], int)
+
+        unpacked = compact_serializer.unpack(packed)
+        assert unpacked == sample_datetime
+        assert unpacked.tzinfo is None
+
+    def test_aware_datetime(self, compact_serializer):
+        """Test aware datetime keeps wall-clock time and UTC offset."""
+        tz = datetime.timezone(datetime.timedelta(hours=3))
+        value = datetime.datetime(2024, 12, 23, 10, 30, 45, 123456, tzinfo=tz)
+
+        unpacked = compact_serializer.loads(compact_serializer.dumps(value))
+        assert unpacked == value
+        assert unpacked.utcoffset() == datetime.timedelta(hours=3)
+        assert unpacked.hour == 10
+
+    def test_date(self, compact_serializer, sample_date):
+        """Test date is stored as ordinal."""
+        packed = compact_serializer.pack(sample_date)
+        assert packed == {str(Marks.DATE_ORDINAL): sample_date.toordinal()}
+        assert compact_serializer.unpack(packed) == sample_date
+
+    @pytest.mark.parametrize("size", [3, 1000])
+    def test_homogeneous_list(self, compact_serializer, sample_datetime, size):
+        """Test homogeneous list[datetime] is packed as one integer array."""
+        values = [sample_datetime + datetime.timedelta(seconds=i) for i in range(size)]
+
+        packed = compact_serializer.pack(values)
+        offset, items = packed[str(Marks.DATETIME_ARRAY)]
+        assert offset is None
+        assert len(items) == size
+
+        unpacked = compact_serializer.loads(compact_serializer.dumps(values))
+        assert unpacked == values
+        assert all(type(item) is datetime.datetime for item in unpacked)
+
+    def test_homogeneous_aware_list(self, compact_serializer):
+        """Test list of aware datetimes with the same offset."""
+        tz = datetime.timezone(datetime.timedelta(hours=-5))
+        values = [datetime.datetime(2024, 1, 1, i, tzinfo=tz) for i in range(24)] * 10
+
+        unpacked = compact_serializer.loads(compact_serializer.dumps(values))
+        assert unpacked == values
+        assert all(item.utcoffset() == datetime.timedelta(hours=-5) for item in unpacked)
+
+    def test_mixed_list_falls_back(self, compact_serializer, sample_datetime):
+        """Test non-homogeneous list is packed item by item."""
+        utc_value = sample_datetime.replace(tzinfo=datetime.timezone.utc)
+        values = [sample_datetime, utc_value, "text"]
+
+        packed = compact_serializer.pack(values)
+        assert isinstance(packed, list)
+        assert compact_serializer.unpack(packed) == values
+
+    def test_default_mode_reads_compact(self, serializer, compact_serializer, sample_datetime):
+        """Test that compact markers are decoded without compact mode enabled."""
+        values = [sample_datetime] * 3
+        assert serializer.loads(compact_serializer.dumps(values)) == values
+        # Режим по умолчанию не меняет формат записи
+        assert str(Marks.DATETIME) in serializer.pack(sample_datetime)
+
+
+class TestNdarray:
+    """Test NumPy ndarray serialization."""
+
+    @pytest.fixture(autouse=True)
+    def np(self):
+        """Skip tests if NumPy is not installed."""
+        return pytest.importorskip("numpy")
+
+    def test_large_array_raw_buffer(self, serializer, np):
+        """Test large array is stored as raw buffer and wrapped without copying."""
+        value = np.arange(1000, dtype=np.float64).reshape(10, 100)
+
+        packed = serializer.pack(value)
+        meta = packed[str(Marks.NDARRAY)]
+        assert meta["dtype"] == "<f8"
+        assert meta["shape"] == [10, 100]
+        assert "data" in meta
+
+        unpacked = serializer.loads(serializer.dumps(value))
+        assert unpacked.dtype == value.dtype
+        assert unpacked.shape == value.shape
+        assert np.array_equal(unpacked, value)
+        # np.frombuffer над bytes - массив только для чтения
+        assert not unpacked.flags.writeable
+
+    def test_small_array_plain_json(self, serializer, np):
+        """Test small numeric array is written as plain JSON numbers."""
+        value = np.array([1, 2, 3], dtype=np.int32)
+
+        serialized = serializer.dumps(value)
+        assert b"[1,2,3]" in serialized
+
+        unpacked = serializer.loads(serialized)
+        assert unpacked.dtype == np.int32
+        assert np.array_equal(unpacked, value)
+
+    def test_byte_order_and_non_contiguous(self, serializer, np):
+        """Test big-endian and non-contiguous arrays round-trip."""
+        big_endian = np.arange(100, dtype=">i4")
+        strided = np.arange(400, dtype=np.int16).reshape(20, 20)[:, ::2]
+
+        for value in (big_endian, strided):
+            unpacked = serializer.loads(serializer.dumps(value))
+            assert unpacked.dtype == value.dtype
+            assert np.array_equal(unpacked, value)
+
+    @pytest.mark.parametrize("dtype", ["M8[s]", "m8[ms]"])
+    def test_datetime_and_timedelta_dtypes(self, serializer, np, dtype):
+        """Test datetime64 and timedelta64 arrays round-trip through the raw buffer."""
+        value = np.arange(12, dtype=np.int64).astype(dtype).reshape(3, 4)
+        scalar = np.array(7, dtype=dtype)
+
+        for item in (value, value.T, scalar):
+            packed = serializer.pack(item)
+            assert "data" in packed[str(Marks.NDARRAY)]
+
+            unpacked = serializer.loads(serializer.dumps(item))
+            assert unpacked.dtype == item.dtype
+            assert unpacked.shape == item.shape
+            assert np.array_equal(unpacked, item)
+
+    def test_object_dtype_raises(self, serializer, np):
+        """Test that object arrays are rejected."""
+        with pytest.raises(TypeError, match="Unsupported ndarray dtype"):
+            serializer.pack(np.array([object()], dtype=object))
+
+
+class TestBytes:
+    """Test bytes / bytearray / memoryview serialization."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [b"\x00\x01binary\xff", bytearray(b"thumbnail"), memoryview(b"protobuf"), b""],
+    )
+    def test_bytes_like_round_trip(self, serializer, value):
+        """Test bytes-like objects are decoded back to bytes."""
+        packed = serializer.pack(value)
+        assert str(Marks.BYTES) in packed
+
+        unpacked = serializer.loads(serializer.dumps(value))
+        assert type(unpacked) is bytes
+        assert unpacked == bytes(value)
+
+    def test_non_contiguous_memoryview(self, serializer):
+        """Test non-contiguous memoryview is packed correctly."""
+        value = memoryview(b"a1b2c3")[::2]
+        assert serializer.unpack(serializer.pack(value)) == b"abc"
+
+    def test_bytes_as_memoryview(self):
+        """Test that bytes_as_memoryview returns a read-only memoryview."""
+        from redis_json_serializer import JsonSerializer
+
+        serializer = JsonSerializer(bytes_as_memoryview=True)
+        unpacked = serializer.loads(serializer.dumps({"blob": b"hash"}))
+
+        assert isinstance(unpacked["blob"], memoryview)
+        assert unpacked["blob"].readonly
+        assert unpacked["blob"] == b"hash"
+
+    @pytest.mark.parametrize("backend", ["json", "msgpack"])
+    def test_memoryviews_share_one_buffer(self, backend):
+        """Test that all binary values of a payload are views of one buffer."""
+        from redis_json_serializer import JsonSerializer
+
+        if backend == "msgpack":
+            pytest.importorskip("msgpack")
+        serializer = JsonSerializer(bytes_as_memoryview=True, backend=backend)
+        value = {"a": b"first", "nested": [b"", (b"second", frozenset({b"third"}))]}
+
+        unpacked = serializer.loads(serializer.dumps(value))
+        views = [unpacked["a"], unpacked["nested"][0], unpacked["nested"][1][0], *unpacked["nested"][1][1]]
+
+        assert all(isinstance(view, memoryview) and view.readonly for view in views)
+        assert len({id(view.obj) for view in views}) == 1
+        assert [bytes(view) for view in views] == [b"first", b"", b"second", b"third"]
+
+    def test_memoryview_malformed_base64(self):
+        """Test that a truncated base64 payload is rejected."""
+        from redis_json_serializer import JsonSerializer
+
+        serializer = JsonSerializer(bytes_as_memoryview=True)
+        data = serializer.dumps([b"first", b"second"]).replace(b"Zmlyc3Q=", b"Zmlyc3")
+
+        with pytest.raises(ValueError):
+            serializer.loads(data)
+
+    def test_string_conversion_with_expected_type(self, serializer):
+        """Test base64 string is converted to bytes with expected_type."""
+        assert serializer.unpack("aGFzaA==", expected_type=bytes) == b"hash"
+        assert serializer.unpack("aGFzaA==") == "aGFzaA=="
+
+
+class TestMarkerFreeFastPath:
+    """Test loads() fast path for payloads without type markers."""
+
+    def test_plain_payload_flagged(self, serializer, sample_dict, sample_decimal):
+        """Test that dumps() flags marker-free JSON with a space and JSON with markers with a tab."""
+        assert serializer.dumps(sample_dict).startswith(b" ")
+        assert serializer.dumps({"price": sample_decimal}).startswith(b"\t")
+
+    @pytest.mark.parametrize(
+        ("value", "flag"),
+        [
+            ({"a": [1, {"b": "c"}]}, b" "),
+            ([[], {}, ""], b" "),
+            ({"a": [{"b": {1, 2}}]}, b"\t"),
+            ({"a": [(1, 2)]}, b"\t"),
+            ({"a": {1: "int key"}}, b"\t"),
+            (collections.OrderedDict(a=1), b"\t"),
+            ({"a": [datetime.datetime(2024, 1, 1)] * 3}, b"\t"),
+            ({"a": types.MappingProxyType({"b": [1]})}, b" "),
+        ],
+        ids=["nested", "empty", "set", "tuple", "keyed", "ordered", "datetimes", "mapping-proxy"],
+    )
+    def test_flag_recorded_during_pack(self, value, flag):
+        """Test that the flag is derived from pack(), matching the markers actually written."""
+        for serializer in (JsonSerializer(), JsonSerializer(compact_datetimes=True)):
+            data = serializer.dumps(value)
+            assert data[:1] == flag
+            assert any(str(mark).encode() in data for mark in Marks) == (flag == b"\t")
+
+    def test_flag_recorded_for_models(self, serializer, sample_dataclass):
+        """Test that nested models and str Enum values get the right flag."""
+        item = sample_dataclass(id="1", name="pen", quantity=2, price=Decimal("1.50"))
+
+        class Color(str, enum.Enum):
+            RED = "red"
+
+        assert serializer.dumps({"items": [item]}).startswith(b"\t")
+        assert serializer.dumps({"color": Color.RED}).startswith(b" ")
+
+    def test_flags_skip_byte_search(self, serializer, sample_decimal, monkeypatch):
+        """Test that flagged payloads are never searched for markers."""
+        from redis_json_serializer import serializer as serializer_module
+
+        plain = serializer.dumps({"a": 1})
+        marked = serializer.dumps({"price": sample_decimal})
+
+        def fail(data):
+            raise AssertionError("flagged payloads must not be searched")
+
+        monkeypatch.setattr(serializer_module, "_has_markers", fail)
+        assert serializer.loads(plain) == {"a": 1}
+        assert serializer.loads(marked) == {"price": sample_decimal}
+
+    def test_flagged_payload_skips_unpack(self, serializer, complex_nested_data, monkeypatch):
+        """Test that flagged payloads are returned without the unpack() walk."""
+        serialized = serializer.dumps(complex_nested_data)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unpack() must not be called")
+
+        monkeypatch.setattr(serializer, "unpack", fail)
+        assert serializer.loads(serialized) == complex_nested_data
+
+    def test_unflagged_payload_byte_search(self, serializer, complex_nested_data, monkeypatch):
+        """Test that payloads without the flag are checked by byte search."""
+        import orjson
+
+        # Payload, записанный без флага (например, предыдущей версией)
+        serialized = orjson.dumps(complex_nested_data)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unpack() must not be called")
+
+        monkeypatch.setattr(serializer, "unpack", fail)
+        assert serializer.loads(serialized) == complex_nested_data
+
+    def test_namespace_fast_path(self, serializer_with_namespace):
+        """Test fast path with the namespace wrapper."""
+        serialized = serializer_with_namespace.dumps({"key": "value"})
+        assert serialized.startswith(b" ")
+        assert serializer_with_namespace.loads(serialized) == {"key": "value"}
+
+    def test_payload_with_markers_unpacked(self, serializer, sample_datetime):
+        """Test that payloads with markers are still unpacked."""
+        import orjson
+
+        serialized = orjson.dumps({"at": {str(Marks.DATETIME): sample_datetime.isoformat()}})
+        assert serializer.loads(serialized) == {"at": sample_datetime}
+
+
+class TestIterativeEngine:
+    """Test explicit-stack pack/unpack on deep payloads."""
+
+    @staticmethod
+    def _nested(depth):
+        value = {"leaf": Decimal("1.5")}
+        for i in range(depth):
+            value = {"id": i, "children": [value], "tags": ({"a"},)}
+        return value
+
+    def test_deeper_than_recursion_limit(self):
+        """Test that nesting beyond the recursion limit is packed and unpacked."""
+        import sys
+
+        from redis_json_serializer import JsonSerializer
+
+        serializer = JsonSerializer(max_depth=10_000)
+        value = self._nested(sys.getrecursionlimit())
+
+        unpacked = serializer.unpack(serializer.pack(value))
+
+        # Сравнение == само рекурсивно - спускаемся по уровням циклом
+        for i in reversed(range(sys.getrecursionlimit())):
+            assert unpacked["id"] == i
+            assert unpacked["tags"] == ({"a"},)
+            unpacked = unpacked["children"][0]
+        assert unpacked == {"leaf": Decimal("1.5")}
+
+    def test_pack_depth_limit(self):
+        """Test that pack() rejects values nested deeper than max_depth."""
+        from redis_json_serializer import DepthLimitError, JsonSerializer
+
+        serializer = JsonSerializer(max_depth=2)
+        assert serializer.pack([[1], {"a": 2}]) == [[1], {"a": 2}]
+
+        with pytest.raises(DepthLimitError, match="max_depth=2"):
+            serializer.pack([[[1]]])
+        with pytest.raises(DepthLimitError):
+            serializer.pack([{(1,)}])
+
+    def test_unpack_depth_limit(self):
+        """Test that unpack()/loads() reject payloads nested deeper than max_depth."""
+        from redis_json_serializer import DepthLimitError, JsonSerializer
+
+        serializer = JsonSerializer(max_depth=2)
+        with pytest.raises(DepthLimitError):
+            serializer.unpack([[[1]]])
+        with pytest.raises(DepthLimitError):
+            serializer.loads(b'{"a": [{"b": 1}], "at": {"%s": "1.5"}}' % str(Marks.DECIMAL).encode())
+
+    def test_invalid_max_depth(self):
+        """Test that non-positive max_depth is rejected."""
+        from redis_json_serializer import JsonSerializer
+
+        with pytest.raises(ValueError, match="max_depth"):
+            JsonSerializer(max_depth=0)
+
+    def test_document_order_preserved(self, serializer):
+        """Test that dict keys and sequence items keep their order."""
+        value = {"z": [3, {"y": 1, "x": 2}], "a": (1, [2]), "m": {"k": [Decimal("1")]}}
+
+        packed = serializer.pack(value)
+        assert list(packed) == ["z", "a", "m"]
+        assert list(packed["z"][1]) == ["y", "x"]
+        assert serializer.unpack(packed) == value
+
+    def test_input_not_mutated(self, serializer, sample_decimal):
+        """Test that pack()/unpack() do not modify their input in place."""
+        value = {"items": [sample_decimal, (1, 2)], "nested": {"set": {1}}}
+        packed = serializer.pack(value)
+        packed_copy = serializer.pack(value)
+
+        assert value == {"items": [sample_decimal, (1, 2)], "nested": {"set": {1}}}
+        serializer.unpack(packed)
+        assert packed == packed_copy
+
+
+class TestCanonicalMode:
+    """Test deterministic output and content digests."""
+
+    @pytest.fixture
+    def canonical(self):
+        """Create a canonical serializer."""
+        from redis_json_serializer import JsonSerializer
+
+        return JsonSerializer(canonical=True)
+
+    def test_key_order_independent(self, canonical):
+        """Test that dict insertion order does not change output."""
+        first = {"b": 1, "a": {"y": [1, 2], "x": None}}
+        second = {"a": {"x": None, "y": [1, 2]}, "b": 1}
+
+        assert canonical.dumps(first) == canonical.dumps(second)
+        assert canonical.loads(canonical.dumps(first)) == first
+
+    def test_set_members_sorted(self, canonical):
+        """Test that set members are written in sorted order."""
+        packed = canonical.pack({"c", "a", "b"})
+        assert packed == {str(Marks.SET): ["a", "b", "c"]}
+
+    def test_mixed_set_members_ordered(self, canonical):
+        """Test that incomparable set members still get a deterministic order."""
+        packed = canonical.pack({1, "a", (2, "b")})
+        # Порядок по каноническим байтам: '"a"' < '1' < '{...}'
+        assert packed == {str(Marks.SET): ["a", 1, {str(Marks.TUPLE): [2, "b"]}]}
+
+    def test_stable_across_hash_seeds(self):
+        """Test that output of sets of strings does not depend on PYTHONHASHSEED."""
+        import os
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from redis_json_serializer import JsonSerializer\n"
+            "s = JsonSerializer(canonical=True)\n"
+            "sys.stdout.write(s.digest({'tags': {f'tag-{i}' for i in range(50)}}))\n"
+        )
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+        assert len(digests) == 1
+
+    def test_partially_ordered_members_stable_across_hash_seeds(self):
+        """Test that sets of frozensets and mixed keys do not depend on PYTHONHASHSEED."""
+        import os
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from redis_json_serializer import JsonSerializer\n"
+            "s = JsonSerializer(canonical=True)\n"
+            "value = {\n"
+            "    'groups': {frozenset({'a'}), frozenset({'b'}), frozenset({'a', 'c'})},\n"
+            "    'mixed': {1, 'a', (2, frozenset({'x', 'y'}))},\n"
+            "    'keyed': {frozenset({'k'}): 1, ('t', 2): 2, 3: 3},\n"
+            "}\n"
+            "sys.stdout.write(s.digest(value))\n"
+        )
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("0", "1", "2", "3", "4")
+        }
+        assert len(digests) == 1
+
+    def test_digest(self, canonical, sample_decimal):
+        """Test that digest() is stable for equal values and differs for others."""
+        digest = canonical.digest({"price": sample_decimal, "tags": {"x", "y"}})
+
+        assert len(digest) == 32
+        assert digest == canonical.digest({"tags": {"y", "x"}, "price": sample_decimal})
+        assert digest != canonical.digest({"price": sample_decimal, "tags": {"x"}})
+
+    def test_digest_requires_canonical(self, serializer):
+        """Test that digest() is rejected for non-canonical serializers."""
+        with pytest.raises(ValueError, match="canonical"):
+            serializer.digest({"a": 1})
+
+
+class TestHashMapping:
+    """Test field-level encoding of models for Redis hashes."""
+
+    @pytest.fixture
+    def profile_model(self):
+        """Registered dataclass with marker-typed fields."""
+        @register_model("hash.settings.v1")
+        @dataclass
+        class Settings:
+            theme: str
+
+        @register_model("hash.profile.v1")
+        @dataclass
+        class Profile:
+            name: str
+            balance: Decimal
+            seen_at: datetime.datetime
+            tags: set[str]
+            settings: Settings
+            nickname: str | None = None
+
+        return Profile, Settings
+
+    @pytest.fixture
+    def profile(self, profile_model, sample_datetime):
+        """Profile instance."""
+        profile_cls, settings_cls = profile_model
+        return profile_cls(
+            name="Alice",
+            balance=Decimal("10.50"),
+            seen_at=sample_datetime,
+            tags={"a", "b"},
+            settings=settings_cls(theme="dark"),
+        )
+
+    def test_round_trip(self, serializer, profile):
+        """Test that every field is encoded separately and decoded back."""
+        mapping = serializer.to_hash_mapping(profile)
+
+        assert set(mapping) == {"name", "balance", "seen_at", "tags", "settings", "nickname"}
+        assert serializer.loads(mapping["balance"]) == Decimal("10.50")
+        assert serializer.from_hash_mapping(type(profile), mapping) == profile
+
+    def test_bytes_keys_and_missing_fields(self, serializer, profile):
+        """Test HGETALL-style reply with bytes keys and a field missing from the hash."""
+        mapping = serializer.to_hash_mapping(profile)
+        del mapping["nickname"]
+        reply = {key.encode(): value for key, value in mapping.items()}
+        reply[b"removed_field"] = b'"ignored"'
+
+        assert serializer.from_hash_mapping(type(profile), reply) == profile
+
+    def test_partial_update(self, serializer, profile):
+        """Test that only requested fields are encoded."""
+        profile.name = "Bob"
+        mapping = serializer.to_hash_mapping(profile, fields=["name"])
+
+        assert mapping == {"name": serializer.dumps("Bob")}
+
+    def test_projection_from_hmget(self, serializer, profile, sample_datetime):
+        """Test projection from an HMGET reply list."""
+        mapping = serializer.to_hash_mapping(profile)
+        fields = ["seen_at", "settings", "nickname"]
+        reply = [mapping[field] for field in fields]
+
+        projection = serializer.from_hash_mapping(type(profile), reply, fields=fields)
+
+        assert projection == {
+            "seen_at": sample_datetime,
+            "settings": profile.settings,
+            "nickname": None,
+        }
+
+    def test_projection_skips_missing_fields(self, serializer, profile):
+        """Test that fields absent from the hash are left out of a projection."""
+        projection = serializer.from_hash_mapping(
+            type(profile), [None, serializer.dumps("Alice")], fields=["balance", "name"]
+        )
+        assert projection == {"name": "Alice"}
+
+    def test_unknown_field_raises(self, serializer, profile):
+        """Test that unknown field names are rejected."""
+        with pytest.raises(ValueError, match="no fields"):
+            serializer.to_hash_mapping(profile, fields=["missing"])
+        with pytest.raises(ValueError, match="no fields"):
+            serializer.from_hash_mapping(type(profile), {}, fields=["missing"])
+
+    def test_unregistered_model_raises(self, serializer, unregistered_dataclass):
+        """Test that only registered models can be mapped."""
+        with pytest.raises(RegistrationError):
+            serializer.to_hash_mapping(unregistered_dataclass(id="1", name="x"))
+        with pytest.raises(RegistrationError):
+            serializer.from_hash_mapping(unregistered_dataclass, {})
+
+    def test_plan_is_cached(self, serializer, profile):
+        """Test that the per-model plan is built once."""
+        serializer.to_hash_mapping(profile)
+        plan = serializer._hash_plans[type(profile)]
+        serializer.to_hash_mapping(profile)
+
+        assert serializer._hash_plans[type(profile)] is plan
+
+    def test_pydantic_model(self, serializer, sample_pydantic_model):
+        """Test Pydantic model fields."""
+        user = sample_pydantic_model(id="1", name="Alice", email="a@example.com", age=30)
+        mapping = serializer.to_hash_mapping(user)
+
+        assert serializer.from_hash_mapping(sample_pydantic_model, mapping) == user
+
+    def test_msgpack_backend(self, profile):
+        """Test field encoding with a binary backend."""
+        pytest.importorskip("msgpack")
+        serializer = JsonSerializer(backend="msgpack")
+
+        mapping = serializer.to_hash_mapping(profile)
+        assert serializer.from_hash_mapping(type(profile), mapping) == profile
+
+
+class Color(enum.Enum):
+    """Plain (non-str) Enum for marker tests."""
+
+    RED = 1
+    GREEN = 2
+
+
+class Planet(enum.Enum):
+    """Enum with tuple values."""
+
+    EARTH = (5.97e24, 6.37e6)
+
+
+class Mode(str, enum.Enum):
+    """str Enum (packed as a plain string)."""
+
+    FAST = "fast"
+
+
+class TestStdlibTypes:
+    """Test markers for UUID, Enum, timedelta, time, IP addresses and paths."""
+
+    @pytest.fixture(autouse=True)
+    def enums(self, clear_registry):
+        """Register Enum classes (after the registry is cleared)."""
+        register_model("color.v1")(Color)
+        register_model("planet.v1")(Planet)
+
+    @pytest.fixture
+    def values(self):
+        """Values of every new marker type."""
+        return {
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "color": Color.GREEN,
+            "planet": Planet.EARTH,
+            "timedelta": datetime.timedelta(days=-1, seconds=5, microseconds=7),
+            "time": datetime.time(12, 30, 5, 1000, tzinfo=datetime.timezone.utc),
+            "ipv4": ipaddress.IPv4Address("10.0.0.1"),
+            "ipv6": ipaddress.IPv6Address("::1"),
+            "network": ipaddress.IPv4Network("10.0.0.0/8"),
+            "interface": ipaddress.IPv6Interface("fe80::1/64"),
+            "path": pathlib.Path("/var/cache/app"),
+        }
+
+    def test_round_trip(self, serializer, values):
+        """Test that every type survives dumps()/loads()."""
+        result = serializer.loads(serializer.dumps(values))
+
+        assert result == values
+        assert {key: type(value) for key, value in result.items()} == {
+            key: type(value) for key, value in values.items()
+        }
+
+    def test_compact_encodings(self, serializer, values):
+        """Test UUID as 32 hex characters, timedelta as integer microseconds."""
+        packed = serializer.pack(values)
+
+        assert packed["uuid"] == {str(Marks.UUID): "12345678123456781234567812345678"}
+        assert packed["timedelta"] == {str(Marks.TIMEDELTA): -86_394_999_993}
+        assert packed["color"] == {str(Marks.ENUM): ["color.v1", 2]}
+
+    def test_str_enum_stays_plain(self, serializer):
+        """Test that str Enum members are packed as plain strings."""
+        assert serializer.pack(Mode.FAST) == "fast"
+        assert serializer.unpack("fast", Mode) is Mode.FAST
+
+    def test_unregistered_enum_raises(self, serializer):
+        """Test that Enum members need a registered class."""
+        class Unregistered(enum.Enum):
+            A = 1
+
+        with pytest.raises(RegistrationError, match="not registered"):
+            serializer.pack(Unregistered.A)
+        with pytest.raises(RegistrationError, match="not registered"):
+            serializer.unpack({str(Marks.ENUM): ["unknown", 1]})
+
+    def test_pure_path_subclass(self, serializer):
+        """Test that PurePath subclasses are packed with their kind and restored."""
+        path = pathlib.PureWindowsPath("C:/data/file.txt")
+        packed = serializer.pack(path)
+
+        assert packed == {str(Marks.PATH): ["windows", "C:\\data\\file.txt"]}
+        assert serializer.unpack(packed, pathlib.PureWindowsPath) == path
+
+    @pytest.mark.parametrize(
+        "path",
+        [pathlib.PurePosixPath("/srv/data"), pathlib.PureWindowsPath("C:/data"), pathlib.Path("/srv/data")],
+    )
+    def test_path_type_preserved(self, serializer, path):
+        """Test that pure paths keep their class without expected_type."""
+        value = {"path": path, "paths": [path]}
+
+        unpacked = serializer.loads(serializer.dumps(value))
+        assert type(unpacked["path"]) is type(path)
+        assert type(unpacked["paths"][0]) is type(path)
+        assert unpacked == value
+
+    def test_path_string_by_expected_type(self, serializer):
+        """Test that plain strings become the expected PurePath subclass."""
+        unpacked = serializer.unpack("/srv/data", pathlib.PurePosixPath)
+
+        assert type(unpacked) is pathlib.PurePosixPath
+
+    @pytest.mark.parametrize("raw", ["not base64!", "aGFzaA==aGFzaA==", "aGFz aA=="])
+    def test_invalid_base64_left_unchanged(self, serializer, raw):
+        """Test that bytes conversion rejects characters and padding lenient decoding skips."""
+        assert serializer.unpack(raw, bytes) == raw
+
+    @pytest.mark.parametrize(
+        ("raw", "expected_type", "expected"),
+        [
+            ("12345678123456781234567812345678", uuid.UUID, uuid.UUID(int=0x12345678123456781234567812345678)),
+            ("12345678-1234-5678-1234-567812345678", uuid.UUID, uuid.UUID(int=0x12345678123456781234567812345678)),
+            ("EjRWeBI0VngSNFZ4EjRWeA", uuid.UUID, uuid.UUID(int=0x12345678123456781234567812345678)),
+            ("12:30:05", datetime.time, datetime.time(12, 30, 5)),
+            ("10.0.0.1", ipaddress.IPv4Address, ipaddress.IPv4Address("10.0.0.1")),
+            ("10.0.0.0/8", ipaddress.IPv4Network, ipaddress.IPv4Network("10.0.0.0/8")),
+            ("/tmp", pathlib.Path, pathlib.Path("/tmp")),
+            ("fast", Mode, Mode.FAST),
+        ],
+    )
+    def test_string_conversion_by_expected_type(self, serializer, raw, expected_type, expected):
+        """Test that plain strings are converted when the type is expected."""
+        assert serializer.unpack(raw, expected_type) == expected
+
+    def test_invalid_string_left_unchanged(self, serializer):
+        """Test that failed conversions return the original string."""
+        assert serializer.unpack("not-a-uuid", uuid.UUID) == "not-a-uuid"
+
+    def test_model_fields(self, serializer):
+        """Test new types as annotated model fields."""
+        @register_model("session.v1")
+        @dataclass
+        class Session:
+            id: uuid.UUID
+            color: Color
+            ttl: datetime.timedelta
+            client: ipaddress.IPv4Address
+
+        session = Session(uuid.uuid4(), Color.RED, datetime.timedelta(minutes=5), ipaddress.IPv4Address("1.2.3.4"))
+        assert serializer.loads(serializer.dumps(session)) == session
+
+
+class Point(NamedTuple):
+    """typing.NamedTuple with annotated fields."""
+
+    x: int
+    at: datetime.date
+
+
+class TestCollectionTypes:
+    """Test markers for frozenset, deque, OrderedDict, defaultdict, namedtuple and keyed dicts."""
+
+    @pytest.fixture(autouse=True)
+    def named_tuples(self, clear_registry):
+        """Register namedtuple and Enum classes (after the registry is cleared)."""
+        register_model("point.v1")(Point)
+        register_model("color.v1")(Color)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            frozenset({1, "a", (2, 3)}),
+            collections.deque([1, datetime.date(2024, 1, 1)]),
+            collections.deque([1, 2, 3], maxlen=3),
+            collections.OrderedDict([("b", 1), ("a", Decimal("2"))]),
+            collections.defaultdict(list, {"a": [1]}),
+            collections.defaultdict(None, {"a": 1}),
+            {1: "one", 2: "two"},
+            {(1, 2): "pair", "key": {3}},
+            {datetime.date(2024, 1, 1): 1, None: 2, 1.5: 3, True: 4},
+            Point(1, datetime.date(2024, 1, 1)),
+        ],
+        ids=[
+            "frozenset", "deque", "deque-maxlen", "ordered-dict", "defaultdict",
+            "defaultdict-none", "int-keys", "tuple-keys", "mixed-keys", "namedtuple",
+        ],
+    )
+    def test_round_trip(self, serializer, value):
+        """Test that collection types and their contents survive dumps()/loads()."""
+        result = serializer.loads(serializer.dumps(value))
+
+        assert result == value
+        assert type(result) is type(value)
+        if isinstance(value, collections.deque):
+            assert result.maxlen == value.maxlen
+        if isinstance(value, collections.defaultdict):
+            assert result.default_factory is value.default_factory
+        if isinstance(value, collections.OrderedDict):
+            assert list(result) == list(value)
+
+    def test_keys_keep_types(self, serializer):
+        """Test that non-string keys are not turned into strings."""
+        result = serializer.loads(serializer.dumps({1: "a", (2, "x"): "b", Color.RED: "c"}))
+        assert set(result) == {1, (2, "x"), Color.RED}
+
+    def test_string_keys_stay_plain(self, serializer):
+        """Test that dicts with string keys keep the plain JSON object encoding."""
+        assert serializer.pack({"a": 1}) == {"a": 1}
+        assert serializer.pack({"a": 1}, keyed_dicts=True) == {"a": 1}
+
+    def test_pack_keyed_dicts(self, serializer):
+        """Test that pack() checks dict keys only when asked (dumps() retries with it)."""
+        value = {"outer": {1: "a"}}
+
+        assert serializer.pack(value) == value
+        assert serializer.pack(value, keyed_dicts=True) == {"outer": {str(Marks.KEYED_DICT): [1, "a"]}}
+
+    def test_unregistered_namedtuple_packed_as_tuple(self, serializer):
+        """Test that unregistered namedtuples keep the plain tuple encoding."""
+        Pair = collections.namedtuple("Pair", "a b")
+
+        result = serializer.unpack(serializer.pack(Pair(1, 2)))
+        assert result == (1, 2)
+        assert type(result) is tuple
+
+    def test_unregistered_namedtuple_alias_raises(self, serializer):
+        """Test that namedtuple markers require a registered class."""
+        with pytest.raises(RegistrationError, match="not registered"):
+            serializer.unpack({str(Marks.NAMEDTUPLE): ["unknown", 1]})
+
+    def test_namedtuple_field_types(self, serializer):
+        """Test that typing.NamedTuple annotations convert plain strings."""
+        packed = {str(Marks.NAMEDTUPLE): ["point.v1", 1, "2024-01-01"]}
+        assert serializer.unpack(packed) == Point(1, datetime.date(2024, 1, 1))
+
+    def test_defaultdict_with_custom_factory_packed_as_dict(self, serializer):
+        """Test that a non-builtin factory falls back to a plain dict."""
+        value = collections.defaultdict(lambda: 0, {"a": 1})
+
+        result = serializer.loads(serializer.dumps(value))
+        assert result == {"a": 1}
+        assert type(result) is dict
+
+    def test_unknown_defaultdict_factory_raises(self, serializer):
+        """Test that only builtin factories are accepted on unpack."""
+        with pytest.raises(ValueError, match="factory"):
+            serializer.unpack({str(Marks.DEFAULT_DICT): ["os.system", "a", 1]})
+
+    def test_canonical_order(self):
+        """Test that canonical mode gives identical bytes for equal values."""
+        serializer = JsonSerializer(canonical=True)
+
+        assert serializer.dumps({2: "b", 1: "a"}) == serializer.dumps({1: "a", 2: "b"})
+        assert serializer.dumps(frozenset(range(50))) == serializer.dumps(frozenset(reversed(range(50))))
+
+    def test_expected_key_types(self, serializer):
+        """Test that dict[Key, Value] types apply to keyed dict keys and values."""
+        packed = {str(Marks.KEYED_DICT): [1, "2024-01-01"]}
+        assert serializer.unpack(packed, dict[int, datetime.date]) == {1: datetime.date(2024, 1, 1)}
+
+
+class TestMissSentinel:
+    """Test telling a cached None from a cache miss."""
+
+    def test_cached_none_is_not_miss(self):
+        """Test that a stored None decodes to None, a missing key to MISS."""
+        serializer = JsonSerializer()
+
+        assert serializer.loads_or_miss(serializer.dumps(None)) is None
+        assert serializer.loads_or_miss(None) is MISS
+
+    def test_loads_or_miss_decodes_values(self, sample_datetime):
+        """Test that present values decode as with loads()."""
+        serializer = JsonSerializer(namespace="cache:v1")
+        value = {"at": sample_datetime, "items": {1, 2}}
+
+        assert serializer.loads_or_miss(serializer.dumps(value)) == value
+
+    def test_miss_is_falsy_singleton(self):
+        """Test MISS repr, truthiness and identity after copy/pickle."""
+        import copy
+        import pickle
+
+        assert not MISS
+        assert repr(MISS) == "MISS"
+        assert type(MISS)() is MISS
+        assert copy.deepcopy(MISS) is MISS
+        assert pickle.loads(pickle.dumps(MISS)) is MISS
+
+
+class TestSoftTtlEnvelope:
+    """Test stale-while-revalidate metadata in the namespace wrapper."""
+
+    def test_no_envelope_by_default(self):
+        """Test that values without soft TTL carry no metadata."""
+        serializer = JsonSerializer(namespace="cache:v1")
+        data = serializer.dumps({"a": 1})
+
+        assert b"$at" not in data
+        assert serializer.loads_with_meta(data) == ({"a": 1}, None)
+        assert serializer.loads_with_meta(None) == (None, None)
+
+    def test_envelope_round_trip(self, monkeypatch, sample_datetime):
+        """Test write time, soft TTL and compute time read back by loads_with_meta()."""
+        monkeypatch.setattr("time.time", lambda: 1_700_000_000.25)
+        serializer = JsonSerializer()
+        value = {"at": sample_datetime, "tags": {"a"}}
+
+        data = serializer.dumps(value, soft_ttl=60, compute_time=0.5)
+        result, meta = serializer.loads_with_meta(data)
+
+        assert result == value
+        assert meta == CacheMeta(1_700_000_000.25, 60.0, 0.5)
+        assert meta.stale_at == 1_700_000_060.25
+
+    def test_loads_ignores_envelope(self):
+        """Test that loads() returns the value of an enveloped payload."""
+        serializer = JsonSerializer(namespace="cache:v1", soft_ttl=10)
+        data = serializer.dumps([1, 2])
+
+        assert data.startswith(b" ")
+        assert serializer.loads(data) == [1, 2]
+        assert JsonSerializer().loads(data) == [1, 2]
+
+    def test_soft_ttl_must_be_positive(self):
+        """Test that a non-positive soft TTL is rejected."""
+        with pytest.raises(ValueError, match="soft_ttl"):
+            JsonSerializer(soft_ttl=0)
+
+    def test_digest_ignores_write_time(self, monkeypatch):
+        """Test that digest() does not depend on the write time."""
+        serializer = JsonSerializer(canonical=True, soft_ttl=10)
+        monkeypatch.setattr("time.time", lambda: 1.0)
+        first = serializer.digest({"a": 1})
+        monkeypatch.setattr("time.time", lambda: 2.0)
+
+        assert serializer.digest({"a": 1}) == first
+
+    def test_staleness(self):
+        """Test age and is_stale() against the soft TTL."""
+        meta = CacheMeta(written_at=100.0, soft_ttl=10.0)
+
+        assert meta.age(now=104.0) == 4.0
+        assert not meta.is_stale(now=109.9)
+        assert meta.is_stale(now=110.0)
+
+    def test_should_refresh_early(self, monkeypatch):
+        """Test probabilistic early refresh from the recorded compute time."""
+        meta = CacheMeta(written_at=100.0, soft_ttl=10.0, compute_time=1.0)
+
+        # 1 - U = e^-3: сдвиг на 3 * compute_time
+        monkeypatch.setattr("random.random", lambda: 1.0 - 0.049787068367863944)
+        assert meta.should_refresh(now=107.5)
+        assert not meta.should_refresh(now=106.5)
+        assert not meta.should_refresh(beta=0, now=109.0)
+
+    def test_should_refresh_without_compute_time(self):
+        """Test that without compute time refresh happens when stale."""
+        meta = CacheMeta(written_at=100.0, soft_ttl=10.0)
+
+        assert not meta.should_refresh(now=109.0)
+        assert meta.should_refresh(now=110.0)
+
+
+class TestInterning:
+    """Test opt-in deduplication of decoded values."""
+
+    @pytest.fixture
+    def serializer(self):
+        """Serializer with interning enabled."""
+        return JsonSerializer(intern_values=True)
+
+    def test_strings_shared(self, serializer):
+        """Test that equal dict values and list items share one instance."""
+        data = JsonSerializer().dumps([{"status": "active"}, {"status": "active"}, ["active"]])
+        rows = serializer.loads(data)
+
+        assert rows == [{"status": "active"}, {"status": "active"}, ["active"]]
+        assert rows[0]["status"] is rows[1]["status"] is rows[2][0]
+
+    def test_not_shared_by_default(self):
+        """Test that without interning strings are separate copies."""
+        rows = JsonSerializer().loads(b'[{"status":"active"},{"status":"active"}]')
+        assert rows[0]["status"] is not rows[1]["status"]
+
+    def test_long_strings_not_interned(self):
+        """Test that strings longer than intern_max_length are left alone."""
+        serializer = JsonSerializer(intern_values=True, intern_max_length=3)
+        rows = serializer.loads(b'["abc","abc","abcd","abcd"]')
+
+        assert rows[0] is rows[1]
+        assert rows[2] is not rows[3]
+
+    def test_marker_values_shared(self, serializer, sample_datetime):
+        """Test that equal Decimal, date and datetime values share one instance."""
+        value = [{"price": Decimal("9.99"), "day": sample_datetime.date(), "at": sample_datetime}] * 2
+        rows = serializer.loads(serializer.dumps(value))
+
+        assert rows == value
+        for field in ("price", "day", "at"):
+            assert rows[0][field] is rows[1][field]
+
+    def test_equal_but_distinct_encodings_kept(self, serializer):
+        """Test that Decimal("1.0") and Decimal("1.00") are not merged."""
+        rows = serializer.loads(serializer.dumps([Decimal("1.0"), Decimal("1.00")]))
+        assert [str(item) for item in rows] == ["1.0", "1.00"]
+
+    def test_model_str_fields_shared(self, clear_registry):
+        """Test that str fields of models are interned."""
+
+        @register_model("intern.user")
+        class User(BaseModel):
+            country: str
+
+        serializer = JsonSerializer(intern_values=True)
+        users = serializer.loads(serializer.dumps([User(country="DE"), User(country="DE")]))
+        assert users[0].country is users[1].country
+
+    def test_table_is_bounded(self):
+        """Test that the intern table does not grow past intern_table_size."""
+        serializer = JsonSerializer(intern_values=True, intern_table_size=2)
+        rows = serializer.loads(b'["a","b","c","c","a"]')
+
+        assert len(serializer._intern_table) == 2
+        assert rows[0] is rows[4]
+        assert rows[2] == rows[3] == "c"
+
+        serializer.clear_intern_table()
+        assert serializer._intern_table == {}
+
+
+class TestLimits:
+    """Test size, node-count and length budgets."""
+
+    def test_max_bytes_on_dumps_and_loads(self):
+        """Test that oversized output and input raise SizeLimitError."""
+        from redis_json_serializer import LimitExceededError, SizeLimitError
+
+        serializer = JsonSerializer(max_bytes=32)
+        data = JsonSerializer().dumps({"rows": list(range(20))})
+
+        with pytest.raises(SizeLimitError, match="max_bytes=32"):
+            serializer.dumps({"rows": list(range(20))})
+        with pytest.raises(LimitExceededError):
+            serializer.loads(data)
+        assert serializer.loads(serializer.dumps([1])) == [1]
+        assert serializer.limit_violations == {"max_bytes": 2}
+
+    def test_max_length(self):
+        """Test that a long collection raises LengthLimitError in pack() and unpack()."""
+        from redis_json_serializer import LengthLimitError
+
+        serializer = JsonSerializer(max_length=3)
+        packed = JsonSerializer().pack({"ids": {1, 2, 3, 4}})
+
+        with pytest.raises(LengthLimitError, match="length 4"):
+            serializer.pack({"a": [1, 2, 3, 4]})
+        with pytest.raises(LengthLimitError):
+            serializer.unpack(packed)
+        assert serializer.pack({"a": [1, 2, 3], "b": (1, 2, 3)}) is not None
+
+    def test_max_nodes(self):
+        """Test that the total element count is bounded across containers."""
+        from redis_json_serializer import NodeLimitError
+
+        serializer = JsonSerializer(max_nodes=12)
+        value = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+        assert serializer.unpack(serializer.pack(value)) == value
+        with pytest.raises(NodeLimitError, match="max_nodes=12"):
+            serializer.pack([*value, [10]])
+        with pytest.raises(NodeLimitError):
+            serializer.unpack(JsonSerializer().pack([*value, (10,)]))
+        assert serializer.limit_violations["max_nodes"] == 2
+
+    def test_depth_counted(self):
+        """Test that DepthLimitError is a counted LimitExceededError."""
+        from redis_json_serializer import DepthLimitError, LimitExceededError
+
+        serializer = JsonSerializer(max_depth=1)
+
+        with pytest.raises(DepthLimitError) as exc_info:
+            serializer.pack([[1]])
+        assert isinstance(exc_info.value, LimitExceededError)
+        assert isinstance(exc_info.value, ValueError)
+        assert serializer.limit_violations == {"max_depth": 1}
+
+    @pytest.mark.parametrize("nested", [False, True], ids=["top-level", "nested"])
+    def test_datetime_array_counted(self, nested):
+        """Test that list[datetime] packed as one marker array is bounded in both directions."""
+        from redis_json_serializer import LengthLimitError, NodeLimitError
+
+        start = datetime.datetime(2024, 1, 1)
+        points = [start + datetime.timedelta(seconds=i) for i in range(1_000)]
+        value = {"points": points} if nested else points
+        data = JsonSerializer(compact_datetimes=True).dumps(value)
+
+        by_length = JsonSerializer(compact_datetimes=True, max_length=10)
+        by_nodes = JsonSerializer(compact_datetimes=True, max_nodes=100)
+        for serializer, error in ((by_length, LengthLimitError), (by_nodes, NodeLimitError)):
+            with pytest.raises(error):
+                serializer.dumps(value)
+            with pytest.raises(error):
+                serializer.loads(data)
+
+    def test_default_depth_within_json_limit(self):
+        """Test that the JSON default depth stays below orjson's nesting limit."""
+        from redis_json_serializer import DepthLimitError
+        from redis_json_serializer.serializer import DEFAULT_MAX_DEPTH, JSON_MAX_DEPTH
+
+        serializer = JsonSerializer()
+        assert serializer.max_depth == JSON_MAX_DEPTH <= 254
+
+        value: list[Any] = []
+        for _ in range(300):
+            value = [value]
+        with pytest.raises(DepthLimitError, match="max_depth=254"):
+            serializer.dumps(value)
+
+        # Маркеры удваивают уровни JSON: глубина в пределах max_depth, но глубже лимита orjson
+        nested: Any = 1
+        for _ in range(200):
+            nested = (nested,)
+        with pytest.raises(DepthLimitError, match="JSON limit"):
+            serializer.dumps(nested)
+        assert serializer.limit_violations == {"max_depth": 2}
+
+        if importlib.util.find_spec("msgpack") is not None:
+            assert JsonSerializer(backend="msgpack").max_depth == DEFAULT_MAX_DEPTH
+
+    @pytest.mark.parametrize(
+        ("option", "error"),
+        [("max_nodes", "NodeLimitError"), ("max_length", "LengthLimitError"), ("max_depth", "DepthLimitError")],
+    )
+    @pytest.mark.parametrize("flagged", [True, False], ids=["flagged", "unflagged"])
+    def test_limits_on_plain_loads(self, option, error, flagged):
+        """Test that marker-free payloads are checked by loads() despite the fast path."""
+        import redis_json_serializer
+
+        value = {"rows": [list(range(10)) for _ in range(10)]}
+        data = JsonSerializer().dumps(value)
+        assert data[:1] == b" "
+        if not flagged:
+            data = data[1:]
+        # 111 элементов, самый длинный список - 10, глубина 3
+        serializer = JsonSerializer(**{option: {"max_nodes": 100, "max_length": 9, "max_depth": 2}[option]})
+
+        with pytest.raises(getattr(redis_json_serializer, error)):
+            serializer.loads(data)
+        assert serializer.limit_violations == {option: 1}
+        # Payload в пределах лимитов по-прежнему читается быстрым путём
+        assert serializer.loads(JsonSerializer().dumps({"rows": [1, 2]})) == {"rows": [1, 2]}
+
+    def test_plain_loads_bound_ignores_string_content(self):
+        """Test that brackets and commas inside strings only fall back to the exact check."""
+        from redis_json_serializer import DepthLimitError
+
+        value = [["a,b,c,[[d]", "{e}"], {"k]": 'q\\"[[', "\\": "]]"}]
+
+        for serializer in (JsonSerializer(max_nodes=6), JsonSerializer(max_depth=2)):
+            assert serializer.loads(serializer.dumps(value)) == value
+            assert not serializer.limit_violations
+        with pytest.raises(DepthLimitError):
+            JsonSerializer(max_depth=1).loads(JsonSerializer().dumps(value))
+
+    @pytest.mark.parametrize("option", ["max_bytes", "max_nodes", "max_length"])
+    def test_limits_must_be_positive(self, option):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError, match=option):
+            JsonSerializer(**{option: 0})
+
+
+class TestDecodeCache:
+    """Test the loads_shared() decode memo."""
+
+    def test_hit_returns_same_result(self):
+        """Test that equal payloads decode once and share the frozen result."""
+        serializer = JsonSerializer()
+        data = serializer.dumps({"ids": [1, 2], "tags": {"a"}})
+
+        first = serializer.loads_shared(data)
+        second = serializer.loads_shared(bytes(data))
+
+        assert second is first
+        assert first == {"ids": [1, 2], "tags": {"a"}}
+        with pytest.raises(TypeError):
+            first["ids"] = None
+        with pytest.raises(TypeError):
+            first["ids"].append(3)
+        assert serializer.decode_cache_info() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+            "size": 1,
+            "max_size": 1024,
+            "payload_bytes": len(data),
+        }
+
+    def test_models_are_frozen(self, sample_dataclass):
+        """Test that shared models cannot be modified."""
+        import dataclasses
+
+        serializer = JsonSerializer()
+        item = sample_dataclass(id="1", name="pen", quantity=2, price=Decimal("1.50"))
+        shared = serializer.loads_shared(serializer.dumps(item))
+
+        assert shared == item
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            shared.name = "other"
+
+    @pytest.mark.parametrize("backend", ["json", "msgpack"])
+    def test_shared_result_round_trip(self, backend, sample_dataclass):
+        """Test that a shared result dumps to the same bytes as the original value."""
+        import warnings
+
+        pydantic = pytest.importorskip("pydantic")
+        if backend == "msgpack":
+            pytest.importorskip("msgpack")
+
+        @register_model("shared.user")
+        class User(pydantic.BaseModel):
+            name: str
+            roles: list[str]
+            labels: dict[str, int]
+            groups: set[str]
+
+        serializer = JsonSerializer(backend=backend)
+        value = {
+            "item": sample_dataclass(id="1", name="pen", quantity=2, price=Decimal("1.50")),
+            "user": User(name="Ada", roles=["admin"], labels={"a": 1}, groups={"ops"}),
+            "rows": [{"ids": [1, 2], "tags": {"a"}}, (1, frozenset({2}))],
+        }
+        data = serializer.dumps(value)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            shared = serializer.loads_shared(data)
+            assert serializer.dumps(shared) == data
+            shared["user"].model_dump_json()
+        assert serializer.loads(serializer.dumps(shared)) == value
+
+    def test_mapping_proxy_packed_as_dict(self, serializer):
+        """Test that read-only mapping views are written as dicts."""
+        value = types.MappingProxyType({"a": [1], 2: "b"})
+        assert serializer.loads(serializer.dumps(value)) == {"a": [1], 2: "b"}
+
+    def test_lru_eviction(self):
+        """Test that the least recently used result is evicted."""
+        serializer = JsonSerializer(decode_cache_size=2)
+        a, b, c = (serializer.dumps([i]) for i in range(3))
+
+        first = serializer.loads_shared(a)
+        serializer.loads_shared(b)
+        serializer.loads_shared(a)
+        serializer.loads_shared(c)
+
+        assert serializer.loads_shared(a) is first
+        assert serializer.decode_cache_info()["size"] == 2
+        assert serializer.decode_cache_info()["payload_bytes"] == len(a) + len(c)
+
+    def test_disabled_cache_still_freezes(self):
+        """Test that decode_cache_size=0 freezes results without caching."""
+        serializer = JsonSerializer(decode_cache_size=0)
+        data = serializer.dumps([1])
+
+        assert serializer.loads_shared(data) == [1]
+        assert serializer.loads_shared(data) is not serializer.loads_shared(data)
+        assert serializer.decode_cache_info()["size"] == 0
+
+    def test_clear(self):
+        """Test that clear_decode_cache() drops results and statistics."""
+        serializer = JsonSerializer()
+        serializer.loads_shared(serializer.dumps([1]))
+        serializer.clear_decode_cache()
+
+        assert serializer.decode_cache_info()["misses"] == 0
+        assert serializer.decode_cache_info()["size"] == 0
+        assert serializer.loads_shared(None) is None
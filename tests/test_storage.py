@@ -0,0 +1,434 @@
+"""
+Tests for Redis storage helpers.
+"""
+
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+
+import pytest
+
+from redis_json_serializer import MISS, JsonSerializer, register_model
+from redis_json_serializer.registry import MODEL_ALIASES, REGISTERED_MODELS
+from redis_json_serializer.storage import CHUNK_MANIFEST_HEADER, ChunkedStore, JsonDocumentStore
+from redis_json_serializer.testing import InMemoryRedis, ResponseError
+
+
+@pytest.fixture
+def client():
+    """Create an in-memory Redis stand-in."""
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def store(client):
+    """Create a ChunkedStore with a small chunk size."""
+    return ChunkedStore(client, JsonSerializer(namespace="test:v1"), chunk_size=64)
+
+
+@pytest.fixture
+def big_value():
+    """Value that is serialized to several chunks."""
+    return {"rows": [{"id": i, "price": Decimal(f"{i}.5")} for i in range(50)]}
+
+
+class TestChunkedStore:
+    """Test transparent chunking of oversized values."""
+
+    def test_small_value_not_chunked(self, store, client):
+        """Test that small values are stored as a single key."""
+        store.set("small", {"a": 1})
+
+        assert client.get("small") == store.serializer.dumps({"a": 1})
+        assert store.get("small") == {"a": 1}
+
+    def test_get_default_tells_missing_from_cached_none(self, store):
+        """Test that get(key, MISS) returns MISS only for a missing key."""
+        store.set("none", None)
+
+        assert store.get("none", MISS) is None
+        assert store.get("missing", MISS) is MISS
+        assert store.get("missing") is None
+
+    def test_get_with_meta(self, store, big_value):
+        """Test soft TTL metadata of small and chunked values."""
+        store.set("small", {"a": 1}, soft_ttl=5)
+        store.set("big", big_value, ex=60, soft_ttl=30, compute_time=2)
+        store.set("plain", {"a": 1})
+
+        assert store.get_with_meta("small")[1].soft_ttl == 5
+        value, meta = store.get_with_meta("big")
+        assert value == big_value
+        assert (meta.soft_ttl, meta.compute_time) == (30, 2)
+        assert store.get_with_meta("plain") == ({"a": 1}, None)
+        assert store.get_with_meta("missing", MISS) == (MISS, None)
+
+    def test_oversized_chunked_value_rejected_by_manifest(self, client, big_value):
+        """Test that max_bytes rejects a chunked value before fetching its parts."""
+        from redis_json_serializer import SizeLimitError
+
+        ChunkedStore(client, chunk_size=64).set("big", big_value)
+        store = ChunkedStore(client, JsonSerializer(max_bytes=256), chunk_size=64)
+
+        client.commands.clear()
+        with pytest.raises(SizeLimitError):
+            store.get("big")
+        assert client.commands == ["GET"]
+
+    def test_big_value_round_trip(self, store, client, big_value):
+        """Test that big values are split and reassembled with one MGET."""
+        store.set("big", big_value)
+
+        manifest = client.get("big")
+        assert manifest.startswith(CHUNK_MANIFEST_HEADER)
+        assert client.get(store.part_key("big", 0)) is not None
+
+        client.commands.clear()
+        assert store.get("big") == big_value
+        assert client.commands == ["GET", "MGET"]
+
+    def test_parts_respect_chunk_size(self, store, client, big_value):
+        """Test that no stored part exceeds chunk_size."""
+        store.set("big", big_value)
+        total = len(store.serializer.dumps(big_value))
+        count = (total + store.chunk_size - 1) // store.chunk_size
+
+        parts = client.mget([store.part_key("big", i) for i in range(count)])
+        assert all(part is not None and len(part) <= store.chunk_size for part in parts)
+        assert sum(len(part) for part in parts) == total
+
+    def test_missing_part_is_miss(self, store, client, big_value):
+        """Test that an incomplete chunked value is treated as a miss."""
+        store.set("big", big_value)
+        client.delete(store.part_key("big", 1))
+
+        assert store.get("big") is None
+
+    def test_corrupted_part_is_miss(self, store, client, big_value):
+        """Test that checksum mismatch is treated as a miss."""
+        store.set("big", big_value)
+        part = client.get(store.part_key("big", 0))
+        client.set(store.part_key("big", 0), part[:-1] + b"X")
+
+        assert store.get("big") is None
+
+    def test_delete_removes_parts(self, store, client, big_value):
+        """Test that delete() removes manifest and all parts."""
+        store.set("big", big_value)
+        deleted = store.delete("big")
+
+        assert deleted > 1
+        assert client.exists("big", store.part_key("big", 0)) == 0
+
+    @pytest.mark.parametrize("ex", [None, 60])
+    @pytest.mark.parametrize("new_value", ["y", "z" * 300], ids=["inline", "fewer-parts"])
+    def test_overwrite_drops_stale_parts(self, store, client, ex, new_value):
+        """Test that overwriting a chunked value deletes parts beyond the new part count."""
+        store.set("k", "x" * 1000, ex=ex)
+        old_count = sum(1 for name in list(client._data) if name.startswith("k:chunk:"))
+        store.set("k", new_value, ex=ex)
+
+        new_count = len(store._part_keys("k", len(store.serializer.dumps(new_value))))
+        assert new_count < old_count
+        assert client.exists(*(store.part_key("k", i) for i in range(old_count))) == new_count
+        assert store.get("k") == new_value
+
+    def test_overwrite_drops_stale_parts_set_if_changed(self, client):
+        """Test that set_if_changed() also deletes parts of a longer previous value."""
+        store = ChunkedStore(client, JsonSerializer(canonical=True), chunk_size=64)
+        store.set_if_changed("k", "x" * 1000)
+        store.set_if_changed("k", "y")
+
+        assert [name for name in client._data if name.startswith("k:chunk:")] == []
+        assert store.get("k") == "y"
+
+    def test_ttl_applied_to_parts(self, store, client, big_value):
+        """Test that TTL is applied to manifest and parts."""
+        store.set("big", big_value, ex=60)
+
+        assert 0 < client.ttl("big") <= 60
+        assert 0 < client.ttl(store.part_key("big", 0)) <= 60
+
+    def test_missing_key(self, store):
+        """Test that missing key returns None."""
+        assert store.get("missing") is None
+
+    def test_invalid_chunk_size(self, client):
+        """Test that non-positive chunk size is rejected."""
+        with pytest.raises(ValueError, match="chunk_size"):
+            ChunkedStore(client, chunk_size=0)
+
+
+@dataclass
+class Account:
+    """Old version of a stored model."""
+
+    owner: str
+
+
+@dataclass
+class AccountV2:
+    """New version of a stored model."""
+
+    owner: str
+    active: bool
+
+
+class TestRewriteMigrated:
+    """Test writing upcast values back in the new form."""
+
+    @pytest.fixture
+    def old_payload(self, clear_registry):
+        """Payload of the old model version (old alias no longer registered)."""
+        register_model("account.v1")(Account)
+        data = JsonSerializer().dumps(Account("ada"))
+        REGISTERED_MODELS.clear()
+        MODEL_ALIASES.clear()
+        register_model("account.v2", migrations={"account.v1": lambda data: {**data, "active": True}})(AccountV2)
+        return data
+
+    def test_rewrite_keeps_ttl(self, client, old_payload):
+        """Test that get() rewrites the upcast value and keeps the TTL."""
+        store = ChunkedStore(client, rewrite_migrated=True)
+        client.set("acc", old_payload, ex=100)
+
+        assert store.get("acc") == AccountV2("ada", True)
+        assert b"account.v2" in client.get("acc")
+        assert 0 < client.ttl("acc") <= 100
+
+        client.commands.clear()
+        assert store.get("acc") == AccountV2("ada", True)
+        assert client.commands == ["GET"]
+
+    def test_no_rewrite_by_default(self, client, old_payload):
+        """Test that stores without rewrite_migrated only read."""
+        store = ChunkedStore(client)
+        client.set("acc", old_payload)
+
+        assert store.get("acc") == AccountV2("ada", True)
+        assert client.get("acc") == old_payload
+
+
+class TestSetIfChanged:
+    """Test compare-before-set with content digests."""
+
+    @pytest.fixture
+    def store(self, client):
+        """Create a ChunkedStore with a canonical serializer."""
+        return ChunkedStore(client, JsonSerializer(canonical=True), chunk_size=64)
+
+    def test_first_write(self, store, client):
+        """Test that a new value is written with its digest."""
+        assert store.set_if_changed("k", {"a": 1}) is True
+
+        assert store.get("k") == {"a": 1}
+        assert client.get(store.digest_key("k")) is not None
+
+    def test_unchanged_value_skips_set(self, store, client):
+        """Test that an unchanged value costs only the digest GET and EXISTS."""
+        store.set_if_changed("k", {"a": 1, "b": {"x", "y"}})
+
+        client.commands.clear()
+        assert store.set_if_changed("k", {"b": {"y", "x"}, "a": 1}) is False
+        assert client.commands == ["GET", "EXISTS"]
+
+    def test_changed_value_written(self, store):
+        """Test that a changed value is written."""
+        store.set_if_changed("k", {"a": 1})
+
+        assert store.set_if_changed("k", {"a": 2}) is True
+        assert store.get("k") == {"a": 2}
+
+    def test_unchanged_value_refreshes_ttl(self, store, client, big_value):
+        """Test that TTL of value, parts and digest is refreshed without SET."""
+        store.set_if_changed("big", big_value, ex=10)
+
+        client.commands.clear()
+        assert store.set_if_changed("big", big_value, ex=60) is False
+        assert "SET" not in client.commands
+        assert 10 < client.ttl("big") <= 60
+        assert 10 < client.ttl(store.digest_key("big")) <= 60
+        assert 10 < client.ttl(store.part_key("big", 0)) <= 60
+
+    def test_delete_removes_digest(self, store, client):
+        """Test that delete() removes the digest so the next write is not skipped."""
+        store.set_if_changed("k", {"a": 1})
+        store.delete("k")
+
+        assert client.exists(store.digest_key("k")) == 0
+        assert store.set_if_changed("k", {"a": 1}) is True
+
+    def test_evicted_value_rewritten(self, store, client, big_value):
+        """Test that a value lost without its digest (eviction, expiry) is written again."""
+        store.set_if_changed("k", {"a": 1})
+        store.set_if_changed("big", big_value)
+        client.delete("k", store.part_key("big", 1))
+
+        assert store.set_if_changed("k", {"a": 1}) is True
+        assert store.get("k") == {"a": 1}
+        assert store.set_if_changed("big", big_value) is True
+        assert store.get("big") == big_value
+
+    @pytest.mark.parametrize("value", [{"a": 2}, "x" * 200])
+    def test_set_drops_digest(self, store, client, value):
+        """Test that set() invalidates the digest of set_if_changed()."""
+        store.set_if_changed("k", {"a": 1})
+        store.set("k", value)
+
+        assert client.exists(store.digest_key("k")) == 0
+        assert store.set_if_changed("k", {"a": 1}) is True
+        assert store.get("k") == {"a": 1}
+
+
+@dataclass
+class Settings:
+    theme: str
+    updated_at: datetime.datetime | None = None
+
+
+@dataclass
+class Profile:
+    name: str
+    settings: Settings
+    balance: Decimal
+    tags: set[str]
+    history: list[Settings]
+
+
+class TestJsonDocumentStore:
+    """Test RedisJSON documents with partial reads and writes."""
+
+    @pytest.fixture(autouse=True)
+    def models(self, clear_registry):
+        """Register document models (after the registry is cleared)."""
+        register_model("storage.profile")(Profile)
+        register_model("storage.settings")(Settings)
+
+    @pytest.fixture
+    def store(self, client):
+        """Create a JsonDocumentStore on the in-memory client."""
+        return JsonDocumentStore(client)
+
+    @pytest.fixture
+    def profile(self, sample_datetime):
+        """Profile document."""
+        return Profile(
+            name="Alice",
+            settings=Settings(theme="light", updated_at=sample_datetime),
+            balance=Decimal("10.50"),
+            tags={"a", "b"},
+            history=[Settings(theme="dark")],
+        )
+
+    def test_document_round_trip(self, store, profile):
+        """Test whole-document write and read."""
+        store.set("p", profile)
+        assert store.get("p") == profile
+
+    def test_get_default_for_missing_document(self, store):
+        """Test that a missing document returns default, a stored None does not."""
+        store.set("none", None)
+
+        assert store.get("none", MISS) is None
+        assert store.get("missing", MISS) is MISS
+
+    def test_get_path_reads_fragment(self, store, client, profile, sample_datetime):
+        """Test that a path read fetches and decodes only the fragment."""
+        store.set("p", profile)
+
+        client.commands.clear()
+        assert store.get_path("p", Profile, "settings.theme") == "light"
+        assert client.commands == ["JSON.GET"]
+
+        assert store.get_path("p", Profile, "settings.updated_at") == sample_datetime
+        assert store.get_path("p", Profile, "balance") == Decimal("10.50")
+        assert store.get_path("p", Profile, "tags") == {"a", "b"}
+        assert store.get_path("p", Profile, "settings") == profile.settings
+        assert store.get_path("p", Profile, "history[0].theme") == "dark"
+
+    def test_get_path_missing(self, store, profile):
+        """Test that missing key or element returns default."""
+        assert store.get_path("missing", Profile, "name") is None
+
+        store.set("p", profile)
+        assert store.get_path("p", Profile, "history[5]", default="none") == "none"
+
+    def test_set_path(self, store, profile):
+        """Test that a path write updates only the addressed field."""
+        store.set("p", profile)
+
+        assert store.set_path("p", Profile, "settings.theme", "dark") is True
+        assert store.set_path("p", Profile, "balance", Decimal("99")) is True
+        assert store.get_path("p", Profile, "settings.theme") == "dark"
+
+        updated = store.get("p")
+        assert updated.balance == Decimal("99")
+        assert updated.name == "Alice"
+
+    def test_set_path_missing_key(self, store):
+        """Test that a path write to a missing key does nothing."""
+        assert store.set_path("missing", Profile, "name", "x") is False
+
+    def test_ttl(self, store, client, profile):
+        """Test that TTL is applied to the document and kept on path writes."""
+        store.set("p", profile, ex=60)
+        store.set_path("p", Profile, "name", "Bob")
+
+        assert 0 < client.ttl("p") <= 60
+
+    def test_rejects_compact_datetimes(self, client):
+        """Test that element-unaddressable encodings are rejected."""
+        with pytest.raises(ValueError, match="compact_datetimes"):
+            JsonDocumentStore(client, JsonSerializer(compact_datetimes=True))
+
+    def test_string_commands_on_document_fail(self, store, client, profile):
+        """Test that GET on a document key is a type error, like in Redis."""
+        store.set("p", profile)
+
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            client.get("p")
+        assert client.mget(["p"]) == [None]
+
+
+class TestHashCommands:
+    """Test InMemoryRedis hash commands with model hash mappings."""
+
+    @pytest.fixture(autouse=True)
+    def models(self, clear_registry):
+        """Register document models (after the registry is cleared)."""
+        register_model("storage.profile")(Profile)
+        register_model("storage.settings")(Settings)
+
+    def test_partial_update_and_projection(self, client, serializer, sample_datetime):
+        """Test HSET partial update and HMGET projection of a model."""
+        profile = Profile(
+            name="Alice",
+            settings=Settings(theme="light", updated_at=sample_datetime),
+            balance=Decimal("1"),
+            tags=set(),
+            history=[],
+        )
+        client.hset("p", mapping=serializer.to_hash_mapping(profile))
+
+        profile.settings = Settings(theme="dark")
+        assert client.hset("p", mapping=serializer.to_hash_mapping(profile, fields=["settings"])) == 0
+
+        fields = ["settings", "name"]
+        projection = serializer.from_hash_mapping(Profile, client.hmget("p", fields), fields)
+        assert projection == {"settings": Settings(theme="dark"), "name": "Alice"}
+        assert serializer.from_hash_mapping(Profile, client.hgetall("p")) == profile
+
+    def test_hash_commands(self, client):
+        """Test HGET/HDEL and type errors against string commands."""
+        assert client.hset("h", "a", 1) == 1
+        assert client.hget("h", "a") == b"1"
+        assert client.hget("missing", "a") is None
+
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            client.get("h")
+        client.set("s", b"x")
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            client.hget("s", "a")
+
+        assert client.hdel("h", "a", "b") == 1
+        assert client.exists("h") == 0
@@ -2,8 +2,22 @@
 Tests for utility functions.
 """
 
+import subprocess
+import sys
 
-from redis_json_serializer.utils import default_key_builder, hash_args
+import pytest
+
+from redis_json_serializer import utils
+from redis_json_serializer.utils import (
+    collision_probability,
+    configure_key_token,
+    default_key_builder,
+    function_token,
+    hash_args,
+    make_compact_key_builder,
+    make_method_key_builder,
+    normalized_arguments,
+)
 
 
 class TestHashArgs:
@@ -100,3 +114,258 @@ class TestDefaultKeyBuilder:
         key = default_key_builder(test_func)
         assert isinstance(key, str), "Key should be a string"
         assert len(key) > 0, "Key should not be empty"
+
+
+class TestCanonicalHelpers:
+    """Test canonical ordering and content digest helpers."""
+
+    def test_canonical_sorted_comparable(self):
+        """Comparable values are sorted naturally."""
+        from redis_json_serializer.utils import canonical_sorted
+
+        assert canonical_sorted({3, 1, 2}) == [1, 2, 3]
+
+    def test_canonical_sorted_mixed(self):
+        """Mixed values are ordered by type name, then repr."""
+        from redis_json_serializer.utils import canonical_sorted
+
+        assert canonical_sorted(["b", 2, "a", 1]) == [1, 2, "a", "b"]
+
+    def test_canonical_sorted_encoded(self):
+        """Partially ordered values are ordered by their encoded bytes."""
+        from redis_json_serializer.utils import canonical_sorted
+
+        values = [frozenset({"b"}), frozenset({"a"}), frozenset({"a", "c"})]
+        encode = lambda value: ",".join(sorted(value)).encode()  # noqa: E731
+
+        assert canonical_sorted(values, encode) == [values[1], values[2], values[0]]
+
+    def test_content_digest(self):
+        """Digest is a 128-bit hex string that depends on content."""
+        from redis_json_serializer.utils import content_digest
+
+        assert len(content_digest(b"abc")) == 32
+        assert content_digest(b"abc") == content_digest(bytearray(b"abc"))
+        assert content_digest(b"abc") != content_digest(b"abd")
+
+
+def get_profile(user_id, full=False):
+    """Module-level function for compact key tests."""
+
+
+def get_orders(user_id):
+    """Second module-level function for compact key tests."""
+
+
+@pytest.fixture
+def clear_key_tokens():
+    """Reset function key tokens around a test."""
+    utils.KEY_TOKENS.clear()
+    utils._TOKEN_OWNERS.clear()
+    utils._DERIVED_TOKENS.clear()
+    yield
+    utils.KEY_TOKENS.clear()
+    utils._TOKEN_OWNERS.clear()
+    utils._DERIVED_TOKENS.clear()
+
+
+@pytest.mark.usefixtures("clear_key_tokens")
+class TestCompactKeyBuilder:
+    """Test compact cache keys."""
+
+    def test_key_format(self):
+        """Test "<token>:<digest>" with configured lengths."""
+        key_builder = make_compact_key_builder(digest_length=12, token_length=5)
+        token, digest = key_builder(get_profile, 42).split(":")
+
+        assert len(token) == 5
+        assert len(digest) == 12
+        assert set(token + digest) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+    def test_much_shorter_than_default(self):
+        """Test that compact keys are a fraction of default key length."""
+        compact = make_compact_key_builder()(get_profile, 42)
+        assert len(compact) == 6 + 1 + 16
+        assert len(compact) * 2 < len(default_key_builder(get_profile, 42))
+
+    def test_argument_semantics(self):
+        """Test that positional order matters and kwargs order does not."""
+        key_builder = make_compact_key_builder()
+
+        assert key_builder(get_profile, 1, 2) != key_builder(get_profile, 2, 1)
+        assert key_builder(get_profile, 1, a=1, b=2) == key_builder(get_profile, 1, b=2, a=1)
+        assert key_builder(get_profile, 1) != key_builder(get_orders, 1)
+
+    def test_stable_across_processes(self):
+        """Test that keys do not depend on the process (hash seed, addresses)."""
+        code = (
+            "from redis_json_serializer.utils import make_compact_key_builder\n"
+            "from tests.test_utils import get_profile\n"
+            "print(make_compact_key_builder()(get_profile, 42, full=True))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True, env={"PYTHONHASHSEED": "123"},
+        )
+        assert result.stdout.strip() == make_compact_key_builder()(get_profile, 42, full=True)
+
+    @pytest.mark.parametrize("lengths", [(10, 6), (6, 10)])
+    def test_token_length_independent_of_order(self, lengths):
+        """Test that each token length gives the same key whichever builder ran first."""
+        expected = {
+            length: utils._base64url_digest(f"{__name__}.get_profile".encode(), length) for length in lengths
+        }
+
+        for length in lengths:
+            token = make_compact_key_builder(token_length=length)(get_profile, 42).split(":")[0]
+            assert token == expected[length]
+            assert len(token) == length
+
+    def test_configured_token(self):
+        """Test explicit token for a function (object or module.qualname)."""
+        configure_key_token(get_profile, "prof")
+        configure_key_token(f"{__name__}.get_orders", "ord")
+
+        key_builder = make_compact_key_builder()
+        assert key_builder(get_profile, 1).startswith("prof:")
+        assert key_builder(get_orders, 1).startswith("ord:")
+
+    def test_token_collision_raises(self):
+        """Test that one token cannot be used by two functions."""
+        configure_key_token(get_profile, "same")
+        with pytest.raises(ValueError, match="already used"):
+            configure_key_token(get_orders, "same")
+
+    def test_derived_token_collision_detected(self):
+        """Test that a derived token colliding with a configured one is rejected."""
+        derived = utils._base64url_digest(f"{__name__}.get_orders".encode(), 6)
+        configure_key_token(get_profile, derived)
+
+        with pytest.raises(ValueError, match="already used"):
+            function_token(get_orders)
+
+    def test_invalid_token(self):
+        """Test that key separators are not allowed in tokens."""
+        with pytest.raises(ValueError, match="Invalid key token"):
+            configure_key_token(get_profile, "a:b")
+
+    def test_invalid_lengths(self):
+        """Test that lengths must be positive."""
+        with pytest.raises(ValueError):
+            make_compact_key_builder(digest_length=0)
+
+
+class TestCollisionProbability:
+    """Test collision-rate estimator."""
+
+    def test_birthday_bound(self):
+        """Test known points of the birthday bound."""
+        # 2^(n/2) ключей для n бит - вероятность ~39%
+        assert collision_probability(2**24, 8) == pytest.approx(0.393, abs=0.001)
+        assert collision_probability(1, 4) == 0.0
+
+    def test_small_probabilities_are_precise(self):
+        """Test that tiny probabilities do not round to zero."""
+        assert collision_probability(50_000_000, 16) == pytest.approx(1.58e-14, rel=0.01)
+
+    def test_hex_digest(self):
+        """Test that hex digests are estimated with 4 bits per character."""
+        assert collision_probability(10**6, 40, bits_per_char=4) < collision_probability(10**6, 16)
+
+
+class Service:
+    """Service whose instances are interchangeable for caching."""
+
+    def get(self, user_id, full=False):
+        return user_id
+
+    @classmethod
+    def build(cls, name):
+        return name
+
+
+class TenantService:
+    """Service whose cached results depend on the tenant."""
+
+    __cache_identity__ = "tenant"
+
+    def __init__(self, tenant):
+        self.tenant = tenant
+
+    def get(self, user_id, *extra, session=None, **options):
+        return user_id
+
+
+class TestMethodKeyBuilder:
+    """Test method-aware, argument-normalizing key builder."""
+
+    @pytest.fixture
+    def key_builder(self):
+        """Method key builder with default settings."""
+        return make_method_key_builder()
+
+    def test_self_ignored(self, key_builder):
+        """Test that keys do not depend on the instance (repr with address)."""
+        key = key_builder(Service.get, Service(), 42)
+
+        assert key == key_builder(Service.get, Service(), 42)
+        assert key.startswith(f"{__name__}.Service.get:")
+        assert key != key_builder(Service.get, Service(), 43)
+
+    def test_call_styles_normalized(self, key_builder):
+        """Test that positional, keyword and default arguments give one key."""
+        service = Service()
+        key = key_builder(Service.get, service, 42)
+
+        assert key_builder(Service.get, service, user_id=42) == key
+        assert key_builder(Service.get, service, 42, False) == key
+        assert key_builder(Service.get, service, 42, full=False) == key
+        assert key_builder(Service.get, service, 42, full=True) != key
+
+    def test_bound_method(self, key_builder):
+        """Test that a bound method gives the same key as the function with self."""
+        service = Service()
+        assert key_builder(service.get, 42) == key_builder(Service.get, service, 42)
+
+    def test_declared_identity(self, key_builder):
+        """Test that __cache_identity__ attributes are part of the key."""
+        key = key_builder(TenantService.get, TenantService("acme"), 1)
+
+        assert key == key_builder(TenantService.get, TenantService("acme"), 1)
+        assert key != key_builder(TenantService.get, TenantService("other"), 1)
+
+    def test_classmethod_cls(self, key_builder):
+        """Test that cls is identified by its qualified name."""
+        arguments = normalized_arguments(Service.build, ("x",), {})
+        assert arguments == {"cls": f"{__name__}.Service", "name": "x"}
+        assert key_builder(Service.build, "x") == key_builder(Service.build, name="x")
+
+    def test_ignored_and_variadic(self):
+        """Test ignored parameters and *args/**kwargs normalization."""
+        key_builder = make_method_key_builder(ignore=["session"])
+        service = TenantService("acme")
+
+        key = key_builder(TenantService.get, service, 1, "a", session=object(), b=2, c=3)
+        assert key == key_builder(TenantService.get, service, 1, "a", c=3, b=2)
+        assert key != key_builder(TenantService.get, service, 1, c=3, b=2)
+
+    def test_canonical_argument_values(self, key_builder, sample_datetime):
+        """Test that arguments are hashed in canonical form (sets, dicts, datetimes)."""
+        key = key_builder(Service.get, Service(), {"b": 1, "a": {3, 1, 2}, "at": sample_datetime})
+        assert key == key_builder(Service.get, Service(), {"at": sample_datetime, "a": {2, 3, 1}, "b": 1})
+
+    @pytest.mark.usefixtures("clear_key_tokens")
+    def test_compact_keys(self):
+        """Test compact "<token>:<digest>" keys."""
+        key_builder = make_method_key_builder(digest_length=12)
+        token, digest = key_builder(Service.get, Service(), 42).split(":")
+
+        assert token == function_token(Service.get)
+        assert len(digest) == 12
+
+    def test_requires_canonical_serializer(self):
+        """Test that a non-canonical serializer is rejected."""
+        from redis_json_serializer import JsonSerializer
+
+        with pytest.raises(ValueError, match="canonical"):
+            make_method_key_builder(JsonSerializer())